@@ -1,8 +1,6 @@
 from os import getenv
 from time import time
 from dotenv import load_dotenv
-from pyrogram import Client
-from pyrogram.enums import ParseMode
 from logging import getLogger, FileHandler, StreamHandler, INFO, ERROR, basicConfig
 from uvloop import install
 
@@ -25,9 +23,6 @@ class Config:
     BOT_TOKEN = getenv("BOT_TOKEN", "")
     API_HASH = getenv("API_HASH", "")
     API_ID = getenv("API_ID", "")
-    if BOT_TOKEN == "" or API_HASH == "" or API_ID == "":
-        LOGGER.critical("Variables Missing. Exiting Now...")
-        exit(1)
     AUTO_BYPASS = getenv("AUTO_BYPASS", "False").lower() == "true"
     AUTH_CHATS = getenv("AUTH_CHATS", "").split()
     OWNER_ID = int(getenv("OWNER_ID", 0))
@@ -39,13 +34,68 @@ class Config:
     HUBDRIVE_CRYPT = getenv("HUBDRIVE_CRYPT", "")
     KATDRIVE_CRYPT = getenv("KATDRIVE_CRYPT", "")
     TERA_COOKIE = getenv("TERA_COOKIE", "")
+    TERABOX_MAX_FILES = int(getenv("TERABOX_MAX_FILES") or 100)
+    HTTP_POOL_LIMIT = int(getenv("HTTP_POOL_LIMIT") or 100)
+    HTTP_POOL_PER_HOST = int(getenv("HTTP_POOL_PER_HOST") or 10)
+    HTTP_KEEPALIVE = float(getenv("HTTP_KEEPALIVE") or 30)
+    THREAD_POOLS = getenv("THREAD_POOLS", "").split()
+    CACHE_TTL = int(getenv("CACHE_TTL") or 3600)
+    CACHE_TTLS = getenv("CACHE_TTLS", "").split()
+    CACHE_SIZE = int(getenv("CACHE_SIZE") or 2048)
+    CACHE_DB = getenv("CACHE_DB", "")
+    CACHE_DB_SIZE = int(getenv("CACHE_DB_SIZE") or 20000)
+    MAX_CONCURRENT = int(getenv("MAX_CONCURRENT") or 32)
+    HOST_CONCURRENCY = int(getenv("HOST_CONCURRENCY") or 4)
+    HANDLER_CONCURRENCY = getenv("HANDLER_CONCURRENCY", "").split()
+    ADAPTIVE_WAIT = getenv("ADAPTIVE_WAIT", "False").lower() == "true"
+    WAIT_TIMES_FILE = getenv("WAIT_TIMES_FILE") or "wait_times.json"
+    RECAPTCHA_POOL = int(getenv("RECAPTCHA_POOL") or 2)
+    INDEX_TIMEOUT = float(getenv("INDEX_TIMEOUT") or 15)
+    INDEX_CONCURRENCY = int(getenv("INDEX_CONCURRENCY") or 8)
+    INDEX_CACHE_TTL = int(getenv("INDEX_CACHE_TTL") or 1800)
+    CHAIN_MAX_HOPS = int(getenv("CHAIN_MAX_HOPS") or 8)
+    CHAIN_TIMEOUT = float(getenv("CHAIN_TIMEOUT") or 180)
+    INLINE_TIMEOUT = float(getenv("INLINE_TIMEOUT") or 9)
+    REQUEST_TIMEOUT = float(getenv("REQUEST_TIMEOUT") or 30)
+    METRICS_PORT = int(getenv("METRICS_PORT") or 0)
+    TG_CHAT_RATE = float(getenv("TG_CHAT_RATE") or 1)
+    TG_GLOBAL_RATE = float(getenv("TG_GLOBAL_RATE") or 25)
+    SCRAPER_POOL = int(getenv("SCRAPER_POOL") or 4)
+    SCRAPER_IDLE = int(getenv("SCRAPER_IDLE") or 600)
+    COOKIE_STORE = getenv("COOKIE_STORE", "")
+    COOKIE_STORE_SIZE = int(getenv("COOKIE_STORE_SIZE") or 256)
+    BULK_CONCURRENCY = int(getenv("BULK_CONCURRENCY") or 8)
+    BULK_MAX_LINKS = int(getenv("BULK_MAX_LINKS") or 5000)
+    API_PORT = int(getenv("API_PORT") or 0)
+    API_HOST = getenv("API_HOST") or "127.0.0.1"
+    API_KEY = getenv("API_KEY", "")
+    API_CONCURRENCY = int(getenv("API_CONCURRENCY") or 16)
+    API_MAX_BATCH = int(getenv("API_MAX_BATCH") or 100)
+    PARSE_WORKERS = int(getenv("PARSE_WORKERS") or 0)
+    JOB_QUEUE = getenv("JOB_QUEUE", "")
+    JOB_BACKEND = getenv("JOB_BACKEND", "")
+    JOB_WORKERS = int(getenv("JOB_WORKERS") or 8)
+    JOB_LEASE = int(getenv("JOB_LEASE") or 60)
 
 
-Bypass = Client(
-    "FZ",
-    api_id=Config.API_ID,
-    api_hash=Config.API_HASH,
-    bot_token=Config.BOT_TOKEN,
-    plugins=dict(root="FZBypass/plugins"),
-    parse_mode=ParseMode.HTML,
-)
+def __getattr__(name):
+    # The Telegram client is built on first use, so the core handlers (and
+    # `python -m FZBypass.cli`) import without bot credentials.
+    if name != "Bypass":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if Config.BOT_TOKEN == "" or Config.API_HASH == "" or Config.API_ID == "":
+        LOGGER.critical("Variables Missing. Exiting Now...")
+        exit(1)
+    from pyrogram import Client
+    from pyrogram.enums import ParseMode
+
+    global Bypass
+    Bypass = Client(
+        "FZ",
+        api_id=Config.API_ID,
+        api_hash=Config.API_HASH,
+        bot_token=Config.BOT_TOKEN,
+        plugins=dict(root="FZBypass/plugins"),
+        parse_mode=ParseMode.HTML,
+    )
+    return Bypass
@@ -5,6 +5,16 @@ from os import path as ospath, execl
 from asyncio import create_subprocess_exec
 from sys import executable
 
+from FZBypass.core.api_server import api_server
+from FZBypass.core.bypass_checker import execute_link
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.job_queue import job_queue
+from FZBypass.core.metrics import metrics
+from FZBypass.core.recaptcha import ouo_tokens
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.session_pool import session_pool
+from FZBypass.core.sync_pool import shutdown_pools
+
 
 @Bypass.on_message(command("restart") & user(Config.OWNER_ID))
 async def restart(client, message):
@@ -12,6 +22,14 @@ async def restart(client, message):
     await (await create_subprocess_exec("python3", "update.py")).wait()
     with open(".restartmsg", "w") as f:
         f.write(f"{restart_message.chat.id}\n{restart_message.id}\n")
+    await ouo_tokens.close()
+    await api_server.close()
+    await job_queue.close()
+    await session_pool.close()
+    scraper_pool.close()
+    cookie_store.close()
+    await metrics.close()
+    shutdown_pools()
     try:
         execl(executable, executable, "-m", "FZBypass")
     except Exception:
@@ -31,7 +49,22 @@ async def restart():
 
 
 Bypass.start()
+if Config.METRICS_PORT:
+    Bypass.loop.run_until_complete(metrics.serve(Config.METRICS_PORT))
+if Config.API_PORT and not Config.API_KEY:
+    LOGGER.error("API_PORT is Set but API_KEY is Empty, Bypass API not Started!")
+elif Config.API_PORT:
+    Bypass.loop.run_until_complete(api_server.serve(Config.API_PORT, Config.API_HOST))
+Bypass.loop.run_until_complete(job_queue.start(execute_link))
 LOGGER.info("FZ Bot Started!")
 Bypass.loop.run_until_complete(restart())
 idle()
+Bypass.loop.run_until_complete(ouo_tokens.close())
+Bypass.loop.run_until_complete(api_server.close())
+Bypass.loop.run_until_complete(job_queue.close())
+Bypass.loop.run_until_complete(session_pool.close())
+scraper_pool.close()
+cookie_store.close()
+Bypass.loop.run_until_complete(metrics.close())
+shutdown_pools()
 Bypass.stop()
@@ -0,0 +1,118 @@
+"""
+Headless batch runner: bypasses links without the Telegram client.
+
+Reads one link per line from files or stdin and writes one JSON result per
+line as soon as each link finishes, with its source file, line number and
+the time it took. Handler settings still come from `config.env`, but no
+bot credentials are needed.
+
+    python -m FZBypass.cli [-c 8] [-o results.jsonl] [links.txt ... | -]
+"""
+
+from argparse import ArgumentParser
+from asyncio import Lock, gather, run
+from contextlib import ExitStack
+from json import dumps
+from sys import stderr, stdin, stdout
+from time import monotonic
+
+from FZBypass import Config
+from FZBypass.core.bulk import line_link, result_entry, result_status
+from FZBypass.core.bypass_checker import chain_resolver, execute_link
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.job_queue import job_queue
+from FZBypass.core.recaptcha import ouo_tokens
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.session_pool import session_pool
+from FZBypass.core.sync_pool import run_sync, shutdown_pools
+
+
+async def read_links(paths):
+    """Yields `(name, line_no, link)` per link line, reading off the event loop so a slow stdin never stalls it."""
+    for path in paths or ["-"]:
+        if path == "-":
+            f = stdin
+        else:
+            f = await run_sync("cli", open, path, encoding="utf-8", errors="replace")
+        try:
+            line_no = 0
+            while line := await run_sync("cli", f.readline):
+                line_no += 1
+                if (link := line_link(line)) is not None:
+                    yield "<stdin>" if path == "-" else path, line_no, link
+        finally:
+            if f is not stdin:
+                f.close()
+
+
+async def bypass_all(paths, out, concurrency):
+    links, read_lock = read_links(paths), Lock()
+    counts = {"ok": 0, "partial": 0, "error": 0}
+    start = monotonic()
+
+    async def worker():
+        while True:
+            async with read_lock:
+                item = await anext(links, None)
+            if item is None:
+                return
+            name, line_no, link = item
+            link_start = monotonic()
+            try:
+                result = await chain_resolver.resolve(link)
+            except DDLException as e:
+                result = e
+            entry = {
+                "file": name,
+                "line": line_no,
+                **result_entry(link, result),
+                "took": round(monotonic() - link_start, 3),
+            }
+            counts[result_status(result)[0]] += 1
+            out.write(dumps(entry, ensure_ascii=False) + "\n")
+            out.flush()
+
+    try:
+        await gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        await links.aclose()
+    return counts, monotonic() - start
+
+
+async def main(args):
+    try:
+        with ExitStack() as files:
+            out = stdout
+            if args.output:
+                out = files.enter_context(
+                    await run_sync("cli", open, args.output, "w", encoding="utf-8")
+                )
+            await job_queue.start(execute_link)
+            counts, elapsed = await bypass_all(args.files, out, args.concurrency)
+    finally:
+        await job_queue.close()
+        await ouo_tokens.close()
+        await session_pool.close()
+        scraper_pool.close()
+        cookie_store.close()
+        shutdown_pools()
+    total = sum(counts.values())
+    print(
+        f"{total} links in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.2f}/s): "
+        f"{counts['ok']} ok, {counts['partial']} partial, {counts['error']} failed",
+        file=stderr,
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="python -m FZBypass.cli",
+        description="Bypass links from files or stdin, one JSON result per line.",
+    )
+    parser.add_argument("files", nargs="*", help="link files, `-` or none for stdin")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=Config.BULK_CONCURRENCY
+    )
+    parser.add_argument("-o", "--output", help="write JSONL here instead of stdout")
+    run(main(parser.parse_args()))
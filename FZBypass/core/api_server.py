@@ -0,0 +1,152 @@
+from asyncio import Lock, Semaphore, gather
+from hmac import compare_digest
+from json import JSONDecodeError, dumps, loads
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.bulk import result_entry
+from FZBypass.core.bypass_checker import chain_resolver
+from FZBypass.core.exceptions import DDLException
+
+
+class ApiServer:
+    """
+    JSON API over the bypass engine for other services, without a chat round trip.
+
+    `POST /bypass` takes `{"link": ...}`, `POST /bypass/batch` takes
+    `{"links": [...]}` (at most `max_batch`) and answers in input order, and
+    `POST /bypass/stream` reads one link per line (plain or JSON) and writes
+    one NDJSON result per line as each finishes. Every request needs the API
+    key as `Authorization: Bearer <key>` or `X-API-Key`, and at most
+    `concurrency` links resolve at once across all requests.
+    """
+
+    def __init__(self, resolve, key, concurrency, max_batch):
+        self.resolve = resolve
+        self.key = key
+        self.concurrency = concurrency
+        self.max_batch = max_batch
+        self._limit = Semaphore(concurrency)
+        self._runner = None
+
+    def _authorized(self, request):
+        header = request.headers.get("Authorization", "")
+        token = header[7:] if header.startswith("Bearer ") else ""
+        token = token or request.headers.get("X-API-Key", "")
+        return bool(self.key) and compare_digest(token.encode(), self.key.encode())
+
+    async def _entry(self, link):
+        async with self._limit:
+            try:
+                result = await self.resolve(link)
+            except DDLException as e:
+                result = e
+        return result_entry(link, result)
+
+    @staticmethod
+    def _link(value):
+        if isinstance(value, dict):
+            value = value.get("link")
+        if isinstance(value, str) and value.startswith(("http://", "https://")):
+            return value
+        return None
+
+    async def serve(self, port, host="127.0.0.1"):
+        from aiohttp import web
+
+        def error(status, message):
+            return web.json_response({"error": message}, status=status)
+
+        @web.middleware
+        async def auth(request, handler):
+            if not self._authorized(request):
+                return error(401, "Invalid or missing API key")
+            return await handler(request)
+
+        async def body(request):
+            try:
+                return await request.json()
+            except (JSONDecodeError, UnicodeDecodeError):
+                return None
+
+        async def bypass(request):
+            data = await body(request)
+            if not isinstance(data, dict) or not (link := self._link(data)):
+                return error(400, 'Expected {"link": "http(s)://..."}')
+            return web.json_response(await self._entry(link))
+
+        async def batch(request):
+            data = await body(request)
+            links = data.get("links") if isinstance(data, dict) else None
+            if not isinstance(links, list) or not links:
+                return error(400, 'Expected {"links": ["http(s)://...", ...]}')
+            if len(links) > self.max_batch:
+                return error(
+                    413, f"At most {self.max_batch} links per batch, use /bypass/stream"
+                )
+            if bad := [n for n, link in enumerate(links) if not self._link(link)]:
+                return error(400, f"Invalid links at index {bad[:10]}")
+            results = await gather(*(self._entry(self._link(link)) for link in links))
+            return web.json_response({"results": results})
+
+        async def stream(request):
+            resp = web.StreamResponse(
+                headers={"Content-Type": "application/x-ndjson; charset=utf-8"}
+            )
+            await resp.prepare(request)
+            read_lock, write_lock = Lock(), Lock()
+            index = -1
+
+            async def next_line():
+                nonlocal index
+                async with read_lock:
+                    while line := await request.content.readline():
+                        if line := line.strip():
+                            index += 1
+                            return index, line.decode("utf-8", "replace")
+                    return None
+
+            async def worker():
+                while (item := await next_line()) is not None:
+                    ind, line = item
+                    try:
+                        link = self._link(
+                            loads(line) if line[0] in '{"' else line.split()[0]
+                        )
+                    except JSONDecodeError:
+                        link = None
+                    if link is None:
+                        entry = {
+                            "source": line,
+                            "status": "error",
+                            "error": "Not a link",
+                        }
+                    else:
+                        entry = await self._entry(link)
+                    async with write_lock:
+                        await resp.write(
+                            dumps({"index": ind, **entry}, ensure_ascii=False).encode()
+                            + b"\n"
+                        )
+
+            await gather(*(worker() for _ in range(self.concurrency)))
+            await resp.write_eof()
+            return resp
+
+        app = web.Application(middlewares=[auth])
+        app.router.add_post("/bypass", bypass)
+        app.router.add_post("/bypass/batch", batch)
+        app.router.add_post("/bypass/stream", stream)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        LOGGER.info(f"Bypass API listening on {host}:{port}")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+api_server = ApiServer(
+    chain_resolver.resolve, Config.API_KEY, Config.API_CONCURRENCY, Config.API_MAX_BATCH
+)
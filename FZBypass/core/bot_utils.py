@@ -1,9 +1,12 @@
 from pyrogram.filters import create
 from pyrogram.enums import MessageEntityType
 from re import search, match
-from requests import get as rget
+from asyncio import Semaphore
 from urllib.parse import urlparse, parse_qs
 from FZBypass import Config
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.result_cache import ResultCache
+from FZBypass.core.session_pool import session_pool
 
 
 async def auth_topic(_, __, message):
@@ -60,15 +63,31 @@ def get_gdriveid(link):
     return parse_qs(parsed.query)["id"][0]
 
 
-def get_dl(link, direct_mode=False):
+index_cache = ResultCache(4096, Config.INDEX_CACHE_TTL)
+index_limit = Semaphore(Config.INDEX_CONCURRENCY)
+
+
+async def get_dl(link, direct_mode=False):
     if direct_mode and not Config.DIRECT_INDEX:
         return "No Direct Index Added !"
+    file_id = get_gdriveid(link)
+    if (dl_link := await index_cache.get(file_id)) is not None:
+        return dl_link
+    from aiohttp import ClientError
+
     try:
-        return rget(
-            f"{Config.DIRECT_INDEX}/generate.aspx?id={get_gdriveid(link)}"
-        ).json()["link"]
-    except:
-        return f"{Config.DIRECT_INDEX}/direct.aspx?id={get_gdriveid(link)}"
+        async with (
+            index_limit,
+            session_pool.session(cap=Config.INDEX_TIMEOUT) as session,
+            session.get(
+                f"{Config.DIRECT_INDEX}/generate.aspx", params={"id": file_id}
+            ) as resp,
+        ):
+            dl_link = (await resp.json(content_type=None))["link"]
+    except (ClientError, TimeoutError, ValueError, KeyError, TypeError, DDLException):
+        return f"{Config.DIRECT_INDEX}/direct.aspx?id={file_id}"
+    await index_cache.set(file_id, dl_link, Config.INDEX_CACHE_TTL)
+    return dl_link
 
 
 def convert_time(seconds):
@@ -82,3 +101,12 @@ def convert_time(seconds):
     if result == "":
         return "0ms"
     return result
+
+
+def get_readable_file_size(size):
+    size = float(size or 0)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            break
+        size /= 1024
+    return f"{size:.2f} {unit}" if unit != "B" else f"{int(size)} B"
@@ -0,0 +1,206 @@
+from asyncio import Lock, gather
+from csv import writer as csv_writer
+from html import unescape
+from json import dumps
+from time import monotonic
+
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.outbox import TAG
+from FZBypass.core.sync_pool import run_sync
+
+FORMATS = ("txt", "jsonl", "csv")
+READ_CHUNK = 1 << 16
+
+
+def plain(text):
+    return unescape(TAG.sub("", str(text))).strip()
+
+
+def result_status(result):
+    """`(status, error)` of a resolved chain or the exception it raised."""
+    if isinstance(result, Exception):
+        return "error", plain(result)
+    first = result.hops[0]
+    status = "error" if first.error else "partial" if result.error else "ok"
+    return status, plain(result.error or first.error or "") or None
+
+
+def result_entry(link, result):
+    """JSON-ready result: the status, the final link as plain text and the full chain."""
+    status, error = result_status(result)
+    if isinstance(result, Exception):
+        return {"source": link, "status": status, "error": error}
+    final = result.final
+    return {
+        "source": link,
+        "status": status,
+        "text": plain(final) if final is not None else None,
+        **result.to_dict(),
+    }
+
+
+def line_link(line):
+    """The link a line starts with, or None for blank, comment and other lines."""
+    link = line.strip().split(maxsplit=1)[0] if line.strip() else ""
+    return link if link.startswith(("http://", "https://")) else None
+
+
+def iter_links(path, limit=0):
+    """Yields `(line_no, link)` for every link line of a text file, reading it one line at a time."""
+    count = 0
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_no, line in enumerate(f, start=1):
+            if (link := line_link(line)) is None:
+                continue
+            yield line_no, link
+            count += 1
+            if limit and count >= limit:
+                return
+
+
+def count_links(path, limit=0):
+    """Link lines of a file, counted up to `limit` + 1 so a file over the cap is not read through."""
+    return sum(1 for _ in iter_links(path, limit + 1 if limit else 0))
+
+
+async def read_links(path, limit=0):
+    """`iter_links` reading chunks of lines on the `bulk` thread pool, so a large file never blocks the loop."""
+    f = await run_sync("bulk", open, path, encoding="utf-8", errors="replace")
+    try:
+        line_no = count = 0
+        while lines := await run_sync("bulk", f.readlines, READ_CHUNK):
+            for line in lines:
+                line_no += 1
+                if (link := line_link(line)) is None:
+                    continue
+                yield line_no, link
+                count += 1
+                if limit and count >= limit:
+                    return
+    finally:
+        f.close()
+
+
+class ResultWriter:
+    """
+    Appends one bypass result at a time to a TXT, JSONL or CSV file. Use it
+    with `async with`, which opens and closes the file on the `bulk` thread.
+    """
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+
+    async def __aenter__(self):
+        self._file = await run_sync(
+            "bulk", open, self.path, "w", encoding="utf-8", newline=""
+        )
+        if self.fmt == "csv":
+            self._csv = csv_writer(self._file)
+            try:
+                await run_sync(
+                    "bulk",
+                    self._csv.writerow,
+                    ("line", "source", "status", "result", "error", "hops", "elapsed"),
+                )
+            except BaseException:
+                await run_sync("bulk", self._file.close)
+                raise
+        return self
+
+    async def __aexit__(self, *exc):
+        await run_sync("bulk", self._file.close)
+
+    def write(self, line_no, link, result):
+        if self.fmt == "jsonl":
+            entry = {"line": line_no, **result_entry(link, result)}
+            self._file.write(dumps(entry, ensure_ascii=False) + "\n")
+            return
+        status, error = result_status(result)
+        if isinstance(result, Exception):
+            hops, elapsed, final = [], 0.0, None
+        else:
+            hops, elapsed, final = result.hops, result.elapsed, result.final
+        if self.fmt == "csv":
+            self._csv.writerow(
+                (
+                    line_no,
+                    link,
+                    status,
+                    plain(final) if final else "",
+                    error or "",
+                    len(hops),
+                    f"{elapsed:.2f}",
+                )
+            )
+        else:
+            text = f"[{line_no}] {link}\n"
+            for hop in hops:
+                if hop.result is not None:
+                    text += f" → {plain(hop.result)}\n"
+            if error:
+                text += f" ✗ {error}\n"
+            self._file.write(text + "\n")
+
+
+class BulkProgress:
+    __slots__ = ("capped", "done", "failed", "ok", "start", "total")
+
+    def __init__(self, total, capped=False):
+        self.total = total
+        self.capped = capped
+        self.done = self.ok = self.failed = 0
+        self.start = monotonic()
+
+    @property
+    def rate(self):
+        elapsed = monotonic() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        return (self.total - self.done) / self.rate if self.rate else None
+
+
+async def bypass_file(resolve, src, dst, fmt, concurrency, limit=0, on_result=None):
+    """
+    Runs every link of `src` through `resolve`, which raises DDLException for
+    a failed link, and writes the results to `dst`.
+
+    Links are read lazily and results are written as they finish, so only the
+    `concurrency` links in flight are ever held in memory. Results come out in
+    completion order, each tagged with its line number in `src`. Links past
+    `limit` are skipped, and `capped` tells whether there were any. All file
+    I/O runs on the single `bulk` thread, off the event loop.
+    """
+    found = await run_sync("bulk", count_links, src, limit)
+    progress = BulkProgress(min(found, limit) if limit else found, found > limit > 0)
+    links, read_lock = read_links(src, limit), Lock()
+
+    async def worker():
+        while True:
+            async with read_lock:
+                item = await anext(links, None)
+            if item is None:
+                return
+            line_no, link = item
+            try:
+                result = await resolve(link)
+            except DDLException as e:
+                result = e
+            failed = result_status(result)[0] == "error"
+            await run_sync("bulk", out.write, line_no, link, result)
+            progress.done += 1
+            if failed:
+                progress.failed += 1
+            else:
+                progress.ok += 1
+            if on_result is not None:
+                on_result(progress)
+
+    async with ResultWriter(dst, fmt) as out:
+        try:
+            await gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            await links.aclose()
+    return progress
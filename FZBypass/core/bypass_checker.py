@@ -1,11 +1,16 @@
-from re import match
+from time import time
 from urllib.parse import urlparse
 
-from FZBypass.core.bypass_dlinks import *
-from FZBypass.core.bypass_ddl import *
-from FZBypass.core.bypass_scrape import *
-from FZBypass.core.bot_utils import get_dl
+from FZBypass import Config
+from FZBypass.core.bypass_registry import HostRegistry
+from FZBypass.core.chain_resolver import ChainResolver
+from FZBypass.core.deadline import GRACE, Partial, deadline, until_deadline
+from FZBypass.core.metrics import metrics
 from FZBypass.core.exceptions import DDLException
+from FZBypass.core.job_queue import job_queue
+from FZBypass.core.result_cache import canonical_url, result_cache
+from FZBypass.core.scheduler import scheduler
+from FZBypass.core.single_flight import single_flight
 
 fmed_list = [
     "fembed.net",
@@ -21,429 +26,293 @@ fmed_list = [
 ]
 
 
-def is_share_link(url):
-    return bool(
-        match(
-            r"https?:\/\/.+\.(gdtot|filepress|pressbee|gdflix)\.\S+|https?:\/\/(gdflix|filepress|pressbee|onlystream|filebee|appdrive)\.\S+",
-            url,
-        )
-    )
+async def not_allowed(url):
+    raise DDLException("Bypass Not Allowed !")
 
 
-def is_excep_link(url):
-    return bool(
-        match(
-            r"https?:\/\/.+\.(1tamilmv|gdtot|filepress|pressbee|gdflix|sharespark)\.\S+|https?:\/\/(sharer|onlystream|hubdrive|katdrive|drivefire|skymovieshd|toonworld4all|kayoanime|cinevood|gdflix|filepress|pressbee|filebee|appdrive)\.\S+",
-            url,
-        )
-    )
+# (host patterns, DOMAIN, ref, sltime) -- ref None sends the link itself as Referer
+TRANSCRIPT_SITES = (
+    (("adrinolinks",), "https://adrinolinks.in", "https://bhojpuritop.in/", 8),
+    (("adsfly",), "https://go.adsfly.in/", "https://letest25.co/", 3),
+    (("**.anlinks",), "https://anlinks.in/", "https://dsblogs.fun/", 8),
+    (("ronylink",), "https://go.ronylink.com/", "https://livejankari.com/", 3),
+    (("*.evolinks",), "https://ads.evolinks.in/", None, 3),
+    (
+        ("*.tnshort",),
+        "https://news.sagenews.in/",
+        "https://movies.djnonstopmusic.in/",
+        5,
+    ),
+    (
+        ("xpshort", "push.bdnewsx", "techymozo"),
+        "https://xpshort.com/",
+        "https://www.comptegratuite.com/",
+        4.9,
+    ),
+    (("go.lolshort",), "https://get.lolshort.tech/", "https://tech.animezia.com/", 8),
+    (("onepagelink",), "https://go.onepagelink.in/", "https://gorating.in/", 3.1),
+    (
+        ("earn.moneykamalo",),
+        "https://go.moneykamalo.com/",
+        "https://bloging.techkeshri.com/",
+        4,
+    ),
+    (("droplink",), "https://droplink.co/", "https://yoshare.net/", 3.1),
+    (("tinyfy",), "https://tinyfy.in", "https://www.yotrickslog.tech/", 0),
+    (("krownlinks",), "https://go.hostadviser.net/", "blog.hostadviser.net/", 8),
+    (("du-link", "dulink"), "https://du-link.in", "https://profitshort.com/", 0),
+    (("indianshortner",), "https://indianshortner.com/", "https://moddingzone.in/", 5),
+    (("m.easysky",), "https://vip.linkbnao.com", "https://ffworld.xyz/", 2),
+    (("*.tnlink",), "https://news.sagenews.in/", "https://knowstuff.in/", 5),
+    (("link4earn",), "https://link4earn.com", "https://studyis.xyz/", 6),
+    (("shortingly",), "https://go.blogytube.com/", "https://blogytube.com/", 5),
+    (("short2url",), "https://techyuth.xyz/blog", "https://blog.coin2pay.xyz/", 10),
+    (("urlsopen",), "https://s.humanssurvival.com/", "https://1topjob.xyz/", 5),
+    (("mdisk",), "https://mdisk.pro", "https://www.meclipstudy.in/", 5),
+    (
+        ("pkin", "go.paisakamalo"),
+        "https://go.paisakamalo.in",
+        "https://healthtips.techkeshri.com/",
+        5,
+    ),
+    (
+        ("linkpays",),
+        "https://tech.smallinfo.in/Gadget/",
+        "https://finance.filmypoints.in/",
+        6,
+    ),
+    (("sklinks",), "https://sklinks.in", "https://dailynew.online/", 5),
+    (("link1s",), "https://link1s.com", "https://anhdep24.com/", 9),
+    (("tulinks",), "https://tulinks.one", "https://www.blogger.com/", 8),
+    (("*.tulinks",), "https://go.tulinks.online", "https://tutelugu.co/", 8),
+    (("**.vipurl",), "https://count.vipurl.in/", "https://kiss6kartu.in/", 5),
+    (("indyshare",), "https://indyshare.net", "https://insurancewolrd.in/", 3.1),
+    (("linkyearn",), "https://linkyearn.com", "https://gktech.uk/", 5),
+    (("earn4link",), "https://m.open2get.in/", "https://ezeviral.com/", 8),
+    (("linksly",), "https://go.linksly.co/", "https://en.themezon.net/", 5),
+    (("**.mdiskshortner",), "https://mdiskshortner.link", "https://yosite.net/", 0),
+    (
+        ("**.rocklinks",),
+        "https://land.povathemes.com/",
+        "https://blog.disheye.com/",
+        4.9,
+    ),
+    (("mplaylink",), "https://tera-box.cloud/", "https://mvplaylink.in.net/", 5),
+    (("shrinke",), "https://en.shrinke.me/", "https://themezon.net/", 15),
+    (("urlspay",), "https://finance.smallinfo.in/", "https://tech.filmypoints.in/", 5),
+    (("*.tnvalue",), "https://page.finclub.in/", "https://finclub.in/", 8),
+    (("sxslink",), "https://getlink.sxslink.com/", "https://cinemapettai.in/", 5),
+    (("moneycase",), "https://last.moneycase.link/", "https://www.infokeeda.xyz/", 3.1),
+    (("urllinkshort",), "https://web.urllinkshort.in", "https://suntechu.in/", 5),
+    (
+        ("*.dtglinks",),
+        "https://happyfiles.dtglinks.in/",
+        "https://tech.filohappy.in/",
+        5,
+    ),
+    (("v2links",), "https://vzu.us/", "https://newsbawa.com/", 5),
+    (("**.kpslink",), "https://kpslink.in/", "https://infotamizhan.xyz/", 3.1),
+    (("v2.kpslink",), "https://v2.kpslink.in/", "https://infotamizhan.xyz/", 5),
+    (("tamizhmasters",), "https://tamizhmasters.com/", "https://pokgames.com/", 5),
+    (("tglink",), "https://tglink.in/", "https://www.proappapk.com/", 5),
+    (
+        ("pandaznetwork",),
+        "https://pandaznetwork.com/",
+        "https://panda.freemodsapp.xyz/",
+        5,
+    ),
+    (("url4earn",), "https://go.url4earn.in/", "https://techminde.com/", 8),
+    (("ez4short",), "https://ez4short.com/", "https://ez4mods.com/", 5),
+    (
+        ("dalink",),
+        "https://get.tamilhit.tech/MR-X/tamil/",
+        "https://www.tamilhit.tech/",
+        8,
+    ),
+    (("*.omnifly",), "https://f.omnifly.in.net/", "https://ignitesmm.com/", 5),
+    (("sheralinks",), "https://sheralinks.com/", "https://blogyindia.com/", 0.8),
+    (("bindaaslinks",), "https://appsinsta.com/blog", "https://pracagov.com/", 3),
+    (("viplinks",), "https://m.vip-link.net/", "https://m.leadcricket.com/", 5),
+    (
+        ("*.short2url",),
+        "https://techyuth.xyz/blog/",
+        "https://blog.mphealth.online/",
+        10,
+    ),
+    (("shrinkforearn",), "https://shrinkforearn.in/", "https://wp.uploadfiles.in/", 8),
+    (("bringlifes",), "https://bringlifes.com/", "https://loanoffering.in/", 5),
+    (("*.linkfly",), "https://insurance.yosite.net/", "https://yosite.net/", 10),
+    (
+        ("*.earn2me",),
+        "https://blog.filepresident.com/",
+        "https://easyworldbusiness.com/",
+        5,
+    ),
+    (("*.vplinks",), "https://vplink.in", "https://insurance.findgptprompts.com/", 5),
+    (("*.narzolinks",), "https://go.narzolinks.click/", "https://hydtech.in/", 5),
+    (
+        ("earn2short",),
+        "https://go.earn2short.in/",
+        "https://tech.insuranceinfos.in/",
+        0.8,
+    ),
+    (("instantearn",), "https://get.instantearn.in/", "https://love.petrainer.in/", 5),
+    (("linkjust",), "https://linkjust.com/", "https://forexrw7.com/", 3.1),
+    (("pdiskshortener",), "https://pdiskshortener.com/", "", 10),
+    (("publicearn",), "https://publicearn.com/", "https://careersides.com/", 4.9),
+    (("modijiurl",), "https://modijiurl.com/", "https://loanoffering.in/", 8),
+    (("linkshortx",), "https://linkshortx.in/", "https://nanotech.org.in/", 4.9),
+    (("*.shorito",), "https://go.shorito.com/", "https://healthgo.gorating.in/", 8),
+    (("pdisk",), "https://last.moneycase.link/", "https://www.webzeni.com/", 4.9),
+    (("ziplinker",), "https://ziplinker.net", "https://fintech.techweeky.com/", 1),
+)
 
+DDL = "FZBypass.core.bypass_ddl"
+DLINKS = "FZBypass.core.bypass_dlinks"
+SCRAPE = "FZBypass.core.bypass_scrape"
 
-async def direct_link_checker(link, onlylink=False):
-    domain = urlparse(link).hostname
+# Handlers are "module:function" strings, imported on their first bypass
+bypass_registry = HostRegistry()
 
-    # File Hoster Links
-    if bool(match(r"https?:\/\/(yadi|disk.yandex)\.\S+", link)):
-        return await yandex_disk(link)
-    elif bool(match(r"https?:\/\/.+\.mediafire\.\S+", link)):
-        return await mediafire(link)
-    elif bool(match(r"https?:\/\/shrdsk\.\S+", link)):
-        return await shrdsk(link)
-    elif any(
-        x in domain
-        for x in [
-            "1024tera",
-            "terabox",
-            "nephobox",
-            "4funbox",
-            "mirrobox",
-            "momerybox",
-            "teraboxapp",
-        ]
-    ):
-        return await terabox(link)
-    elif "drive.google.com" in link:
-        return get_dl(link, True)
+# File Hoster Links
+bypass_registry.add(f"{DDL}:yandex_disk", "yadi", "disk.yandex")
+bypass_registry.add(f"{DDL}:mediafire", "*.mediafire")
+bypass_registry.add(f"{DDL}:shrdsk", "shrdsk")
+bypass_registry.add(
+    f"{DDL}:terabox",
+    "*terabox*",
+    "*1024tera*",
+    "*nephobox*",
+    "*4funbox*",
+    "*mirrobox*",
+    "*momerybox*",
+    "*teraboxapp*",
+)
+bypass_registry.add(f"{DLINKS}:gdrive", "=drive.google.com")
 
-    # DDL Links
-    elif bool(match(r"https?:\/\/try2link\.\S+", link)):
-        blink = await try2link(link)
-    elif bool(match(r"https?:\/\/(gyanilinks|gtlinks)\.\S+", link)):
-        blink = await gyanilinks(link)
-        
-    elif bool(match(r"https?:\/\/adrinolinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://adrinolinks.in", "https://bhojpuritop.in/", 8
-        )
-    elif bool(match(r"https?:\/\/adsfly\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.adsfly.in/", "https://letest25.co/", 3
-        )
-    elif bool(match(r"https?:\/\/(.+\.)?anlinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://anlinks.in/", "https://dsblogs.fun/", 8
-        )
-    
-    elif bool(match(r"https?:\/\/ronylink\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.ronylink.com/", "https://livejankari.com/", 3
-        )
-    
-    elif bool(match(r"https?:\/\/.+\.evolinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://ads.evolinks.in/" , link, 3
-        )
-    elif bool(match(r"https?:\/\/.+\.tnshort\.\S+", link)):
-        blink = await transcript(
-            link, "https://news.sagenews.in/", "https://movies.djnonstopmusic.in/", 5
-        )
-    elif bool(match(r"https?:\/\/(xpshort|push.bdnewsx|techymozo)\.\S+", link)):
-        blink = await transcript(
-            link, "https://xpshort.com/", "https://www.comptegratuite.com/", 4.9
-        )
-    elif bool(match(r"https?:\/\/go.lolshort\.\S+", link)):
-        blink = await transcript(
-            link, "https://get.lolshort.tech/", "https://tech.animezia.com/", 8
-        )
-    elif bool(match(r"https?:\/\/onepagelink\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.onepagelink.in/", "https://gorating.in/", 3.1
-        )
-    elif bool(match(r"https?:\/\/earn.moneykamalo\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.moneykamalo.com/", "https://bloging.techkeshri.com/", 4
-        )
-    elif bool(match(r"https?:\/\/droplink\.\S+", link)):
-        blink = await transcript(
-            link, "https://droplink.co/", "https://yoshare.net/", 3.1
-        )
-    elif bool(match(r"https?:\/\/tinyfy\.\S+", link)):
-        blink = await transcript(
-            link, "https://tinyfy.in", "https://www.yotrickslog.tech/", 0
-        )
-    elif bool(match(r"https?:\/\/krownlinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.hostadviser.net/", "blog.hostadviser.net/", 8
-        )
-    elif bool(match(r"https?:\/\/(du-link|dulink)\.\S+", link)):
-        blink = await transcript(
-            link, "https://du-link.in", "https://profitshort.com/", 0
-        )
-    elif bool(match(r"https?:\/\/indianshortner\.\S+", link)):
-        blink = await transcript(
-            link, "https://indianshortner.com/", "https://moddingzone.in/", 5
-        )
-    elif bool(match(r"https?:\/\/m.easysky\.\S+", link)):
-        blink = await transcript(
-            link, "https://techy.veganab.co/", "https://camdigest.com/", 5
-        )
-        blink = await transcript(
-            link, "https://vip.linkbnao.com", "https://ffworld.xyz/", 2
-        )
-    elif bool(match(r"https?:\/\/.+\.tnlink\.\S+", link)):
-        blink = await transcript(
-            link, "https://news.sagenews.in/", "https://knowstuff.in/", 5
-        )
-    elif bool(match(r"https?:\/\/link4earn\.\S+", link)):
-        blink = await transcript(
-            link, "https://link4earn.com", "https://studyis.xyz/", 6
-        )
-    elif bool(match(r"https?:\/\/shortingly\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.blogytube.com/", "https://blogytube.com/", 5
-        )
-    elif bool(match(r"https?:\/\/short2url\.\S+", link)):
-        blink = await transcript(
-            link, "https://techyuth.xyz/blog", "https://blog.coin2pay.xyz/", 10
-        )
-    elif bool(match(r"https?:\/\/urlsopen\.\S+", link)):
-        blink = await transcript(
-            link, "https://s.humanssurvival.com/", "https://1topjob.xyz/", 5
-        )
-    elif bool(match(r"https?:\/\/mdisk\.\S+", link)):
-        blink = await transcript(
-            link, "https://mdisk.pro", "https://www.meclipstudy.in/", 5
-        )
-    elif bool(match(r"https?:\/\/(pkin|go.paisakamalo)\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.paisakamalo.in", "https://healthtips.techkeshri.com/", 5
-        )
-    elif bool(match(r"https?:\/\/linkpays\.\S+", link)):
-        blink = await transcript(
-            link, "https://tech.smallinfo.in/Gadget/", "https://finance.filmypoints.in/", 6
-        )
-    elif bool(match(r"https?:\/\/sklinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://sklinks.in", "https://dailynew.online/", 5
-        )
-    elif bool(match(r"https?:\/\/link1s\.\S+", link)):
-        blink = await transcript(
-            link, "https://link1s.com", "https://anhdep24.com/", 9
-        )
-    elif bool(match(r"https?:\/\/tulinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://tulinks.one", "https://www.blogger.com/", 8
-        )
-    elif bool(match(r"https?:\/\/.+\.tulinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.tulinks.online", "https://tutelugu.co/", 8
-        )
-    elif bool(match(r"https?:\/\/(.+\.)?vipurl\.\S+", link)):
-        blink = await transcript(
-            link, "https://count.vipurl.in/", "https://kiss6kartu.in/", 5
-        )
-    elif bool(match(r"https?:\/\/indyshare\.\S+", link)):
-        blink = await transcript(
-            link, "https://indyshare.net", "https://insurancewolrd.in/", 3.1
-        )
-    elif bool(match(r"https?:\/\/linkyearn\.\S+", link)):
-        blink = await transcript(
-            link, "https://linkyearn.com", "https://gktech.uk/", 5
-        )
-    elif bool(match(r"https?:\/\/earn4link\.\S+", link)):
-        blink = await transcript(
-            link, "https://m.open2get.in/", "https://ezeviral.com/", 8
-        )
-    elif bool(match(r"https?:\/\/linksly\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.linksly.co/", "https://en.themezon.net/", 5
-        )
-    elif bool(match(r"https?:\/\/(.+\.)?mdiskshortner\.\S+", link)):
-        blink = await transcript(
-            link, "https://mdiskshortner.link", "https://yosite.net/", 0
-        )
-    elif bool(match(r"https?://(?:\w+\.)?rocklinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://land.povathemes.com/", "https://blog.disheye.com/", 4.9
-        )
-    elif bool(match(r"https?:\/\/mplaylink\.\S+", link)):
-        blink = await transcript(
-            link, "https://tera-box.cloud/", "https://mvplaylink.in.net/", 5
-        )
-    elif bool(match(r"https?:\/\/shrinke\.\S+", link)):
-        blink = await transcript(
-            link, "https://en.shrinke.me/", "https://themezon.net/", 15
-        )
-    elif bool(match(r"https?:\/\/urlspay\.\S+", link)):
-        blink = await transcript(
-            link, "https://finance.smallinfo.in/", "https://tech.filmypoints.in/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.tnvalue\.\S+", link)):
-        blink = await transcript(
-            link, "https://page.finclub.in/", "https://finclub.in/", 8
-        )
-    elif bool(match(r"https?:\/\/sxslink\.\S+", link)):
-        blink = await transcript(
-            link, "https://getlink.sxslink.com/", "https://cinemapettai.in/", 5
-        )
-    
-    elif bool(match(r"https?:\/\/moneycase\.\S+", link)):
-        blink = await transcript(
-            link, "https://last.moneycase.link/", "https://www.infokeeda.xyz/", 3.1
-        )
-    elif bool(match(r"https?:\/\/urllinkshort\.\S+", link)):
-        blink = await transcript(
-            link, "https://web.urllinkshort.in", "https://suntechu.in/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.dtglinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://happyfiles.dtglinks.in/", "https://tech.filohappy.in/", 5
-        )
-    elif bool(match(r"https?:\/\/v2links\.\S+", link)):
-        blink = await transcript(
-            link, "https://vzu.us/", "https://newsbawa.com/", 5
-        )
-    elif bool(match(r"https?:\/\/(.+\.)?kpslink\.\S+", link)):
-        blink = await transcript(
-            link, "https://kpslink.in/", "https://infotamizhan.xyz/", 3.1
-        )
-    elif bool(match(r"https?:\/\/v2.kpslink\.\S+", link)):
-        blink = await transcript(
-            link, "https://v2.kpslink.in/", "https://infotamizhan.xyz/", 5
-        )
-    elif bool(match(r"https?:\/\/tamizhmasters\.\S+", link)):
-        blink = await transcript(
-            link, "https://tamizhmasters.com/", "https://pokgames.com/", 5
-        )
-    elif bool(match(r"https?:\/\/tglink\.\S+", link)):
-        blink = await transcript(
-            link, "https://tglink.in/", "https://www.proappapk.com/", 5
-        )
-    elif bool(match(r"https?:\/\/pandaznetwork\.\S+", link)):
-        blink = await transcript(
-            link, "https://pandaznetwork.com/", "https://panda.freemodsapp.xyz/", 5
-        )
-    elif bool(match(r"https?:\/\/url4earn\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.url4earn.in/", "https://techminde.com/", 8
-        )
-    elif bool(match(r"https?:\/\/ez4short\.\S+", link)):
-        blink = await transcript(
-            link, "https://ez4short.com/", "https://ez4mods.com/", 5
-        )
-    elif bool(match(r"https?:\/\/dalink\.\S+", link)):
-        blink = await transcript(
-            link, "https://get.tamilhit.tech/MR-X/tamil/", "https://www.tamilhit.tech/", 8
-        )
-    elif bool(match(r"https?:\/\/.+\.omnifly\.\S+", link)):
-        blink = await transcript(
-            link, "https://f.omnifly.in.net/", "https://ignitesmm.com/", 5
-        )
-    elif bool(match(r"https?:\/\/sheralinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://sheralinks.com/", "https://blogyindia.com/", 0.8
-        )
-    elif bool(match(r"https?:\/\/bindaaslinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://appsinsta.com/blog", "https://pracagov.com/", 3
-        )
-    elif bool(match(r"https?:\/\/viplinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://m.vip-link.net/", "https://m.leadcricket.com/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.short2url\.\S+", link)):
-        blink = await transcript(
-            link, "https://techyuth.xyz/blog/", "https://blog.mphealth.online/", 10
-        )
-    elif bool(match(r"https?:\/\/shrinkforearn\.\S+", link)):
-        blink = await transcript(
-            link, "https://shrinkforearn.in/", "https://wp.uploadfiles.in/", 8
-        )
-    elif bool(match(r"https?:\/\/bringlifes\.\S+", link)):
-        blink = await transcript(
-            link, "https://bringlifes.com/", "https://loanoffering.in/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.linkfly\.\S+", link)):
-        blink = await transcript(
-            link, "https://insurance.yosite.net/", "https://yosite.net/", 10
-        )
-    elif bool(match(r"https?:\/\/.+\.earn2me\.\S+", link)):
-        blink = await transcript(
-            link, "https://blog.filepresident.com/", "https://easyworldbusiness.com/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.vplinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://vplink.in", "https://insurance.findgptprompts.com/", 5
-        )
-    elif bool(match(r"https?:\/\/.+\.narzolinks\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.narzolinks.click/", "https://hydtech.in/", 5
-        )
-    elif bool(match(r"https?:\/\/earn2short\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.earn2short.in/", "https://tech.insuranceinfos.in/", 0.8
-        )
-    elif bool(match(r"https?:\/\/instantearn\.\S+", link)):
-        blink = await transcript(
-            link, "https://get.instantearn.in/", "https://love.petrainer.in/", 5
-        )
-    elif bool(match(r"https?:\/\/linkjust\.\S+", link)):
-        blink = await transcript(
-            link, "https://linkjust.com/", "https://forexrw7.com/", 3.1
-        )
-    elif bool(match(r"https?:\/\/pdiskshortener\.\S+", link)):
-        blink = await transcript(
-            link, "https://pdiskshortener.com/", "", 10
-        )
-    elif bool(match(r"https?:\/\/publicearn\.\S+", link)):
-        blink = await transcript(
-            link, "https://publicearn.com/", "https://careersides.com/", 4.9
-        )
-    elif bool(match(r"https?:\/\/modijiurl\.\S+", link)):
-        blink = await transcript(
-            link, "https://modijiurl.com/", "https://loanoffering.in/", 8
-        )
-    elif bool(match(r"https?:\/\/linkshortx\.\S+", link)):
-        blink = await transcript(
-            link, "https://linkshortx.in/", "https://nanotech.org.in/", 4.9
-        )
-    elif bool(match(r"https?:\/\/.+\.shorito\.\S+", link)):
-        blink = await transcript(
-            link, "https://go.shorito.com/", "https://healthgo.gorating.in/", 8
-        )
-    elif bool(match(r"https?:\/\/pdisk\.\S+", link)):
-        blink = await transcript(
-            link, "https://last.moneycase.link/", "https://www.webzeni.com/", 4.9
-        )
-    elif bool(match(r"https?:\/\/ziplinker\.\S+", link)):
-        blink = await transcript(
-            link, "https://ziplinker.net", "https://fintech.techweeky.com/", 1
-        )
-    elif bool(match(r"https?:\/\/ouo\.\S+", link)):
-        blink = await ouo(link)
-    elif bool(match(r"https?:\/\/(shareus|shrs)\.\S+", link)):
-        blink = await shareus(link)
-    elif bool(match(r"https?:\/\/(.+\.)?dropbox\.\S+", link)):
-        blink = await dropbox(link)
-    elif bool(match(r"https?:\/\/linkvertise\.\S+", link)):
-        blink = await linkvertise(link)
-    elif bool(match(r"https?:\/\/rslinks\.\S+", link)):
-        blink = await rslinks(link)
-    elif bool(match(r"https?:\/\/(bit|tinyurl|(.+\.)short|shorturl|t)\.\S+", link)):
-        blink = await shorter(link)
-    elif bool(match(r"https?:\/\/appurl\.\S+", link)):
-        blink = await appurl(link)
-    elif bool(match(r"https?:\/\/surl\.\S+", link)):
-        blink = await surl(link)
-    elif bool(match(r"https?:\/\/thinfi\.\S+", link)):
-        blink = await thinfi(link)
-    elif bool(match(r"https?:\/\/justpaste\.\S+", link)):
-        blink = await justpaste(link)
-    elif bool(match(r"https?:\/\/linksxyz\.\S+", link)):
-        blink = await linksxyz(link)
+# DDL Links
+bypass_registry.add(f"{DDL}:try2link", "try2link", chain=True)
+bypass_registry.add(f"{DDL}:gyanilinks", "gyanilinks", "gtlinks", chain=True)
+for patterns, *args in TRANSCRIPT_SITES:
+    bypass_registry.add(f"{DDL}:transcript", *patterns, args=args, chain=True)
+bypass_registry.add(f"{DDL}:ouo", "ouo", chain=True)
+bypass_registry.add(f"{DDL}:shareus", "shareus", "shrs", chain=True)
+bypass_registry.add(f"{DDL}:dropbox", "**.dropbox", chain=True)
+bypass_registry.add(f"{DDL}:linkvertise", "linkvertise", chain=True)
+bypass_registry.add(f"{DDL}:rslinks", "rslinks", chain=True)
+bypass_registry.add(
+    f"{DDL}:shorter", "bit", "tinyurl", "*.short", "shorturl", "t", chain=True
+)
+bypass_registry.add(f"{DDL}:appurl", "appurl", chain=True)
+bypass_registry.add(f"{DDL}:surl", "surl", chain=True)
+bypass_registry.add(f"{DDL}:thinfi", "thinfi", chain=True)
+bypass_registry.add(f"{DDL}:justpaste", "justpaste", chain=True)
+bypass_registry.add(f"{DDL}:linksxyz", "linksxyz", chain=True)
+
+# DL Sites
+bypass_registry.add(f"{SCRAPE}:cinevood", "cinevood", excep=True)
+bypass_registry.add(f"{SCRAPE}:kayoanime", "kayoanime", excep=True)
+bypass_registry.add(f"{SCRAPE}:toonworld4all", "toonworld4all", excep=True)
+bypass_registry.add(f"{SCRAPE}:skymovieshd", "skymovieshd", excep=True)
+bypass_registry.add(f"{SCRAPE}:sharespark", "*.sharespark", excep=True)
+bypass_registry.add(f"{SCRAPE}:tamilmv", "*.1tamilmv", excep=True)
+
+# DL Links
+bypass_registry.add(
+    f"{DLINKS}:drivescript",
+    "hubdrive",
+    args=(Config.HUBDRIVE_CRYPT, "HubDrive"),
+    excep=True,
+)
+bypass_registry.add(
+    f"{DLINKS}:drivescript",
+    "katdrive",
+    args=(Config.KATDRIVE_CRYPT, "KatDrive"),
+    excep=True,
+)
+bypass_registry.add(
+    f"{DLINKS}:drivescript",
+    "drivefire",
+    args=(Config.DRIVEFIRE_CRYPT, "DriveFire"),
+    excep=True,
+)
+bypass_registry.add(f"{DLINKS}:sharerpw", "sharer", excep=True)
+bypass_registry.add(f"{DLINKS}:gdtot", "*.gdtot", excep=True)
+bypass_registry.add(
+    f"{DLINKS}:filepress",
+    "*.filepress",
+    "*.pressbee",
+    "filepress",
+    "pressbee",
+    excep=True,
+)
+bypass_registry.add(f"{DLINKS}:appflix", "*.gdflix", "gdflix", "appdrive", excep=True)
+bypass_registry.add(f"{DLINKS}:sharer_scraper", "onlystream", "filebee", excep=True)
+
+# Exceptions
+bypass_registry.add(not_allowed, "*.technicalatg")
+
+
+def is_excep_link(url):
+    rule = bypass_registry.match(url)
+    return rule is not None and rule.excep
 
-    # DL Sites
-    elif bool(match(r"https?:\/\/cinevood\.\S+", link)):
-        return await cinevood(link)
-    elif bool(match(r"https?:\/\/kayoanime\.\S+", link)):
-        return await kayoanime(link)
-    elif bool(match(r"https?:\/\/toonworld4all\.\S+", link)):
-        return await toonworld4all(link)
-    elif bool(match(r"https?:\/\/skymovieshd\.\S+", link)):
-        return await skymovieshd(link)
-    elif bool(match(r"https?:\/\/.+\.sharespark\.\S+", link)):
-        return await sharespark(link)
-    elif bool(match(r"https?:\/\/.+\.1tamilmv\.\S+", link)):
-        return await tamilmv(link)
 
-    # DL Links
-    elif bool(match(r"https?:\/\/hubdrive\.\S+", link)):
-        return await drivescript(link, Config.HUBDRIVE_CRYPT, "HubDrive")
-    elif bool(match(r"https?:\/\/katdrive\.\S+", link)):
-        return await drivescript(link, Config.KATDRIVE_CRYPT, "KatDrive")
-    elif bool(match(r"https?:\/\/drivefire\.\S+", link)):
-        return await drivescript(link, Config.DRIVEFIRE_CRYPT, "DriveFire")
-    elif bool(match(r"https?:\/\/sharer\.\S+", link)):
-        return await sharerpw(link)
-    elif is_share_link(link):
-        if "gdtot" in domain:
-            return await gdtot(link)
-        elif "filepress" in domain or "pressbee" in domain:
-            return await filepress(link)
-        elif "appdrive" in domain or "gdflix" in domain:
-            return await appflix(link)
-        else:
-            return await sharer_scraper(link)
+async def run_rule(link, rule):
+    key = canonical_url(link)
+    if (result := await result_cache.get(key)) is not None:
+        return result
+    return await single_flight.do(key, resolve_rule, link, rule, key)
 
-    # Exceptions
-    elif bool(match(r"https?:\/\/.+\.technicalatg\.\S+", link)):
-        raise DDLException("Bypass Not Allowed !")
+
+async def resolve_rule(link, rule, key):
+    if job_queue.enabled:
+        start = time()
+        result = await job_queue.run(link)
     else:
+        async with scheduler.slot(urlparse(link).hostname, rule.handler.__name__):
+            start = time()
+            result = await metrics.run(rule, link)
+    if (
+        result
+        and not isinstance(result, Partial)
+        and (not rule.chain or urlparse(result).scheme in ("http", "https"))
+    ):
+        await result_cache.set(
+            key, result, result_cache.ttl_for(rule.handler.__name__), time() - start
+        )
+    return result
+
+
+async def execute_link(link):
+    """Runs a job claimed from the job queue on this instance; any failure raises DDLException."""
+    if (rule := bypass_registry.match(link)) is None:
         raise DDLException(
             f"<i>No Bypass Function Found for your Link :</i> <code>{link}</code>"
         )
+    async with scheduler.slot(urlparse(link).hostname, rule.handler.__name__):
+        try:
+            return await metrics.run(rule, link)
+        except DDLException:
+            raise
+        except Exception as e:
+            raise DDLException(str(e) or e.__class__.__name__) from e
 
-    if onlylink:
-        return blink
 
-    links = []
-    while True:
-        try:
-            links.append(blink)
-            blink = await direct_link_checker(blink, onlylink=True)
-            if is_excep_link(links[-1]):
-                links.append("\n\n" + blink)
-                break
-        except Exception:
-            break
-    return links
+chain_resolver = ChainResolver(
+    bypass_registry, run_rule, Config.CHAIN_MAX_HOPS, Config.CHAIN_TIMEOUT
+)
+
+
+async def direct_link_checker(link, onlylink=False):
+    if onlylink:
+        if (rule := bypass_registry.match(link)) is None:
+            raise DDLException(
+                f"<i>No Bypass Function Found for your Link :</i> <code>{link}</code>"
+            )
+        with deadline(Config.CHAIN_TIMEOUT):
+            return await until_deadline(run_rule(link, rule), GRACE)
+    chain = await chain_resolver.resolve(link)
+    if (first := chain.hops[0]).error:
+        raise DDLException(first.error)
+    return chain.links if first.chain else first.result
@@ -1,18 +1,39 @@
 from requests import post as rpost ,get as rget
 from re import findall, compile
 from time import sleep, time
-from asyncio import sleep as asleep
-from urllib.parse import quote, urlparse
+from asyncio import (
+    Queue,
+    Semaphore,
+    create_task,
+    sleep as asleep,
+)
+from contextlib import aclosing, suppress
+from json import loads
+from random import uniform
+from urllib.parse import parse_qs, quote, urlparse
 
 from bs4 import BeautifulSoup
-from cloudscraper import create_scraper
 from curl_cffi.requests import Session as cSession
-from requests import Session, get as rget
-from aiohttp import ClientSession
 
 from FZBypass import Config
+from FZBypass.core import extractors
+from FZBypass.core.bot_utils import get_readable_file_size
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.deadline import Partial, bind, bounded, check, remaining
 from FZBypass.core.exceptions import DDLException
-from FZBypass.core.recaptcha import recaptchaV3
+from FZBypass.core.form_extract import extract_form
+from FZBypass.core.metrics import phase, timed
+from FZBypass.core.recaptcha import ouo_tokens
+from FZBypass.core.result_cache import ResultCache
+from FZBypass.core.session_pool import session_pool
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.sync_pool import run_parse, run_sync
+from FZBypass.core.wait_tuner import wait_tuner
+
+BeautifulSoup = timed("parse", BeautifulSoup)
+extract_form = timed("parse", extract_form)
+rget = bounded(rget)
+rpost = bounded(rpost)
 
 async def get_readable_time(seconds):
     minutes, seconds = divmod(seconds, 60)
@@ -21,14 +42,19 @@ async def get_readable_time(seconds):
 
 
 async def yandex_disk(url: str) -> str:
-    cget = create_scraper().request
-    try:
-        return cget(
-            "get",
-            f"https://cloud-api.yandex.net/v1/disk/public/resources/download?public_key={url}",
-        ).json()["href"]
-    except KeyError:
-        raise DDLException("File not Found / Download Limit Exceeded")
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        try:
+            return (
+                await run_sync(
+                    "hoster",
+                    cget,
+                    "get",
+                    f"https://cloud-api.yandex.net/v1/disk/public/resources/download?public_key={url}",
+                )
+            ).json()["href"]
+        except KeyError:
+            raise DDLException("File not Found / Download Limit Exceeded")
 
 
 async def mediafire(url: str):
@@ -36,100 +62,252 @@ async def mediafire(url: str):
         r"https?:\/\/download\d+\.mediafire\.com\/\S+\/\S+\/\S+", url
     ):
         return final_link[0]
-    cget = create_scraper().request
-    try:
-        url = cget("get", url).url
-        page = cget("get", url).text
-    except Exception as e:
-        raise DDLException(f"{e.__class__.__name__}")
-    if final_link := findall(
-        r"\'(https?:\/\/download\d+\.mediafire\.com\/\S+\/\S+\/\S+)\'", page
-    ):
-        return final_link[0]
-    elif temp_link := findall(
-        r'\/\/(www\.mediafire\.com\/file\/\S+\/\S+\/file\?\S+)', page
-    ):
-        return await mediafire("https://"+temp_link[0].strip('"'))
-    else:
-        raise DDLException("No links found in this page")
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        try:
+            url = (await run_sync("hoster", cget, "get", url)).url
+            page = (await run_sync("hoster", cget, "get", url)).text
+        except Exception as e:
+            raise DDLException(f"{e.__class__.__name__}") from e
+        if final_link := findall(
+            r"\'(https?:\/\/download\d+\.mediafire\.com\/\S+\/\S+\/\S+)\'", page
+        ):
+            return final_link[0]
+        elif temp_link := findall(
+            r'\/\/(www\.mediafire\.com\/file\/\S+\/\S+\/file\?\S+)', page
+        ):
+            return await mediafire("https://"+temp_link[0].strip('"'))
+        else:
+            raise DDLException("No links found in this page")
 
 
 async def shrdsk(url: str) -> str:
-    cget = create_scraper().request
-    try:
-        url = cget("GET", url).url
-        res = cget(
-            "GET",
-            f'https://us-central1-affiliate2apk.cloudfunctions.net/get_data?shortid={url.split("/")[-1]}',
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        try:
+            url = (await run_sync("hoster", cget, "GET", url)).url
+            res = await run_sync(
+                "hoster",
+                cget,
+                "GET",
+                f'https://us-central1-affiliate2apk.cloudfunctions.net/get_data?shortid={url.split("/")[-1]}',
+            )
+        except Exception as e:
+            raise DDLException(f"{e.__class__.__name__}") from e
+        if res.status_code != 200:
+            raise DDLException(f"Status Code {res.status_code}")
+        res = res.json()
+        if "type" in res and res["type"].lower() == "upload" and "video_url" in res:
+            return quote(res["video_url"], safe=":/")
+        raise DDLException("No Direct Link Found")
+
+
+TERA_DOMAIN = "https://www.terabox.com"
+TERA_PAGE_SIZE = 100
+TERA_CONCURRENCY = 4
+TERA_RETRIES = 4
+TERA_BACKOFF = 0.5
+TERA_BACKOFF_CAP = 8
+TERA_TOKEN_TTL = 600
+tera_tokens = ResultCache(1024, TERA_TOKEN_TTL)
+
+
+async def tera_request(session, url, params=None):
+    """GETs `url` with jittered exponential backoff on network errors and 5xx, within the deadline."""
+    from aiohttp import ClientError
+
+    for attempt in range(TERA_RETRIES):
+        try:
+            async with session.get(url, params=params) as resp:
+                if resp.status < 500:
+                    return str(resp.url), await resp.text()
+                error = DDLException(f"Status Code {resp.status}")
+        except (ClientError, TimeoutError) as e:
+            # a timeout cut short by the deadline is reported as the deadline
+            check()
+            error = e
+        delay = uniform(0, min(TERA_BACKOFF_CAP, TERA_BACKOFF * 2**attempt))
+        left = remaining()
+        if attempt == TERA_RETRIES - 1 or (left is not None and left <= delay):
+            break
+        with phase("sleep"):
+            await asleep(delay)
+    raise error
+
+
+async def tera_surl(session, url):
+    parsed = urlparse(url)
+    if "surl=" in parsed.query:
+        return parse_qs(parsed.query)["surl"][0]
+    if parsed.path.startswith("/s/1"):
+        return parsed.path[4:].strip("/")
+    final_url, _ = await tera_request(session, url)
+    return final_url.split("?surl=")[-1]
+
+
+async def tera_token(session, surl):
+    _, page = await tera_request(
+        session, f"{TERA_DOMAIN}/wap/share/filelist", {"surl": surl}
+    )
+    if not (token := await run_parse(extractors.terabox_js_token, page)):
+        raise DDLException("Terabox jsToken Not Found, Check TERA_COOKIE")
+    await tera_tokens.set(surl, token, TERA_TOKEN_TTL)
+    return token
+
+
+async def tera_pages(session, surl, token, folder=None):
+    """Yields each page of a share's root (or `folder`) listing."""
+    params = {
+        "app_id": "250528",
+        "jsToken": token,
+        "shorturl": surl,
+        "num": TERA_PAGE_SIZE,
+    }
+    if folder is None:
+        params["root"] = 1
+    else:
+        params["dir"] = folder
+    page = 1
+    while True:
+        _, body = await tera_request(
+            session, f"{TERA_DOMAIN}/share/list", {**params, "page": page}
         )
-    except Exception as e:
-        raise DDLException(f"{e.__class__.__name__}")
-    if res.status_code != 200:
-        raise DDLException(f"Status Code {res.status_code}")
-    res = res.json()
-    if "type" in res and res["type"].lower() == "upload" and "video_url" in res:
-        return quote(res["video_url"], safe=":/")
-    raise DDLException("No Direct Link Found")
+        try:
+            result = loads(body)
+        except ValueError:
+            raise DDLException("Invalid Terabox Listing") from None
+        if result["errno"] != 0:
+            raise DDLException(
+                f"{result.get('errmsg', result['errno'])}, Check cookies"
+            )
+        yield result["list"]
+        if len(result["list"]) < TERA_PAGE_SIZE:
+            return
+        page += 1
+
+
+async def terabox_files(url):
+    """
+    Yields every file of a terabox share as it is listed, expanding folders
+    up to TERA_CONCURRENCY at a time. Listing pauses while the consumer is
+    behind, so a huge folder never sits in memory as a whole.
+    """
+    from aiohttp import ClientError
+
+    async with session_pool.session(
+        url=url, cookies={"ndus": Config.TERA_COOKIE}
+    ) as session:
+        cookie_store.load(session.cookie_jar, TERA_DOMAIN)
+        surl = await tera_surl(session, url)
+        cached = await tera_tokens.get(surl)
+        token = cached or await tera_token(session, surl)
+        pages = tera_pages(session, surl, token)
+        try:
+            first = await anext(pages)
+        except DDLException:
+            if cached is None:
+                raise
+            # the reused jsToken went stale
+            token = await tera_token(session, surl)
+            pages = tera_pages(session, surl, token)
+            first = await anext(pages)
+
+        files = Queue(TERA_PAGE_SIZE)
+        limit = Semaphore(TERA_CONCURRENCY)
+        tasks = set()
+        active = 0
+
+        def expand(listing):
+            nonlocal active
+            active += 1
+            task = create_task(walk(listing))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def walk(listing):
+            try:
+                async with limit:
+                    async for page in listing:
+                        for item in page:
+                            if str(item["isdir"]) != "0":
+                                expand(tera_pages(session, surl, token, item["path"]))
+                            else:
+                                await files.put(item)
+            except (ClientError, TimeoutError, DDLException, KeyError, TypeError) as e:
+                await files.put(e)
+            # not in a finally: a cancelled walk must not wait on a full queue
+            await files.put(None)
+
+        async def rest():
+            yield first
+            async for page in pages:
+                yield page
+
+        expand(rest())
+        try:
+            while active:
+                if (item := await files.get()) is None:
+                    active -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in list(tasks):
+                task.cancel()
 
 
 async def terabox(url: str) -> str:
-    sess = Session()
+    from aiohttp import ClientError
+
+    async with aclosing(terabox_files(url)) as files:
+        if (first := await anext(files, None)) is None:
+            raise DDLException("No Files Found")
+        text, total, error = tera_entry(first), 1, None
+        try:
+            async for item in files:
+                total += 1
+                if total <= Config.TERABOX_MAX_FILES:
+                    text += tera_entry(item)
+        except (ClientError, TimeoutError, DDLException, KeyError, TypeError) as e:
+            error = e
+    if total == 1 and error is None:
+        if not first.get("dlink"):
+            raise DDLException("Link Extraction Failed")
+        return first["dlink"]
+    if total > Config.TERABOX_MAX_FILES:
+        text += (
+            f"\n\n┠ <i>+{total - Config.TERABOX_MAX_FILES} more files not listed</i>"
+        )
+    text = f"┎ <b>Terabox Files :</b> {total}{text}"
+    if error is not None:
+        return Partial(f"{text}\n\n┖ <b>Listing Stopped :</b> {error}")
+    return text
 
-    def retryme(url):
-        while True:
-            try:
-                return sess.get(url)
-            except:
-                pass
-
-    url = retryme(url).url
-    key = url.split("?surl=")[-1]
-    url = f"http://www.terabox.com/wap/share/filelist?surl={key}"
-    sess.cookies.update({"ndus": Config.TERA_COOKIE})
-
-    res = retryme(url)
-    key = res.url.split("?surl=")[-1]
-    soup = BeautifulSoup(res.content, "lxml")
-    jsToken = None
-
-    for fs in soup.find_all("script"):
-        fstring = fs.string
-        if fstring and fstring.startswith("try {eval(decodeURIComponent"):
-            jsToken = fstring.split("%22")[1]
-
-    res = retryme(
-        f"https://www.terabox.com/share/list?app_id=250528&jsToken={jsToken}&shorturl={key}&root=1"
+
+def tera_entry(item):
+    if not (dlink := item.get("dlink")):
+        return f"\n\n┎ <b>Name :</b> <code>{item['path']}</code>\n┖ <b>Error :</b> Link Extraction Failed"
+    return (
+        f"\n\n┎ <b>Name :</b> <code>{item['path']}</code>\n"
+        f"┠ <b>Size :</b> {get_readable_file_size(item.get('size'))}\n"
+        f"┖ <b>Link :</b> <a href='{dlink}'>Download</a>"
     )
-    result = res.json()
-    if result["errno"] != 0:
-        raise DDLException(f"{result['errmsg']}' Check cookies")
-    result = result["list"]
-    if len(result) > 1:
-        raise DDLException("Can't download mutiple files")
-    result = result[0]
-
-    if result["isdir"] != "0":
-        raise DDLException("Can't download folder")
-    try:
-        return result["dlink"]
-    except:
-        raise DDLException("Link Extraction Failed")
 
-async def try2link(url: str) -> str:
-    DOMAIN = 'https://try2link.com'
+
+async def try2link(url: str, DOMAIN: str = 'https://try2link.com', sltime=6) -> str:
     code = url.split('/')[-1]
 
-    async with ClientSession() as session:
+    async with session_pool.session(url=DOMAIN) as session:
         referers = ['https://hightrip.net/', 'https://to-travel.netl', 'https://world2our.com/']
         for referer in referers:
             async with session.get(f'{DOMAIN}/{code}', headers={"Referer": referer}) as res:
                 if res.status == 200:
                     html = await res.text()
                     break
-        soup = BeautifulSoup(html, "html.parser")
-        inputs = soup.find(id="go-link").find_all(name="input")
-        data = { input.get('name'): input.get('value') for input in inputs }
-        await asleep(6)
+        data = dict(extract_form(html, form_only=True).inputs)
+        with phase("sleep"):
+            await asleep(sltime)
         async with session.post(f"{DOMAIN}/links/go", data=data, headers={ "X-Requested-With": "XMLHttpRequest" }) as resp:
             if 'application/json' in resp.headers.get('Content-Type'):
                 json_data = await resp.json()  
@@ -137,48 +315,51 @@ async def try2link(url: str) -> str:
                     return json_data['url']
                 except:        
                     raise DDLException("Link Extraction Failed")
+        raise DDLException("Link Extraction Failed")
 
 
-async def gyanilinks(url: str) -> str:
+async def gyanilinks(url: str, DOMAIN: str = "https://go.bloggingaro.com", sltime=5) -> str:
     '''
     Based on https://github.com/whitedemon938/Bypass-Scripts
     '''
     code = url.split('/')[-1]
     useragent = "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
-    DOMAIN = "https://go.bloggingaro.com"
     
-    async with ClientSession() as session:
+    async with session_pool.session(url=DOMAIN) as session:
         async with session.get(f"{DOMAIN}/{code}", headers={'Referer':'https://tech.hipsonyc.com/','User-Agent': useragent}) as res:
             cookies = res.cookies
             html = await res.text()
         async with session.get(f"{DOMAIN}/{code}", headers={'Referer':'https://hipsonyc.com/','User-Agent': useragent}, cookies=cookies) as resp:
             html = await resp.text()
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {inp.get('name'): inp.get('value') for inp in soup.find_all('input')}
-        await asleep(5)
+        data = dict(extract_form(html).inputs)
+        with phase("sleep"):
+            await asleep(sltime)
         async with session.post(f"{DOMAIN}/links/go", data=data, headers={'X-Requested-With':'XMLHttpRequest','User-Agent': useragent, 'Referer': f"{DOMAIN}/{code}"}, cookies=cookies) as links:
             if 'application/json' in links.headers.get('Content-Type'):
                 try:
                     return (await links.json())['url']
                 except Exception:
                       raise DDLException("Link Extraction Failed")
+        raise DDLException("Link Extraction Failed")
 
 
 async def ouo(url: str):
     tempurl = url.replace("ouo.io", "ouo.press")
     p = urlparse(tempurl)
     id = tempurl.split("/")[-1]
-    client = cSession(
-        headers={
-            "authority": "ouo.press",
-            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
-            "cache-control": "max-age=0",
-            "referer": "http://www.google.com/ig/adde?moduleurl=",
-            "upgrade-insecure-requests": "1",
-        }
+    client = bind(
+        cSession(
+            headers={
+                "authority": "ouo.press",
+                "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+                "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
+                "cache-control": "max-age=0",
+                "referer": "http://www.google.com/ig/adde?moduleurl=",
+                "upgrade-insecure-requests": "1",
+            }
+        )
     )
-    res = client.get(tempurl, impersonate="chrome110")
+    res = await run_sync("shortener", client.get, tempurl, impersonate="chrome110")
     next_url = f"{p.scheme}://{p.hostname}/go/{id}"
 
     for _ in range(2):
@@ -187,8 +368,10 @@ async def ouo(url: str):
         bs4 = BeautifulSoup(res.content, "lxml")
         inputs = bs4.form.findAll("input", {"name": compile(r"token$")})
         data = {inp.get("name"): inp.get("value") for inp in inputs}
-        data["x-token"] = await recaptchaV3()
-        res = client.post(
+        data["x-token"] = await ouo_tokens.get()
+        res = await run_sync(
+            "shortener",
+            client.post,
             next_url,
             data=data,
             headers={"content-type": "application/x-www-form-urlencoded"},
@@ -212,42 +395,62 @@ async def mdisk(url: str) -> str:
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.82 Safari/537.36",
     }
     URL = f'https://diskuploader.entertainvideo.com/v1/file/cdnurl?param={url.rstrip("/").split("/")[-1]}'
-    res = rget(url=URL, headers=header).json()
+    res = (await run_sync("shortener", rget, url=URL, headers=header)).json()
     return res["download"] + "\n\n" + res["source"]
 
 
 async def transcript(url: str, DOMAIN: str, ref: str, sltime) -> str:
+    from aiohttp import ClientError
+
     code = url.rstrip("/").split("/")[-1]
+    ref = url if ref is None else ref
     useragent = 'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36'
 
-    async with ClientSession() as session:
-         async with session.get(f"{DOMAIN}/{code}", headers={'Referer': ref, 'User-Agent': useragent}) as res:
-             html = await res.text()
-             cookies = res.cookies
-         soup = BeautifulSoup(html, "html.parser")
-         title_tag = soup.find('title')
-         if title_tag and title_tag.text == 'Just a moment...':
-             return "Unable To Bypass Due To Cloudflare Protected"
-         else:
-             data = {inp.get('name'): inp.get('value') for inp in soup.find_all('input') if inp.get('name') and inp.get('value')}
-             await asleep(sltime)
-             async with session.post(f"{DOMAIN}/links/go", data=data, headers={'Referer': f"{DOMAIN}/{code}", 'X-Requested-With':'XMLHttpRequest', 'User-Agent': useragent}, cookies=cookies) as resp:
-                  try:
-                      if 'application/json' in resp.headers.get('Content-Type'):
-                          return (await resp.json())['url']
-                  except Exception:
-                      raise DDLException("Link Extraction Failed")
+    async with session_pool.session(url=DOMAIN) as session:
+        async with session.get(f"{DOMAIN}/{code}", headers={'Referer': ref, 'User-Agent': useragent}) as res:
+            html = await res.text()
+            cookies = res.cookies
+        page = extract_form(html)
+        if page.cloudflare:
+            return "Unable To Bypass Due To Cloudflare Protected"
+        data = {name: value for name, value in page.inputs if name and value}
+
+        async def links_go():
+            async with session.post(f"{DOMAIN}/links/go", data=data, headers={'Referer': f"{DOMAIN}/{code}", 'X-Requested-With':'XMLHttpRequest', 'User-Agent': useragent}, cookies=cookies) as resp:
+                try:
+                    if 'application/json' in resp.headers.get('Content-Type'):
+                        return (await resp.json())['url']
+                except Exception as e:
+                    raise DDLException("Link Extraction Failed") from e
+
+        domain = urlparse(DOMAIN).hostname
+        wait = wait_tuner.plan(domain, sltime)
+        with phase("sleep"):
+            await asleep(wait)
+        if wait >= sltime:
+            return await links_go()
+        # a failed early try only means the wait was too short, unless time is up
+        with suppress(ClientError, TimeoutError, DDLException):
+            if link := await links_go():
+                await wait_tuner.success(domain, wait, sltime)
+                return link
+        check()
+        with phase("sleep"):
+            await asleep(sltime - wait)
+        if link := await links_go():
+            await wait_tuner.too_short(domain, wait, sltime)
+        return link
 
 
 async def justpaste(url: str):
-    resp = rget(url, verify=False)
+    resp = await run_sync("shortener", rget, url, verify=False)
     soup = BeautifulSoup(resp.text, "html.parser")
     inps = soup.select('div[id="articleContent"] > p')
     return ", ".join(elem.string for elem in inps)
     
 
 async def linksxyz(url: str):
-    resp = rget(url)
+    resp = await run_sync("shortener", rget, url)
     soup = BeautifulSoup(resp.text, "html.parser")
     inps = soup.select('div[id="redirect-info"] > a')
     return inps[0]["href"]
@@ -261,10 +464,10 @@ async def shareus(url: str) -> str:
         'Origin':'https://shareus.io',
     }
     api = f"{DOMAIN}/v?shortid={code}&initial=true&referrer="
-    id = rget(api, headers=headers).json()['sid']
+    id = (await run_sync("shortener", rget, api, headers=headers)).json()['sid']
     if id:
         api_2 = f"{DOMAIN}/get_link?sid={id}"
-        res = rget(api_2, headers=headers)
+        res = await run_sync("shortener", rget, api_2, headers=headers)
         if res:
             return res.json()['link_info']['destination']
         else:
@@ -282,7 +485,11 @@ async def dropbox(url: str) -> str:
 
 
 async def linkvertise(url: str) -> str:
-    resp = rget("https://bypass.pm/bypass2", params={"url": url}).json()
+    resp = (
+        await run_sync(
+            "shortener", rget, "https://bypass.pm/bypass2", params={"url": url}
+        )
+    ).json()
     if resp["success"]:
         return resp["destination"]
     else:
@@ -290,7 +497,7 @@ async def linkvertise(url: str) -> str:
 
 
 async def rslinks(url: str) -> str:
-    resp = rget(url, stream=True, allow_redirects=False)
+    resp = await run_sync("shortener", rget, url, stream=True, allow_redirects=False)
     code = resp.headers["location"].split("ms9")[-1]
     try:
         return f"http://techyproio.blogspot.com/p/short.html?{code}=="
@@ -300,29 +507,33 @@ async def rslinks(url: str) -> str:
 
 async def shorter(url: str) -> str:
     try:
-        cget = create_scraper().request
-        resp = cget("GET", url, allow_redirects=False)
-        return resp.headers["Location"]
+        async with scraper_pool.checkout(url) as scraper:
+            cget = scraper.request
+            resp = await run_sync("shortener", cget, "GET", url, allow_redirects=False)
+            return resp.headers["Location"]
     except:
         raise DDLException("Link Extraction Failed")
 
 
 async def appurl(url: str):
-    cget = create_scraper().request
-    resp = cget("GET", url, allow_redirects=False)
-    soup = BeautifulSoup(resp.text, "html.parser")
-    return soup.select('meta[property="og:url"]')[0]["content"]
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        resp = await run_sync("shortener", cget, "GET", url, allow_redirects=False)
+        soup = BeautifulSoup(resp.text, "html.parser")
+        return soup.select('meta[property="og:url"]')[0]["content"]
 
 
 async def surl(url: str):
-    cget = create_scraper().request
-    resp = cget("GET", f"{url}+")
-    soup = BeautifulSoup(resp.text, "html.parser")
-    return soup.select('p[class="long-url"]')[0].string.split()[1]
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        resp = await run_sync("shortener", cget, "GET", f"{url}+")
+        soup = BeautifulSoup(resp.text, "html.parser")
+        return soup.select('p[class="long-url"]')[0].string.split()[1]
 
 
 async def thinfi(url: str) -> str:
     try:
-        return BeautifulSoup(rget(url).content, "html.parser").p.a.get("href")
+        resp = await run_sync("shortener", rget, url)
+        return BeautifulSoup(resp.content, "html.parser").p.a.get("href")
     except:
         raise DDLException("Link Extraction Failed")
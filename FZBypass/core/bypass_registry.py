@@ -0,0 +1,116 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import NamedTuple
+from urllib.parse import urlparse
+
+
+class BypassRule(NamedTuple):
+    handler: Callable
+    args: tuple = ()
+    chain: bool = False
+    excep: bool = False
+    priority: int = 0
+    name: str = ""
+
+
+class LazyHandler:
+    """A `module:function` handler whose module is only imported on its first call."""
+
+    def __init__(self, path):
+        self.path = path
+        self.__name__ = path.rpartition(":")[2]
+        self._func = None
+
+    def load(self):
+        if self._func is None:
+            module, _, name = self.path.partition(":")
+            self._func = getattr(import_module(module), name)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyHandler({self.path!r})"
+
+
+class HostRegistry:
+    """
+    Maps host patterns to bypass handlers, resolved with one pass over the host labels.
+
+    Pattern forms (TLD is always free, like the old `\\S+` tail):
+        `name` / `a.name`   host starts with the labels (`adrinolinks.in`, `go.lolshort.tech`)
+        `*.name`            at least one subdomain before the labels (`link.tnshort.net`)
+        `**.name`           optional subdomains (`anlinks.in` and `get.anlinks.in`)
+        `*name*`            family, hostname contains the fragment (`www.1024terabox.com`)
+        `=host`             exact hostname (`drive.google.com`)
+
+    When several patterns match, the rule registered first wins. A handler may
+    be given as a `module:function` string to defer importing its module.
+    """
+
+    ROOT, SUB, ANY = 0, 1, 2
+
+    def __init__(self):
+        self._labels = {}
+        self._families = []
+        self._hosts = {}
+        self._rules = []
+        self._lazy = {}
+
+    def add(self, handler, *patterns, args=(), chain=False, excep=False):
+        if isinstance(handler, str):
+            handler = self._lazy.setdefault(handler, LazyHandler(handler))
+        # the site a rule stands for, a bounded label unlike the hosts it matches
+        name = patterns[0].strip("*=.") if patterns else handler.__name__
+        rule = BypassRule(handler, tuple(args), chain, excep, len(self._rules), name)
+        self._rules.append(rule)
+        for pattern in patterns:
+            if pattern.startswith("="):
+                self._hosts.setdefault(pattern[1:], rule)
+            elif pattern.startswith("*") and pattern.endswith("*"):
+                self._families.append((pattern.strip("*"), rule))
+            else:
+                where = self.ROOT
+                if pattern.startswith("**."):
+                    where, pattern = self.ANY, pattern[3:]
+                elif pattern.startswith("*."):
+                    where, pattern = self.SUB, pattern[2:]
+                labels = tuple(pattern.split("."))
+                self._labels.setdefault(labels[-1], []).append((labels, where, rule))
+        return rule
+
+    @property
+    def rules(self):
+        return tuple(self._rules)
+
+    def lookup(self, hostname):
+        if not hostname:
+            return None
+        best = self._hosts.get(hostname)
+        labels = hostname.split(".")
+        for pos, label in enumerate(labels[:-1]):
+            for plabels, where, rule in self._labels.get(label, ()):
+                if best is not None and best.priority <= rule.priority:
+                    continue
+                start = pos - len(plabels) + 1
+                if start < 0 or tuple(labels[start : pos + 1]) != plabels:
+                    continue
+                if (where == self.ROOT and start != 0) or (
+                    where == self.SUB and start == 0
+                ):
+                    continue
+                best = rule
+        for fragment, rule in self._families:
+            if (best is None or rule.priority < best.priority) and fragment in hostname:
+                best = rule
+        return best
+
+    def match(self, link):
+        try:
+            parsed = urlparse(link)
+        except ValueError:
+            return None
+        if parsed.scheme not in ("http", "https"):
+            return None
+        return self.lookup(parsed.hostname)
@@ -1,51 +1,54 @@
 from asyncio import gather, create_task
-from re import search, match, sub
 from requests import get as rget
-from cloudscraper import create_scraper
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup
 
+from FZBypass.core import extractors
 from FZBypass.core.bypass_ddl import transcript
+from FZBypass.core.deadline import Partial, bounded, until_deadline
+from FZBypass.core.exceptions import DDLException, DeadlineExceeded
+from FZBypass.core.metrics import timed
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.sync_pool import run_parse, run_sync
+
+BeautifulSoup = timed("parse", BeautifulSoup)
+rget = bounded(rget)
+
+TOONWORLD_REDIRECT_TRIES = 10
 
 
 async def sharespark(url: str) -> str:
-    gd_txt = ""
-    cget = create_scraper().request
-    res = cget("GET", "?action=printpage;".join(url.split("?")))
-    soup = BeautifulSoup(res.text, "html.parser")
-    for br in soup.findAll("br"):
-        next_s = br.nextSibling
-        if not (next_s and isinstance(next_s, NavigableString)):
-            continue
-        if (
-            (next2_s := next_s.nextSibling)
-            and isinstance(next2_s, Tag)
-            and next2_s.name == "br"
-            and str(next_s).strip()
-        ):
-            if match(r"^(480p|720p|1080p)(.+)? Links:\Z", next_s):
-                gd_txt += f'<b>{next_s.replace("Links:", "GDToT Links :")}</b>\n\n'
-            for s in next_s.split():
-                ns = sub(r"\(|\)", "", s)
-                if match(r"https?://.+\.gdtot\.\S+", ns):
-                    soup = BeautifulSoup(cget("GET", ns).text, "html.parser")
-                    parse_data = (
-                        (soup.select('meta[property^="og:description"]')[0]["content"])
-                        .replace("Download ", "")
-                        .rsplit("-", maxsplit=1)
+    gd_txt, partial = "", False
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        res = await run_sync("scrape", cget, "GET", "?action=printpage;".join(url.split("?")))
+        for item in await run_parse(extractors.sharespark_lines, res.text):
+            if item[0] == "quality":
+                gd_txt += f'<b>{item[1].replace("Links:", "GDToT Links :")}</b>\n\n'
+            elif item[0] == "gdtot":
+                try:
+                    name, size = await run_parse(
+                        extractors.og_description,
+                        (await run_sync("scrape", cget, "GET", item[1])).text,
                     )
-                    gd_txt += f"┎ <b>Name :</b> {parse_data[0]}\n┠ <b>Size :</b> {parse_data[-1]}\n┃\n┖ <b>GDTot :</b> {ns}\n\n"
-                elif match(r"https?://pastetot\.\S+", ns):
-                    nxt = sub(r"\(|\)|(https?://pastetot\.\S+)", "", next_s)
-                    gd_txt += f"\n<b>{nxt}</b>\n┖ {ns}\n"
-        if len(gd_txt) > 4000:
-            return gd_txt  # Broken Function
-    if gd_txt != "":
-        return gd_txt
+                except DeadlineExceeded:
+                    # out of time, still list the links without their details
+                    gd_txt += f"┖ <b>GDTot :</b> {item[1]}\n\n"
+                    partial = True
+                    continue
+                gd_txt += f"┎ <b>Name :</b> {name}\n┠ <b>Size :</b> {size}\n┃\n┖ <b>GDTot :</b> {item[1]}\n\n"
+            else:
+                gd_txt += f"\n<b>{item[1]}</b>\n┖ {item[2]}\n"
+            if len(gd_txt) > 4000:
+                return Partial(gd_txt) if partial else gd_txt  # Broken Function
+        if gd_txt != "":
+            return Partial(gd_txt) if partial else gd_txt
 
 
 async def skymovieshd(url: str) -> str:
-    soup = BeautifulSoup(rget(url, allow_redirects=False).text, "html.parser")
+    soup = BeautifulSoup(
+        (await run_sync("scrape", rget, url, allow_redirects=False)).text, "html.parser"
+    )
     t = soup.select('div[class^="Robiul"]')
     gd_txt = f"<i>{t[-1].text.replace('Download ', '')}</i>"
     _cache = []
@@ -55,7 +58,8 @@ async def skymovieshd(url: str) -> str:
         _cache.append(link["href"])
         gd_txt += f"\n\n<b>{link.text} :</b> \n"
         nsoup = BeautifulSoup(
-            rget(link["href"], allow_redirects=False).text, "html.parser"
+            (await run_sync("scrape", rget, link["href"], allow_redirects=False)).text,
+            "html.parser",
         )
         atag = nsoup.select('div[class="cotent-box"] > a[href]')
         for no, link in enumerate(atag, start=1):
@@ -64,74 +68,30 @@ async def skymovieshd(url: str) -> str:
 
 
 async def cinevood(url: str) -> str:
-    soup = BeautifulSoup(rget(url).text, "html.parser")
-    titles = soup.select("h6")
-    links_by_title = {}
-
-    # Extract the post title from the webpage's title
-    post_title = soup.title.string.strip()
-
-    for title in titles:
-        title_text = title.text.strip()
-        gdtot_links = title.find_next("a", href=lambda href: "gdtot" in href.lower())
-        multiup_links = title.find_next(
-            "a", href=lambda href: "multiup" in href.lower()
-        )
-        filepress_links = title.find_next(
-            "a", href=lambda href: "filepress" in href.lower()
-        )
-        gdflix_links = title.find_next("a", href=lambda href: "gdflix" in href.lower())
-        kolop_links = title.find_next("a", href=lambda href: "kolop" in href.lower())
-        zipylink_links = title.find_next(
-            "a", href=lambda href: "zipylink" in href.lower()
-        )
-
-        links = []
-        if gdtot_links:
-            links.append(
-                f'<a href="{gdtot_links["href"]}" style="text-decoration:none;"><b>GDToT</b></a>'
-            )
-        if multiup_links:
-            links.append(
-                f'<a href="{multiup_links["href"]}" style="text-decoration:none;"><b>MultiUp</b></a>'
-            )
-        if filepress_links:
-            links.append(
-                f'<a href="{filepress_links["href"]}" style="text-decoration:none;"><b>FilePress</b></a>'
-            )
-        if gdflix_links:
-            links.append(
-                f'<a href="{gdflix_links["href"]}" style="text-decoration:none;"><b>GDFlix</b></a>'
-            )
-        if kolop_links:
-            links.append(
-                f'<a href="{kolop_links["href"]}" style="text-decoration:none;"><b>Kolop</b></a>'
-            )
-        if zipylink_links:
-            links.append(
-                f'<a href="{zipylink_links["href"]}" style="text-decoration:none;"><b>ZipyLink</b></a>'
-            )
-
-        if links:
-            links_by_title[title_text] = links
-
+    post_title, links_by_title = await run_parse(
+        extractors.cinevood_links, (await run_sync("scrape", rget, url)).text
+    )
     prsd = f"<b>🔖 Title:</b> {post_title}\n"
-    for title, links in links_by_title.items():
+    for title, links in dict(links_by_title).items():
+        links = " | ".join(
+            f'<a href="{href}" style="text-decoration:none;"><b>{label}</b></a>'
+            for label, href in links
+        )
         prsd += f"\n┏<b>🏷️ Name:</b> <code>{title}</code>\n"
-        prsd += "┗<b>🔗 Links:</b> " + " | ".join(links) + "\n"
+        prsd += f"┗<b>🔗 Links:</b> {links}\n"
 
     return prsd
 
 
 async def kayoanime(url: str) -> str:
-    soup = BeautifulSoup(rget(url).text, "html.parser")
+    soup = BeautifulSoup((await run_sync("scrape", rget, url)).text, "html.parser")
     titles = soup.select("h6")
     gdlinks = soup.select('a[href*="drive.google.com"], a[href*="tinyurl"]')
     prsd = f"<b>{soup.title.string}</b>"
     gd_txt, link = "GDrive", ""
     for n, gd in enumerate(gdlinks, start=1):
         if (link := gd["href"]) and "tinyurl" in link:
-            link = rget(link).url
+            link = (await run_sync("scrape", rget, link)).url
             domain = urlparse(link).hostname
             gd_txt = (
                 "Mega"
@@ -149,73 +109,67 @@ async def kayoanime(url: str) -> str:
 
 async def toonworld4all(url: str):
     if "/redirect/main.php?url=" in url:
-        return f"┎ <b>Source Link:</b> {url}\n┃\n┖ <b>Bypass Link:</b> {rget(url).url}"
-    xml = rget(url).text
-    soup = BeautifulSoup(xml, "html.parser")
+        return f"┎ <b>Source Link:</b> {url}\n┃\n┖ <b>Bypass Link:</b> {(await run_sync('scrape', rget, url)).url}"
+    xml = (await run_sync("scrape", rget, url)).text
     if "/episode/" not in url:
-        epl = soup.select('a[href*="/episode/"]')
-        tls = soup.select('div[class*="mks_accordion_heading"]')
-        stitle = search(r"\"name\":\"(.+)\"", xml).group(1).split('"')[0]
+        stitle, episodes = await run_parse(extractors.toonworld_series, xml)
         prsd = f"<b><i>{stitle}</i></b>"
-        for n, (t, l) in enumerate(zip(tls, epl), start=1):
+        for n, (t, href) in enumerate(episodes, start=1):
             prsd += f"""
         
-{n}. <i><b>{t.strong.string}</b></i>
-┖ <b>Link :</b> {l["href"]}"""
+{n}. <i><b>{t}</b></i>
+┖ <b>Link :</b> {href}"""
         return prsd
-    links = soup.select('a[href*="/redirect/main.php?url="]')
-    titles = soup.select("h5")
-    prsd = f"<b><i>{titles[0].string}</i></b>"
+    titles, links = await run_parse(extractors.toonworld_episode, xml)
+    prsd = f"<b><i>{titles[0]}</i></b>"
     titles.pop(0)
     slicer, _ = divmod(len(links), len(titles))
-    atasks = []
-    for sl in links:
-        nsl = ""
-        while all(x not in nsl for x in ["rocklinks", "link1s"]):
-            nsl = rget(sl["href"], allow_redirects=False).headers["location"]
-        if "rocklinks" in nsl:
-            atasks.append(
-                create_task(
-                    transcript(
-                        nsl,
-                        "https://insurance.techymedies.com/",
-                        "https://highkeyfinance.com/",
-                        5,
-                    )
+
+    async def episode_link(href):
+        # the redirect picks a random shortener, retry until it is one we bypass
+        for _ in range(TOONWORLD_REDIRECT_TRIES):
+            nsl = (
+                await run_sync("scrape", rget, href, allow_redirects=False)
+            ).headers["location"]
+            if "rocklinks" in nsl:
+                return await transcript(
+                    nsl,
+                    "https://insurance.techymedies.com/",
+                    "https://highkeyfinance.com/",
+                    5,
                 )
-            )
-        elif "link1s" in nsl:
-            atasks.append(
-                create_task(
-                    transcript(nsl, "https://link1s.com", "https://anhdep24.com/", 9)
+            if "link1s" in nsl:
+                return await transcript(
+                    nsl, "https://link1s.com", "https://anhdep24.com/", 9
                 )
-            )
+        raise DDLException("No Supported Shortener in Redirects")
 
+    atasks = [create_task(until_deadline(episode_link(href))) for href, _ in links]
     com_tasks = await gather(*atasks, return_exceptions=True)
     lstd = [com_tasks[i : i + slicer] for i in range(0, len(com_tasks), slicer)]
 
     for no, tl in enumerate(titles):
-        prsd += f"\n\n<b>{tl.string}</b>\n┃\n┖ <b>Links :</b> "
-        for tl, sl in zip(links, lstd[no]):
+        prsd += f"\n\n<b>{tl}</b>\n┃\n┖ <b>Links :</b> "
+        for (_, text), sl in zip(links, lstd[no], strict=False):
             if isinstance(sl, Exception):
-                prsd += str(sl)
+                prsd += f"{sl}, "
             else:
-                prsd += f"<a href='{sl}'>{tl.string}</a>, "
+                prsd += f"<a href='{sl}'>{text}</a>, "
         prsd = prsd[:-2]
+    if any(isinstance(sl, DeadlineExceeded) for sl in com_tasks):
+        return Partial(prsd)
     return prsd
 
 
 async def tamilmv(url):
-    cget = create_scraper().request
-    resp = cget("GET", url)
-    soup = BeautifulSoup(resp.text, "html.parser")
-    mag = soup.select('a[href^="magnet:?xt=urn:btih:"]')
-    tor = soup.select('a[data-fileext="torrent"]')
-    parse_data = f"<b><u>{soup.title.string}</u></b>"
-    for no, (t, m) in enumerate(zip(tor, mag), start=1):
-        filename = sub(r"www\S+|\- |\.torrent", "", t.string)
+    async with scraper_pool.checkout(url) as scraper:
+        cget = scraper.request
+        resp = await run_sync("scrape", cget, "GET", url)
+    title, files = await run_parse(extractors.tamilmv_files, resp.text)
+    parse_data = f"<b><u>{title}</u></b>"
+    for no, (filename, magnet, torrent) in enumerate(files, start=1):
         parse_data += f"""
         
 {no}. <code>{filename}</code>
-┖ <b>Links :</b> <a href="https://t.me/share/url?url={m['href'].split('&')[0]}"><b>Magnet </b>🧲</a>  | <a href="{t['href']}"><b>Torrent 🌐</b></a>"""
+┖ <b>Links :</b> <a href="https://t.me/share/url?url={magnet}"><b>Magnet </b>🧲</a>  | <a href="{torrent}"><b>Torrent 🌐</b></a>"""
     return parse_data
@@ -0,0 +1,118 @@
+from dataclasses import asdict, dataclass, field
+from time import monotonic
+
+from FZBypass.core.deadline import GRACE, deadline, until_deadline
+from FZBypass.core.exceptions import DDLException, DeadlineExceeded
+from FZBypass.core.result_cache import canonical_url
+
+
+@dataclass
+class Hop:
+    url: str
+    handler: str
+    elapsed: float
+    result: str = None
+    error: str = None
+    chain: bool = False
+    excep: bool = False
+
+
+@dataclass
+class ChainResult:
+    source: str
+    hops: list = field(default_factory=list)
+    error: str = None
+    elapsed: float = 0.0
+
+    @property
+    def excep(self):
+        return bool(self.hops) and self.hops[0].excep
+
+    @property
+    def links(self):
+        return [
+            f"\n\n{hop.result}" if hop.excep and n else hop.result
+            for n, hop in enumerate(self.hops)
+            if hop.result is not None
+        ]
+
+    @property
+    def final(self):
+        links = self.links
+        return links[-1] if links else None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class ChainResolver:
+    """
+    Walks shortener chains iteratively: every hop is dispatched through the
+    registry, timed, and checked against the hop budget, the total deadline
+    and the URLs already visited, so circular redirects end instead of
+    pinning the task forever.
+    """
+
+    def __init__(self, registry, run_rule, max_hops, timeout):
+        self.registry = registry
+        self.run_rule = run_rule
+        self.max_hops = max_hops
+        self.timeout = timeout
+
+    async def resolve(self, link):
+        """
+        Resolves `link` hop by hop within the chain timeout (or the caller's
+        deadline, if that is shorter), which every request of every hop is
+        bounded by. Hops done before the deadline are kept as a partial result;
+        a link without a rule or whose first hop fails raises DDLException.
+        """
+        with deadline(self.timeout) as when:
+            return await self._resolve(link, when)
+
+    async def _resolve(self, link, when):
+        start = monotonic()
+        chain = ChainResult(link)
+        seen = {canonical_url(link)}
+        url = link
+        while True:
+            if (rule := self.registry.match(url)) is None:
+                if not chain.hops:
+                    raise DDLException(
+                        f"<i>No Bypass Function Found for your Link :</i> <code>{link}</code>"
+                    )
+                break
+            if len(chain.hops) >= self.max_hops:
+                chain.error = f"Hop limit of {self.max_hops} reached"
+                break
+            if when <= monotonic():
+                chain.error = "Deadline exceeded"
+                break
+            hop = Hop(
+                url, rule.handler.__name__, 0.0, chain=rule.chain, excep=rule.excep
+            )
+            hop_start = monotonic()
+            try:
+                hop.result = await until_deadline(self.run_rule(url, rule), GRACE)
+            except DeadlineExceeded:
+                hop.error = chain.error = "Deadline exceeded"
+            except Exception as e:
+                if when <= monotonic():
+                    # a request timed out with the deadline
+                    hop.error = chain.error = "Deadline exceeded"
+                elif chain.hops:
+                    hop.error = str(e) or e.__class__.__name__
+                elif isinstance(e, DDLException):
+                    raise
+                else:
+                    raise DDLException(str(e) or e.__class__.__name__) from e
+            hop.elapsed = monotonic() - hop_start
+            chain.hops.append(hop)
+            if hop.error or not rule.chain or not hop.result:
+                break
+            if (key := canonical_url(hop.result)) in seen:
+                chain.error = f"Loop detected at {hop.result}"
+                break
+            seen.add(key)
+            url = hop.result
+        chain.elapsed = monotonic() - start
+        return chain
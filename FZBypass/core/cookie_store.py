@@ -0,0 +1,221 @@
+from asyncio import sleep as asleep
+from http.cookiejar import Cookie, CookieJar, http2time
+from http.cookies import Morsel
+from json import dump, load
+from os import path as ospath, replace
+from time import time
+from urllib.parse import urlparse
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.deadline import detached
+from FZBypass.core.sync_pool import run_sync
+
+
+class CookieStore:
+    """
+    On-disk cookies per domain, so Cloudflare clearance and hoster logins
+    survive /restart and redeploys.
+
+    Only cookies with an expiry are kept, since session cookies are meant to
+    die with their jar, and expired ones are dropped on load and on update.
+    Handlers load a jar before their first request and hand it back after;
+    writes are batched and go through a temp file and rename, so a crash never
+    leaves a torn file. At most `max_domains` domains are kept, the least
+    recently updated dropped first.
+    """
+
+    FLUSH_DELAY = 5
+
+    def __init__(self, path, max_domains):
+        self.path = path
+        self.max_domains = max_domains
+        self._domains = {}
+        self._flush_task = None
+        if path and ospath.isfile(path):
+            try:
+                with open(path) as f:
+                    self._domains = load(f)
+                self._prune()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self._domains = {}
+                LOGGER.error(f"Cookie Store: {e}")
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def _prune(self):
+        now = time()
+        for domain in list(self._domains):
+            entry = self._domains[domain]
+            entry["cookies"] = [c for c in entry["cookies"] if c["expires"] > now]
+            if not entry["cookies"]:
+                del self._domains[domain]
+        if len(self._domains) > self.max_domains:
+            for domain in sorted(
+                self._domains, key=lambda d: self._domains[d]["updated"]
+            )[: len(self._domains) - self.max_domains]:
+                del self._domains[domain]
+
+    def _matching(self, url):
+        host = (urlparse(url).hostname or "").lower()
+        labels = host.split(".")
+        now = time()
+        for i in range(len(labels) - 1):
+            domain = ".".join(labels[i:])
+            if entry := self._domains.get(domain):
+                for cookie in entry["cookies"]:
+                    if cookie["expires"] > now and (i == 0 or not cookie["host_only"]):
+                        yield domain, cookie
+
+    def load(self, jar, url):
+        """Puts the stored cookies that apply to `url` into a requests/http.cookiejar or aiohttp jar."""
+        if not self.enabled:
+            return
+        if isinstance(jar, CookieJar):
+            for domain, c in self._matching(url):
+                jar.set_cookie(
+                    Cookie(
+                        version=0,
+                        name=c["name"],
+                        value=c["value"],
+                        port=None,
+                        port_specified=False,
+                        domain=domain if c["host_only"] else f".{domain}",
+                        domain_specified=not c["host_only"],
+                        domain_initial_dot=not c["host_only"],
+                        path=c["path"],
+                        path_specified=True,
+                        secure=c["secure"],
+                        expires=int(c["expires"]),
+                        discard=False,
+                        comment=None,
+                        comment_url=None,
+                        rest={},
+                    )
+                )
+            return
+        from yarl import URL
+
+        now = time()
+        for domain, c in self._matching(url):
+            morsel = Morsel()
+            morsel.set(c["name"], c["value"], c["value"])
+            morsel["path"] = c["path"]
+            morsel["max-age"] = str(int(c["expires"] - now))
+            if c["secure"]:
+                morsel["secure"] = True
+            if not c["host_only"]:
+                morsel["domain"] = domain
+            jar.update_cookies({c["name"]: morsel}, URL(f"https://{domain}/"))
+
+    def _cookies(self, jar):
+        now = time()
+        if isinstance(jar, CookieJar):
+            for c in jar:
+                if c.expires and c.expires > now:
+                    yield (
+                        c.domain,
+                        {
+                            "name": c.name,
+                            "value": c.value,
+                            "path": c.path,
+                            "expires": c.expires,
+                            "secure": c.secure,
+                            "host_only": not c.domain.startswith("."),
+                        },
+                    )
+            return
+        # aiohttp sets every morsel's domain and only remembers host-only ones
+        # here, as (domain, name) or (domain, path, name) depending on version
+        host_only = {(k[0], k[-1]) for k in getattr(jar, "_host_only_cookies", ())}
+        for m in jar:
+            if m["max-age"]:
+                try:
+                    expires = now + int(m["max-age"])
+                except ValueError:
+                    continue
+            elif m["expires"]:
+                expires = http2time(m["expires"]) or 0
+            else:
+                continue
+            if expires > now and m["domain"]:
+                yield (
+                    m["domain"],
+                    {
+                        "name": m.key,
+                        "value": m.value,
+                        "path": m["path"] or "/",
+                        "expires": expires,
+                        "secure": bool(m["secure"]),
+                        "host_only": (m["domain"], m.key) in host_only,
+                    },
+                )
+
+    def update(self, jar):
+        """Merges the persistent cookies of a finished jar and schedules a write if anything changed."""
+        if not self.enabled:
+            return
+        changed = set()
+        for domain, cookie in self._cookies(jar):
+            domain = domain.lstrip(".").lower()
+            entry = self._domains.setdefault(domain, {"updated": 0, "cookies": []})
+            key = (cookie["name"], cookie["path"])
+            for i, old in enumerate(entry["cookies"]):
+                if (old["name"], old["path"]) == key:
+                    # Max-Age cookies come back a little later on every reload
+                    if (
+                        old["value"] != cookie["value"]
+                        or abs(old["expires"] - cookie["expires"]) > 60
+                    ):
+                        entry["cookies"][i] = cookie
+                        changed.add(domain)
+                    break
+            else:
+                entry["cookies"].append(cookie)
+                changed.add(domain)
+        if not changed:
+            return
+        now = time()
+        for domain in changed:
+            self._domains[domain]["updated"] = now
+        self._prune()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = detached(self._flush())
+
+    def _write(self, domains):
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            dump(domains, f)
+        replace(temp, self.path)
+
+    async def _flush(self):
+        await asleep(self.FLUSH_DELAY)
+        try:
+            await run_sync("cache", self._write, self._snapshot())
+        except OSError as e:
+            LOGGER.error(f"Cookie Store: {e}")
+
+    def _snapshot(self):
+        return {
+            domain: {"updated": entry["updated"], "cookies": list(entry["cookies"])}
+            for domain, entry in self._domains.items()
+        }
+
+    def stats(self):
+        return {
+            "domains": len(self._domains),
+            "cookies": sum(len(entry["cookies"]) for entry in self._domains.values()),
+        }
+
+    def close(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                self._write(self._snapshot())
+            except OSError as e:
+                LOGGER.error(f"Cookie Store: {e}")
+        self._flush_task = None
+
+
+cookie_store = CookieStore(Config.COOKIE_STORE, Config.COOKIE_STORE_SIZE)
@@ -0,0 +1,89 @@
+from asyncio import create_task, wait_for
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from functools import wraps
+from time import monotonic
+
+from FZBypass import Config
+from FZBypass.core.exceptions import DeadlineExceeded
+
+# Hard cancellation comes this long after the deadline, so handlers that
+# noticed it themselves can still return what they have.
+GRACE = 1.0
+
+_deadline = ContextVar("bypass_deadline", default=None)
+
+
+class Partial(str):
+    """Text of a bypass cut short by its deadline: sent as is, but never cached as the full result."""
+
+
+@contextmanager
+def deadline(seconds):
+    """Gives the bypass running inside the block `seconds` to finish; a nested deadline can only shorten it."""
+    when = monotonic() + seconds
+    if (outer := _deadline.get()) is not None:
+        when = min(when, outer)
+    token = _deadline.set(when)
+    try:
+        yield when
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left before the deadline, or None outside of one."""
+    if (when := _deadline.get()) is None:
+        return None
+    return when - monotonic()
+
+
+def check():
+    if (left := remaining()) is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+
+
+def budget(cap=None):
+    """Timeout for the next request: REQUEST_TIMEOUT (or `cap`), cut to what is left of the deadline."""
+    check()
+    cap = cap or Config.REQUEST_TIMEOUT
+    left = remaining()
+    return cap if left is None else min(cap, left)
+
+
+def bounded(func):
+    """Wraps a requests-style call so it gets a `timeout` from the deadline unless one is passed."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = budget()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            # a timeout cut short by the deadline is reported as the deadline
+            check()
+            raise
+
+    return wrapper
+
+
+def bind(session):
+    """Makes every request of a requests, cloudscraper or curl_cffi session deadline-bounded."""
+    session.request = bounded(session.request)
+    return session
+
+
+async def until_deadline(aw, grace=0.0):
+    """Awaits `aw`, raising DeadlineExceeded instead of running more than `grace` past the deadline."""
+    if (left := remaining()) is None:
+        return await aw
+    try:
+        return await wait_for(aw, max(left, 0) + grace)
+    except TimeoutError:
+        raise DeadlineExceeded("Deadline exceeded") from None
+
+
+def detached(coro):
+    """Starts `coro` as a task outside of the caller's deadline, for background work that outlives the request."""
+    return Context().run(create_task, coro)
@@ -1,4 +1,6 @@
 class DDLException(Exception):
     """Not method found for extracting direct download link from the http link"""
 
-    pass
+
+class DeadlineExceeded(DDLException):
+    """The bypass ran out of its time budget before finishing"""
@@ -0,0 +1,142 @@
+"""
+Pure page extractors for the scrape handlers.
+
+Each takes the raw page text and returns plain tuples and strings, never
+soup objects, so they can run in a parse worker process (see `run_parse`)
+and send back only the few fields the handler formats into its reply.
+"""
+
+from re import match, search, sub
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+CINEVOOD_HOSTS = (
+    ("gdtot", "GDToT"),
+    ("multiup", "MultiUp"),
+    ("filepress", "FilePress"),
+    ("gdflix", "GDFlix"),
+    ("kolop", "Kolop"),
+    ("zipylink", "ZipyLink"),
+)
+
+
+def og_description(html):
+    """`(name, size)` from a GDToT-style file page's og:description."""
+    soup = BeautifulSoup(html, "html.parser")
+    parse_data = (
+        (soup.select('meta[property^="og:description"]')[0]["content"])
+        .replace("Download ", "")
+        .rsplit("-", maxsplit=1)
+    )
+    return parse_data[0], parse_data[-1]
+
+
+def sharespark_lines(html):
+    """
+    Link lines of a sharespark print page, in order: `("quality", text)`,
+    `("gdtot", url)` and `("pastetot", label, url)`.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    items = []
+    for br in soup.findAll("br"):
+        next_s = br.nextSibling
+        if not (next_s and isinstance(next_s, NavigableString)):
+            continue
+        if (
+            (next2_s := next_s.nextSibling)
+            and isinstance(next2_s, Tag)
+            and next2_s.name == "br"
+            and str(next_s).strip()
+        ):
+            if match(r"^(480p|720p|1080p)(.+)? Links:\Z", next_s):
+                items.append(("quality", str(next_s)))
+            for s in next_s.split():
+                ns = sub(r"\(|\)", "", s)
+                if match(r"https?://.+\.gdtot\.\S+", ns):
+                    items.append(("gdtot", ns))
+                elif match(r"https?://pastetot\.\S+", ns):
+                    nxt = sub(r"\(|\)|(https?://pastetot\.\S+)", "", next_s)
+                    items.append(("pastetot", nxt, ns))
+    return items
+
+
+def cinevood_links(html):
+    """`(post_title, [(title, [(label, href), ...]), ...])` of a cinevood post."""
+    soup = BeautifulSoup(html, "html.parser")
+    links_by_title = []
+    for title in soup.select("h6"):
+        links = []
+        for host, label in CINEVOOD_HOSTS:
+            if tag := title.find_next(
+                "a", href=lambda href, host=host: href and host in href.lower()
+            ):
+                links.append((label, tag["href"]))
+        if links:
+            links_by_title.append((title.text.strip(), links))
+    return soup.title.string.strip(), links_by_title
+
+
+def toonworld_series(html):
+    """`(series_title, [(episode_title, href), ...])` of a toonworld4all series page."""
+    soup = BeautifulSoup(html, "html.parser")
+    epl = soup.select('a[href*="/episode/"]')
+    tls = soup.select('div[class*="mks_accordion_heading"]')
+    stitle = search(r"\"name\":\"(.+)\"", html).group(1).split('"')[0]
+    return stitle, [
+        (str(t.strong.string), a["href"]) for t, a in zip(tls, epl, strict=False)
+    ]
+
+
+def toonworld_episode(html):
+    """`([h5 titles], [(redirect_href, text), ...])` of a toonworld4all episode page."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = soup.select('a[href*="/redirect/main.php?url="]')
+    return (
+        [str(t.string) for t in soup.select("h5")],
+        [(a["href"], str(a.string)) for a in links],
+    )
+
+
+def tamilmv_files(html):
+    """`(title, [(filename, magnet, torrent_href), ...])` of a tamilmv topic."""
+    soup = BeautifulSoup(html, "html.parser")
+    mag = soup.select('a[href^="magnet:?xt=urn:btih:"]')
+    tor = soup.select('a[data-fileext="torrent"]')
+    return str(soup.title.string), [
+        (
+            sub(r"www\S+|\- |\.torrent", "", t.string),
+            m["href"].split("&")[0],
+            t["href"],
+        )
+        for t, m in zip(tor, mag, strict=False)
+    ]
+
+
+def appflix_file(html, url):
+    """`(name, size, drivebot_v2)` of an appflix/gdflix file page."""
+    soup = BeautifulSoup(html, "html.parser")
+    ss = soup.select("li[class^='list-group-item']")
+    dbotv2 = (
+        dbot[0]["href"]
+        if "gdflix" in url and (dbot := soup.select("a[href*='drivebot.lol']"))
+        else None
+    )
+    return str(ss[0].string).split(":")[1], str(ss[2].string).split(":")[1], dbotv2
+
+
+def appflix_pack(html):
+    """`(title, [file_path, ...])` of an appflix pack page."""
+    soup = BeautifulSoup(html, "html.parser")
+    return str(soup.title.string), [
+        ss["href"] for ss in soup.select("a[href^='/file/']")
+    ]
+
+
+def terabox_js_token(html):
+    """The `jsToken` a terabox share page hides in its eval script, or None."""
+    soup = BeautifulSoup(html, "lxml")
+    for fs in soup.find_all("script"):
+        fstring = fs.string
+        if fstring and fstring.startswith("try {eval(decodeURIComponent"):
+            return fstring.split("%22")[1]
+    return None
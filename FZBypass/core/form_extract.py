@@ -0,0 +1,55 @@
+from contextlib import suppress
+from typing import NamedTuple
+
+from lxml import etree
+
+CLOUDFLARE_TITLE = "Just a moment..."
+CHUNK_SIZE = 16384
+
+
+class PageForm(NamedTuple):
+    title: str
+    inputs: list
+
+    @property
+    def cloudflare(self):
+        return self.title == CLOUDFLARE_TITLE
+
+
+def extract_form(html, form_id="go-link", form_only=False):
+    """
+    Pulls the `<title>` and the `<input>` name/value pairs out of a shortener page.
+
+    The page is fed to lxml's pull parser in chunks and parsing stops once the
+    element with `form_id` closes, so the ads and scripts after the go-link form
+    are never parsed. With `form_only`, inputs outside that element are skipped.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    title, inputs, target, found = None, [], None, False
+
+    def scan():
+        nonlocal title, target, found
+        for event, el in parser.read_events():
+            if event == "start":
+                if target is None and not found and el.get("id") == form_id:
+                    target = el
+                elif el.tag == "input" and (target is not None or not form_only):
+                    inputs.append((el.get("name"), el.get("value")))
+            elif el is target:
+                # libxml2 may close a form it thinks is misnested before its
+                # inputs, then keep collecting the way html.parser would
+                if any(True for _ in el.iter("input")):
+                    return True
+                found = True
+            elif el.tag == "title" and title is None:
+                title = el.text or ""
+        return False
+
+    for pos in range(0, len(html or ""), CHUNK_SIZE):
+        parser.feed(html[pos : pos + CHUNK_SIZE])
+        if scan():
+            return PageForm(title, inputs)
+    with suppress(etree.XMLSyntaxError):
+        parser.close()
+    scan()
+    return PageForm(title, inputs)
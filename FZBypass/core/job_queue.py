@@ -0,0 +1,373 @@
+from abc import ABC, abstractmethod
+from asyncio import CancelledError, create_task, get_running_loop, sleep as asleep
+from contextlib import contextmanager
+from importlib import import_module
+from json import dumps, loads
+from os import getpid
+from secrets import token_hex
+from socket import gethostname
+from sqlite3 import connect
+from time import time
+from uuid import uuid4
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.deadline import (
+    GRACE,
+    Partial,
+    deadline,
+    detached,
+    remaining,
+    until_deadline,
+)
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.sync_pool import run_sync
+
+
+class JobBackend(ABC):
+    """
+    Storage for shared bypass jobs. Subclass it to put the queue on an
+    external broker and point JOB_BACKEND at `module:Class`; the class gets
+    JOB_QUEUE as its only argument.
+
+    Every method but `stats` must be implemented; they are blocking and run
+    on the `jobs` thread pool. Jobs are `queued`, then `running` under a
+    worker's lease, then `done` with a result or an error until their owner
+    collects them.
+    """
+
+    @abstractmethod
+    def submit(self, job_id, owner, link, deadline):
+        """Queues `link` for any worker, to be done before `deadline` (a unix time)."""
+
+    @abstractmethod
+    def claim(self, worker, limit, lease):
+        """Leases up to `limit` runnable jobs to `worker`, as `(job_id, link, deadline)`."""
+
+    @abstractmethod
+    def heartbeat(self, worker, job_ids, lease):
+        """Extends the leases of `job_ids` and returns those `worker` no longer holds."""
+
+    @abstractmethod
+    def complete(self, job_id, worker, result, error):
+        """Stores the result or error of a job, if `worker` still holds its lease."""
+
+    @abstractmethod
+    def release(self, worker, job_ids):
+        """Puts unfinished jobs back in the queue without counting an attempt."""
+
+    @abstractmethod
+    def results(self, owner):
+        """
+        Removes and returns the finished jobs of `owner`, as `(job_id, result, error)`,
+        failing first those whose deadline passed before any worker ran them.
+        """
+
+    @abstractmethod
+    def cancel(self, job_ids):
+        """Drops jobs whose owner stopped waiting for them."""
+
+    def stats(self):
+        return {}
+
+    @abstractmethod
+    def close(self):
+        """Releases the backend's connections at shutdown."""
+
+
+class SqliteJobBackend(JobBackend):
+    """
+    Job table in a SQLite file in WAL mode, shared by every instance on the
+    node. Claims run in an immediate transaction, so two workers never
+    lease the same job.
+    """
+
+    MAX_ATTEMPTS = 3
+    KEEP_EXPIRED = 300
+
+    def __init__(self, path):
+        self._db = connect(path, timeout=30, check_same_thread=False)
+        self._db.isolation_level = None
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, owner TEXT, link TEXT, state TEXT, "
+            "worker TEXT, lease_until REAL, attempts INTEGER, deadline REAL, result TEXT, error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, state)")
+
+    @contextmanager
+    def _transaction(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    @staticmethod
+    def _marks(ids):
+        return ",".join("?" * len(ids))
+
+    def submit(self, job_id, owner, link, deadline):
+        self._db.execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, 'queued', NULL, 0, 0, ?, NULL, NULL)",
+            (job_id, owner, link, deadline),
+        )
+
+    def claim(self, worker, limit, lease):
+        now = time()
+        with self._transaction():
+            # jobs whose owner is gone are never collected
+            self._db.execute(
+                "DELETE FROM jobs WHERE deadline < ?", (now - self.KEEP_EXPIRED,)
+            )
+            self._db.execute(
+                "UPDATE jobs SET state = 'done', worker = NULL, error = ? "
+                "WHERE state = 'running' AND lease_until < ? AND attempts >= ?",
+                (
+                    f"Job abandoned by {self.MAX_ATTEMPTS} workers",
+                    now,
+                    self.MAX_ATTEMPTS,
+                ),
+            )
+            jobs = self._db.execute(
+                "SELECT id, link, deadline FROM jobs WHERE deadline > ? AND "
+                "(state = 'queued' OR (state = 'running' AND lease_until < ?)) "
+                "ORDER BY rowid LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            if jobs:
+                ids = [job[0] for job in jobs]
+                self._db.execute(
+                    "UPDATE jobs SET state = 'running', worker = ?, lease_until = ?, "
+                    f"attempts = attempts + 1 WHERE id IN ({self._marks(ids)})",
+                    (worker, now + lease, *ids),
+                )
+        return jobs
+
+    def heartbeat(self, worker, job_ids, lease):
+        marks = self._marks(job_ids)
+        with self._transaction():
+            self._db.execute(
+                f"UPDATE jobs SET lease_until = ? WHERE worker = ? AND state = 'running' AND id IN ({marks})",
+                (time() + lease, worker, *job_ids),
+            )
+            held = {
+                row[0]
+                for row in self._db.execute(
+                    f"SELECT id FROM jobs WHERE worker = ? AND state = 'running' AND id IN ({marks})",
+                    (worker, *job_ids),
+                )
+            }
+        return [job_id for job_id in job_ids if job_id not in held]
+
+    def complete(self, job_id, worker, result, error):
+        self._db.execute(
+            "UPDATE jobs SET state = 'done', worker = NULL, result = ?, error = ? "
+            "WHERE id = ? AND worker = ? AND state = 'running'",
+            (dumps(result), error, job_id, worker),
+        )
+
+    def release(self, worker, job_ids):
+        self._db.execute(
+            "UPDATE jobs SET state = 'queued', worker = NULL, attempts = attempts - 1 "
+            f"WHERE worker = ? AND state = 'running' AND id IN ({self._marks(job_ids)})",
+            (worker, *job_ids),
+        )
+
+    def results(self, owner):
+        now = time()
+        with self._transaction():
+            self._db.execute(
+                "UPDATE jobs SET state = 'done', worker = NULL, error = ? "
+                "WHERE owner = ? AND deadline < ? "
+                "AND (state = 'queued' OR (state = 'running' AND lease_until < ?))",
+                ("Deadline exceeded before a worker took the job", owner, now, now),
+            )
+            rows = self._db.execute(
+                "SELECT id, result, error FROM jobs WHERE owner = ? AND state = 'done'",
+                (owner,),
+            ).fetchall()
+            if rows:
+                self._db.execute(
+                    f"DELETE FROM jobs WHERE id IN ({self._marks(rows)})",
+                    [row[0] for row in rows],
+                )
+        return [
+            (job_id, loads(result) if result is not None else None, error)
+            for job_id, result, error in rows
+        ]
+
+    def cancel(self, job_ids):
+        self._db.execute(
+            f"DELETE FROM jobs WHERE id IN ({self._marks(job_ids)})", job_ids
+        )
+
+    def stats(self):
+        return dict(self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+
+    def close(self):
+        self._db.close()
+
+
+class JobQueue:
+    """
+    Splits bypass work between bot instances sharing one job backend.
+
+    The instance that gets a link submits it as a job and waits for the
+    result, so replies still go out from the instance that owns the chat.
+    Every instance with `workers` > 0 also claims up to that many jobs at a
+    time, from any owner, and holds them under a lease it renews with one
+    heartbeat for all of them; a job whose worker dies is handed to another
+    once its lease runs out.
+    """
+
+    POLL = 0.2
+
+    def __init__(self, target, backend, workers, lease, timeout):
+        self.workers = workers
+        self.lease = lease
+        self.timeout = timeout
+        self.instance = f"{gethostname()}-{getpid()}-{token_hex(3)}"
+        self.backend = None
+        self._execute = None
+        self._waiting = {}
+        self._jobs = {}
+        self._tasks = []
+        self._collector = None
+        if target:
+            if backend:
+                module, _, name = backend.partition(":")
+                self.backend = getattr(import_module(module), name)(target)
+            else:
+                self.backend = SqliteJobBackend(target)
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    async def run(self, link):
+        """Resolves one link as a job on whichever instance claims it."""
+        job_id = uuid4().hex
+        waiter = get_running_loop().create_future()
+        self._waiting[job_id] = waiter
+        try:
+            with deadline(self.timeout):
+                await run_sync(
+                    "jobs",
+                    self.backend.submit,
+                    job_id,
+                    self.instance,
+                    link,
+                    time() + remaining(),
+                )
+                if self._collector is None or self._collector.done():
+                    self._collector = detached(self._collect())
+                result, error = await until_deadline(waiter, GRACE)
+        finally:
+            if self._waiting.pop(job_id, None) is not None:
+                detached(self._call(self.backend.cancel, [job_id]))
+        if error:
+            raise DDLException(error)
+        if isinstance(result, dict):
+            return Partial(result["partial"])
+        return result
+
+    async def _call(self, method, *args):
+        """Runs a backend call on the `jobs` pool, logging a failure and returning None instead."""
+        try:
+            return await run_sync("jobs", method, *args)
+        except Exception as e:
+            LOGGER.error(f"Job Queue: {e}")
+            return None
+
+    async def _collect(self):
+        while self._waiting:
+            await asleep(self.POLL)
+            done = await self._call(self.backend.results, self.instance)
+            for job_id, result, error in done or ():
+                if (waiter := self._waiting.pop(job_id, None)) and not waiter.done():
+                    waiter.set_result((result, error))
+
+    async def start(self, execute):
+        """Starts claiming jobs and running them with `execute(link)`."""
+        if not self.enabled or self.workers <= 0 or self._tasks:
+            return
+        self._execute = execute
+        self._tasks = [detached(self._work()), detached(self._heartbeat())]
+        LOGGER.info(f"Job Queue: {self.instance} running up to {self.workers} jobs")
+
+    async def _work(self):
+        while True:
+            jobs = []
+            if free := self.workers - len(self._jobs):
+                jobs = await self._call(
+                    self.backend.claim, self.instance, free, self.lease
+                )
+            for job_id, link, expires in jobs or ():
+                self._jobs[job_id] = create_task(self._run_job(job_id, link, expires))
+            if not jobs:
+                await asleep(self.POLL)
+
+    async def _run_job(self, job_id, link, expires):
+        result = error = None
+        try:
+            # the owner's deadline, so requests stop when it stops waiting
+            with deadline(expires - time()):
+                result = await until_deadline(self._execute(link), GRACE)
+            if isinstance(result, Partial):
+                # JSON drops the str subclass, the owner must not cache it
+                result = {"partial": str(result)}
+        except CancelledError:
+            self._jobs.pop(job_id, None)
+            raise
+        except DDLException as e:
+            error = str(e) or e.__class__.__name__
+        self._jobs.pop(job_id, None)
+        await self._call(self.backend.complete, job_id, self.instance, result, error)
+
+    async def _heartbeat(self):
+        while True:
+            await asleep(self.lease / 3)
+            if not self._jobs:
+                continue
+            lost = await self._call(
+                self.backend.heartbeat, self.instance, list(self._jobs), self.lease
+            )
+            # cancelled by the owner, or re-leased after a stall
+            for job_id in lost or ():
+                if task := self._jobs.pop(job_id, None):
+                    task.cancel()
+
+    async def stats(self):
+        shared = await run_sync("jobs", self.backend.stats)
+        return {
+            "waiting": len(self._waiting),
+            "running": len(self._jobs),
+            "workers": self.workers,
+            "queued": shared.get("queued", 0),
+            "leased": shared.get("running", 0),
+        }
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if unfinished := list(self._jobs):
+            for task in self._jobs.values():
+                task.cancel()
+            self._jobs.clear()
+            await self._call(self.backend.release, self.instance, unfinished)
+        if self.enabled:
+            await run_sync("jobs", self.backend.close)
+
+
+job_queue = JobQueue(
+    Config.JOB_QUEUE,
+    Config.JOB_BACKEND,
+    Config.JOB_WORKERS,
+    Config.JOB_LEASE,
+    Config.CHAIN_TIMEOUT,
+)
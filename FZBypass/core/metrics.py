@@ -0,0 +1,181 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+PHASES = ("total", "network", "sleep", "parse")
+
+_phases = ContextVar("bypass_phases", default=None)
+
+
+@contextmanager
+def phase(name):
+    """Adds the time spent inside the block to `name` of the running handler, if any."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        if (phases := _phases.get()) is not None:
+            phases[name] += perf_counter() - start
+
+
+def timed(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class Histogram:
+    __slots__ = ("count", "counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts, strict=True):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return float("inf")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+
+
+class Metrics:
+    """
+    Latency, outcome and in-flight numbers for every handler run.
+
+    A handler's time is split into `sleep` (deliberate waits such as the
+    transcript timer), `parse` (HTML parsing) and `network`, which is the
+    rest of it: requests and waiting on them.
+    """
+
+    def __init__(self):
+        self.latency = defaultdict(Histogram)
+        self.outcomes = Counter()
+        self.exceptions = Counter()
+        self.inflight = Counter()
+        self._runner = None
+
+    async def run(self, rule, link):
+        # outcomes are labelled by the matched rule's site, not the link's
+        # hostname, so arbitrary user hosts can't grow the label set
+        handler, name, domain = rule.handler, rule.handler.__name__, rule.name
+        phases = {"sleep": 0.0, "parse": 0.0}
+        token = _phases.set(phases)
+        self.inflight[name] += 1
+        start = perf_counter()
+        try:
+            result = await handler(link, *rule.args)
+        except Exception as e:
+            self.outcomes[(domain, "error")] += 1
+            self.exceptions[(domain, e.__class__.__name__)] += 1
+            raise
+        finally:
+            _phases.reset(token)
+            self.inflight[name] -= 1
+            total = perf_counter() - start
+            phases["network"] = max(total - phases["sleep"] - phases["parse"], 0.0)
+            phases["total"] = total
+            for key in PHASES:
+                self.latency[(name, key)].observe(phases[key])
+        self.outcomes[(domain, "success" if result else "failure")] += 1
+        return result
+
+    def handlers(self):
+        return sorted(
+            {name for name, _ in self.latency},
+            key=lambda name: -self.latency[(name, "total")].sum,
+        )
+
+    def domains(self):
+        totals = Counter()
+        for (domain, _), count in self.outcomes.items():
+            totals[domain] += count
+        return [domain for domain, _ in totals.most_common()]
+
+    def render(self):
+        lines = [
+            "# HELP fzbypass_handler_seconds Time spent in a bypass handler, by phase.",
+            "# TYPE fzbypass_handler_seconds histogram",
+        ]
+        for (name, key), hist in sorted(self.latency.items()):
+            labels = _labels(handler=name, phase=key)
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist.counts, strict=True):
+                cumulative += count
+                lines.append(
+                    f'fzbypass_handler_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'fzbypass_handler_seconds_bucket{{{labels},le="+Inf"}} {hist.count}'
+            )
+            lines.append(f"fzbypass_handler_seconds_sum{{{labels}}} {hist.sum}")
+            lines.append(f"fzbypass_handler_seconds_count{{{labels}}} {hist.count}")
+        lines += [
+            "# HELP fzbypass_bypass_total Handler runs by domain and outcome.",
+            "# TYPE fzbypass_bypass_total counter",
+        ]
+        for (domain, outcome), count in sorted(self.outcomes.items()):
+            lines.append(
+                f"fzbypass_bypass_total{{{_labels(domain=domain, outcome=outcome)}}} {count}"
+            )
+        lines += [
+            "# HELP fzbypass_exceptions_total Handler exceptions by domain and class.",
+            "# TYPE fzbypass_exceptions_total counter",
+        ]
+        for (domain, exc), count in sorted(self.exceptions.items()):
+            lines.append(
+                f"fzbypass_exceptions_total{{{_labels(domain=domain, exception=exc)}}} {count}"
+            )
+        lines += [
+            "# HELP fzbypass_inflight Handler runs in progress.",
+            "# TYPE fzbypass_inflight gauge",
+        ]
+        for name, count in sorted(self.inflight.items()):
+            lines.append(f"fzbypass_inflight{{{_labels(handler=name)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, port, host="127.0.0.1"):
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.render(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+metrics = Metrics()
@@ -0,0 +1,179 @@
+from asyncio import Lock, sleep as asleep
+from html import unescape
+from re import compile as re_compile
+from time import monotonic
+
+from pyrogram.errors import FloodWait
+
+from FZBypass import Config, LOGGER
+
+TG_LIMIT = 4096
+TAG = re_compile(r"(<[^>]+>)")
+ENTITY_TAIL = re_compile(r"&#?\w*$")
+
+
+def visible_len(html):
+    """Length of the text Telegram counts (UTF-16 units, tags and entities resolved)."""
+    return len(unescape(TAG.sub("", html)).encode("utf-16-le")) // 2
+
+
+def _cut(text, room):
+    cut = min(len(text), room)
+    while cut and visible_len(text[:cut]) > room:
+        cut -= max(1, (visible_len(text[:cut]) - room) // 2)
+    if (tail := ENTITY_TAIL.search(text, 0, cut)) is not None:
+        cut = tail.start()
+    for sep in ("\n", " "):
+        if (pos := text.rfind(sep, 0, cut)) > cut // 2:
+            return pos + 1
+    return cut
+
+
+def split_html(html, limit=TG_LIMIT):
+    """Splits one HTML text into parts under `limit`, closing and reopening tags across a cut."""
+    parts, cur, used, stack = [], "", 0, []
+    for token in TAG.split(html):
+        if not token:
+            continue
+        if token.startswith("<"):
+            name = (token.strip("</>").split() or [""])[0].lower()
+            if token.startswith("</"):
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i][0] == name:
+                        del stack[i]
+                        break
+            elif not token.endswith("/>"):
+                stack.append((name, token))
+            cur += token
+            continue
+        while used + visible_len(token) > limit:
+            cut = _cut(token, limit - used)
+            if not cut and not used:
+                cut = 1
+            cur += token[:cut] + "".join(f"</{name}>" for name, _ in reversed(stack))
+            parts.append(cur)
+            cur, used = "".join(tag for _, tag in stack), 0
+            token = token[cut:]
+        cur += token
+        used += visible_len(token)
+    if visible_len(cur):
+        parts.append(cur)
+    return parts
+
+
+def pack_html(blocks, limit=TG_LIMIT):
+    """Packs whole blocks into as few messages as fit, splitting only blocks that can't fit alone."""
+    parts, cur, used = [], "", 0
+    for block in blocks:
+        size = visible_len(block)
+        if used + size <= limit:
+            cur, used = cur + block, used + size
+            continue
+        if cur:
+            parts.append(cur)
+        cur, used = "", 0
+        if size <= limit:
+            cur, used = block, size
+        else:
+            *full, cur = split_html(block, limit)
+            parts.extend(full)
+            used = visible_len(cur)
+    if cur:
+        parts.append(cur)
+    return parts
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = monotonic()
+
+    def _fill(self):
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    @property
+    def full(self):
+        self._fill()
+        return self.tokens >= self.burst
+
+    async def take(self):
+        while True:
+            self._fill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asleep((1 - self.tokens) / self.rate)
+
+
+class ChatLane:
+    __slots__ = ("bucket", "lock")
+
+    def __init__(self, rate, burst):
+        self.lock = Lock()
+        self.bucket = TokenBucket(rate, burst)
+
+
+class Outbox:
+    """
+    Sends and edits Telegram messages one at a time per chat, in order.
+
+    Calls are paced by a token bucket per chat and one shared by all chats, so
+    bursts go out at once and only sustained load is slowed down. A FloodWait
+    sleeps exactly the time Telegram asks for and then retries the same call.
+    """
+
+    MAX_LANES = 1024
+
+    def __init__(self, chat_rate, global_rate):
+        self.chat_rate = chat_rate
+        self.global_bucket = TokenBucket(global_rate, max(global_rate, 1))
+        self._lanes = {}
+
+    def _lane(self, chat_id):
+        if (lane := self._lanes.get(chat_id)) is None:
+            if len(self._lanes) >= self.MAX_LANES:
+                for key in [
+                    key
+                    for key, idle in self._lanes.items()
+                    if not idle.lock.locked() and idle.bucket.full
+                ]:
+                    del self._lanes[key]
+            lane = self._lanes[chat_id] = ChatLane(self.chat_rate, 3)
+        return lane
+
+    async def call(self, chat_id, func, *args, **kwargs):
+        lane = self._lane(chat_id)
+        async with lane.lock:
+            while True:
+                await lane.bucket.take()
+                await self.global_bucket.take()
+                try:
+                    return await func(*args, **kwargs)
+                except FloodWait as f:
+                    LOGGER.warning(f"FloodWait in {chat_id}: sleeping {f.value}s")
+                    await asleep(f.value)
+
+    async def reply(self, message, text, **kwargs):
+        return await self.call(message.chat.id, message.reply, text, **kwargs)
+
+    async def edit(self, message, text, **kwargs):
+        return await self.call(message.chat.id, message.edit, text, **kwargs)
+
+    async def deliver(self, message, wait_msg, blocks, **kwargs):
+        """Edits `wait_msg` with the first packed part and replies the rest under it."""
+        parts = pack_html(blocks)
+        if not parts:
+            return await self.call(message.chat.id, wait_msg.delete)
+        await self.edit(wait_msg, parts[0], **kwargs)
+        for part in parts[1:]:
+            wait_msg = await self.reply(
+                message, part, reply_to_message_id=wait_msg.id, **kwargs
+            )
+        return wait_msg
+
+
+outbox = Outbox(Config.TG_CHAT_RATE, Config.TG_GLOBAL_RATE)
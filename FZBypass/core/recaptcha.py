@@ -1,21 +1,98 @@
+from asyncio import (
+    Event,
+    sleep as asleep,
+    wait_for,
+)
+from contextlib import suppress
 from re import findall
-from requests import Session
+from time import time
 
+from FZBypass import Config, LOGGER
+from FZBypass.core.deadline import detached
+from FZBypass.core.session_pool import session_pool
 
-async def recaptchaV3(
-    ANCHOR_URL="https://www.google.com/recaptcha/api2/anchor?ar=1&k=6Lcr1ncUAAAAAH3cghg6cOTPGARa8adOf-y9zv2x&co=aHR0cHM6Ly9vdW8ucHJlc3M6NDQz&hl=en&v=pCoGBhjs9s8EhFOHJFe8cqis&size=invisible&cb=ahgyd1gkfkhe",
-):
-    rs = Session()
-    rs.headers.update({"content-type": "application/x-www-form-urlencoded"})
+OUO_ANCHOR = "https://www.google.com/recaptcha/api2/anchor?ar=1&k=6Lcr1ncUAAAAAH3cghg6cOTPGARa8adOf-y9zv2x&co=aHR0cHM6Ly9vdW8ucHJlc3M6NDQz&hl=en&v=pCoGBhjs9s8EhFOHJFe8cqis&size=invisible&cb=ahgyd1gkfkhe"
+
+
+async def recaptchaV3(ANCHOR_URL=OUO_ANCHOR):
     matches = findall("([api2|enterprise]+)\/anchor\?(.*)", ANCHOR_URL)[0]
     url_base = "https://www.google.com/recaptcha/" + matches[0] + "/"
     params = matches[1]
-    res = rs.get(url_base + "anchor", params=params)
-    token = findall(r'"recaptcha-token" value="(.*?)"', res.text)[0]
-    params = dict(pair.split("=") for pair in params.split("&"))
-    res = rs.post(
-        url_base + "reload",
-        params=f'k={params["k"]}',
-        data=f"v={params['v']}&reason=q&c={token}&k={params['k']}&co={params['co']}",
-    )
-    return findall(r'"rresp","(.*?)"', res.text)[0]
+    async with session_pool.session(
+        headers={"content-type": "application/x-www-form-urlencoded"}
+    ) as session:
+        async with session.get(url_base + "anchor", params=params) as res:
+            token = findall(r'"recaptcha-token" value="(.*?)"', await res.text())[0]
+        params = dict(pair.split("=") for pair in params.split("&"))
+        async with session.post(
+            url_base + "reload",
+            params=f'k={params["k"]}',
+            data=f"v={params['v']}&reason=q&c={token}&k={params['k']}&co={params['co']}",
+        ) as res:
+            return findall(r'"rresp","(.*?)"', await res.text())[0]
+
+
+class RecaptchaTokenPool:
+    """
+    Keeps a few fresh reCAPTCHA v3 tokens minted in the background.
+
+    Tokens are valid for ~2 minutes, so each is dropped after `ttl` seconds and
+    re-minted before callers need it. The refiller stops after `idle` seconds
+    without a request and starts again on the next get().
+    """
+
+    def __init__(self, anchor, size, ttl=100, idle=600):
+        self.anchor = anchor
+        self.size = size
+        self.ttl = ttl
+        self.idle = idle
+        self._tokens = []
+        self._wakeup = Event()
+        self._task = None
+        self._last_used = 0.0
+
+    def _fresh(self):
+        now = time()
+        self._tokens = [(exp, tok) for exp, tok in self._tokens if exp > now]
+        return self._tokens
+
+    async def _refill(self):
+        from aiohttp import ClientError
+
+        failures = 0
+        while time() - self._last_used < self.idle:
+            while len(self._fresh()) < self.size:
+                try:
+                    token = await recaptchaV3(self.anchor)
+                    self._tokens.append((time() + self.ttl, token))
+                    failures = 0
+                except (ClientError, TimeoutError, IndexError) as e:
+                    failures += 1
+                    LOGGER.error(f"reCAPTCHA Pool: {e.__class__.__name__}")
+                    await asleep(min(2**failures, 60))
+            self._wakeup.clear()
+            sleep_for = min(exp for exp, _ in self._tokens) - time()
+            with suppress(TimeoutError):
+                await wait_for(self._wakeup.wait(), max(sleep_for, 1))
+        self._task = None
+
+    async def get(self):
+        self._last_used = time()
+        if self.size > 0 and (self._task is None or self._task.done()):
+            # not the first caller's context, or its deadline ends the refiller
+            self._task = detached(self._refill())
+        if tokens := self._fresh():
+            token = tokens.pop(0)[1]
+            self._wakeup.set()
+            return token
+        return await recaptchaV3(self.anchor)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(BaseException):
+                await self._task
+            self._task = None
+
+
+ouo_tokens = RecaptchaTokenPool(OUO_ANCHOR, Config.RECAPTCHA_POOL)
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from json import dumps, loads
+from sqlite3 import Error as SQLiteError, connect
+from time import time
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.sync_pool import run_sync
+
+HOST_ALIASES = {
+    "ouo.io": "ouo.press",
+    "dulink.in": "du-link.in",
+    "1024tera.com": "terabox.com",
+    "1024terabox.com": "terabox.com",
+    "teraboxapp.com": "terabox.com",
+    "nephobox.com": "terabox.com",
+    "4funbox.com": "terabox.com",
+    "mirrobox.com": "terabox.com",
+    "momerybox.com": "terabox.com",
+}
+TRACKING_PARAMS = ("fbclid", "gclid", "igshid", "si", "ref")
+
+HANDLER_TTLS = {"terabox": 600, "mediafire": 1800, "gdrive": 1800}
+for _ttl in Config.CACHE_TTLS:
+    _handler, _seconds = _ttl.split(":")
+    HANDLER_TTLS[_handler] = int(_seconds)
+
+
+def canonical_url(link):
+    try:
+        parsed = urlparse(link.strip())
+    except ValueError:
+        return link.strip()
+    host = (parsed.hostname or "").removeprefix("www.")
+    host = HOST_ALIASES.get(host, host)
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+        )
+    )
+    key = f"{host}{parsed.path.rstrip('/')}"
+    return f"{key}?{query}" if query else key
+
+
+class ResultCache:
+    """
+    LRU + TTL cache of bypass results keyed on canonical URLs.
+
+    Entries live in memory and, when CACHE_DB is set, in a SQLite file so they
+    survive /restart. Every PRUNE_EVERY writes the file drops expired rows and,
+    past `db_size` rows, those closest to expiring. `saved` adds up the
+    original resolve time of every hit.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, maxsize, ttl, db_path="", db_size=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_size = db_size
+        self._writes = 0
+        self.hits = self.misses = 0
+        self.saved = 0.0
+        self._data = OrderedDict()
+        self._db = None
+        if db_path:
+            self._db = connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL, cost REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)"
+            )
+            self._db_prune()
+
+    def ttl_for(self, handler):
+        return HANDLER_TTLS.get(handler, self.ttl) if self.ttl > 0 else 0
+
+    def _db_get(self, key):
+        return self._db.execute(
+            "SELECT value, expires, cost FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _db_set(self, key, value, expires, cost):
+        self._db.execute(
+            "REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, dumps(value), expires, cost)
+        )
+        self._db.commit()
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._db_prune()
+
+    def _db_prune(self):
+        self._db.execute("DELETE FROM cache WHERE expires < ?", (time(),))
+        if self.db_size > 0:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                (self.db_size,),
+            )
+        self._db.commit()
+
+    def _remember(self, key, entry):
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def get(self, key):
+        entry = self._data.get(key)
+        if entry is None and self._db is not None:
+            try:
+                if row := await run_sync("cache", self._db_get, key):
+                    entry = (loads(row[0]), row[1], row[2])
+                    self._remember(key, entry)
+            except (SQLiteError, ValueError) as e:
+                LOGGER.error(f"Cache DB: {e}")
+        if entry is None or entry[1] < time():
+            self._data.pop(key, None)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        self.saved += entry[2]
+        return entry[0]
+
+    async def set(self, key, value, ttl, cost=0.0):
+        if ttl <= 0:
+            return
+        expires = time() + ttl
+        self._remember(key, (value, expires, cost))
+        if self._db is not None:
+            try:
+                await run_sync("cache", self._db_set, key, value, expires, cost)
+            except (SQLiteError, TypeError, ValueError) as e:
+                LOGGER.error(f"Cache DB: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "saved": self.saved,
+        }
+
+
+result_cache = ResultCache(
+    Config.CACHE_SIZE, Config.CACHE_TTL, Config.CACHE_DB, Config.CACHE_DB_SIZE
+)
@@ -0,0 +1,142 @@
+from asyncio import get_running_loop
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from time import time
+
+from FZBypass import Config
+
+HANDLER_LIMITS = {}
+for _limit in Config.HANDLER_CONCURRENCY:
+    _handler, _size = _limit.split(":")
+    HANDLER_LIMITS[_handler] = int(_size)
+
+
+class DomainStats:
+    __slots__ = ("active", "max_wait", "wait_time", "waited")
+
+    def __init__(self):
+        self.active = self.waited = 0
+        self.wait_time = self.max_wait = 0.0
+
+
+class FairScheduler:
+    """
+    Caps concurrent handler runs globally, per host and per handler.
+
+    Jobs over the cap wait in a FIFO queue per host, before any request is made,
+    and freed slots are handed out round-robin across hosts so one big batch for
+    a single shortener can't starve everyone else. Stats are kept for the
+    MAX_HOSTS most recently used hosts; busier ones are never dropped.
+    """
+
+    MAX_HOSTS = 512
+
+    def __init__(self, max_active, host_limit, handler_limits):
+        self.max_active = max_active
+        self.host_limit = host_limit
+        self.handler_limits = handler_limits
+        self.active = 0
+        self._handlers = {}
+        self._queues = OrderedDict()
+        self._stats = OrderedDict()
+
+    def _stats_for(self, host):
+        if (stats := self._stats.get(host)) is None:
+            stats = self._stats[host] = DomainStats()
+        self._stats.move_to_end(host)
+        if len(self._stats) > self.MAX_HOSTS:
+            # least recently used first, skipping hosts with running or queued jobs
+            for old in list(self._stats):
+                if len(self._stats) <= self.MAX_HOSTS:
+                    break
+                if (
+                    old != host
+                    and not self._stats[old].active
+                    and old not in self._queues
+                ):
+                    del self._stats[old]
+        return stats
+
+    def _can_run(self, host, handler):
+        return (
+            self.active < self.max_active
+            and self._stats[host].active < self.host_limit
+            and self._handlers.get(handler, 0)
+            < self.handler_limits.get(handler, self.max_active)
+        )
+
+    def _take(self, host, handler):
+        self.active += 1
+        self._stats[host].active += 1
+        self._handlers[handler] = self._handlers.get(handler, 0) + 1
+
+    def _release(self, host, handler):
+        self.active -= 1
+        self._stats[host].active -= 1
+        self._handlers[handler] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        granted = True
+        while granted and self._queues:
+            granted = False
+            for host in list(self._queues):
+                queue = self._queues[host]
+                while queue and queue[0][0].done():
+                    queue.popleft()
+                if not queue:
+                    del self._queues[host]
+                    continue
+                fut, handler, _ = queue[0]
+                if self._can_run(host, handler):
+                    queue.popleft()
+                    self._take(host, handler)
+                    fut.set_result(None)
+                    self._queues.move_to_end(host)
+                    granted = True
+                    break
+
+    @asynccontextmanager
+    async def slot(self, host, handler):
+        stats = self._stats_for(host)
+        if host not in self._queues and self._can_run(host, handler):
+            self._take(host, handler)
+        else:
+            fut = get_running_loop().create_future()
+            self._queues.setdefault(host, deque()).append((fut, handler, time()))
+            self._dispatch()
+            start = time()
+            try:
+                await fut
+            except BaseException:
+                if fut.done() and not fut.cancelled():
+                    self._release(host, handler)
+                else:
+                    fut.cancel()
+                    self._dispatch()
+                raise
+            waited = time() - start
+            stats.waited += 1
+            stats.wait_time += waited
+            stats.max_wait = max(stats.max_wait, waited)
+        try:
+            yield
+        finally:
+            self._release(host, handler)
+
+    def stats(self):
+        return {
+            host: {
+                "active": stats.active,
+                "queued": sum(not fut.done() for fut, *_ in self._queues.get(host, ())),
+                "waited": stats.waited,
+                "avg_wait": stats.wait_time / stats.waited if stats.waited else 0.0,
+                "max_wait": stats.max_wait,
+            }
+            for host, stats in self._stats.items()
+        }
+
+
+scheduler = FairScheduler(
+    Config.MAX_CONCURRENT, Config.HOST_CONCURRENCY, HANDLER_LIMITS
+)
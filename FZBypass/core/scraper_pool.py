@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+from urllib.parse import urlparse
+
+from FZBypass import Config
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.deadline import bind
+from FZBypass.core.sync_pool import run_sync
+
+
+class ScraperPool:
+    """
+    Long-lived cloudscraper sessions, kept per target domain.
+
+    A handler checks a scraper out for the whole bypass and hands it back when
+    done, so the next link on that domain starts with its Cloudflare clearance
+    cookies and open connections instead of a fresh browser profile; new
+    scrapers start from the cookie store and give their cookies back to it on
+    check-in. At most
+    `per_domain` idle scrapers are kept per domain and `max_idle` overall (the
+    least recently used go first), and any idle longer than `idle` is closed.
+    """
+
+    def __init__(self, per_domain, max_idle, idle):
+        self.per_domain = per_domain
+        self.max_idle = max_idle
+        self.idle = idle
+        self.created = self.reused = 0
+        self._idle = OrderedDict()
+
+    def _evict(self):
+        deadline = monotonic() - self.idle
+        count = sum(len(stack) for stack in self._idle.values())
+        for key in list(self._idle):
+            stack = self._idle[key]
+            while stack and (stack[0][0] < deadline or count > self.max_idle):
+                stack.pop(0)[1].close()
+                count -= 1
+            if not stack:
+                del self._idle[key]
+
+    @asynccontextmanager
+    async def checkout(self, url, **kwargs):
+        key = (urlparse(url).hostname, tuple(sorted(kwargs.items())))
+        self._evict()
+        if stack := self._idle.get(key):
+            scraper = stack.pop()[1]
+            self.reused += 1
+        else:
+            from cloudscraper import create_scraper
+
+            scraper = bind(await run_sync("scrape", create_scraper, **kwargs))
+            cookie_store.load(scraper.cookies, url)
+            self.created += 1
+        try:
+            yield scraper
+        finally:
+            cookie_store.update(scraper.cookies)
+            stack = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(stack) < self.per_domain:
+                stack.append((monotonic(), scraper))
+            else:
+                scraper.close()
+            self._evict()
+
+    def stats(self):
+        return {
+            "idle": sum(len(stack) for stack in self._idle.values()),
+            "domains": len(self._idle),
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+    def close(self):
+        for stack in self._idle.values():
+            for _, scraper in stack:
+                scraper.close()
+        self._idle.clear()
+
+
+scraper_pool = ScraperPool(
+    Config.SCRAPER_POOL, Config.SCRAPER_POOL * 16, Config.SCRAPER_IDLE
+)
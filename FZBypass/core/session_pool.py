@@ -0,0 +1,64 @@
+from contextlib import asynccontextmanager
+
+from FZBypass import Config
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.deadline import budget
+
+
+class SessionPool:
+    """
+    Process-wide aiohttp connector shared by every async handler.
+
+    Connections are kept alive per host, so repeated bypasses against the same
+    shortener skip the DNS lookup and TLS handshake. Each bypass job still gets
+    its own ClientSession and cookie jar on top of the shared connector.
+    Passing `url` preloads the stored cookies for that domain and hands the
+    jar back to the cookie store on exit. Requests time out after `cap`
+    (REQUEST_TIMEOUT by default), cut to the running bypass's deadline.
+    aiohttp itself is imported with the first session, not at bot startup.
+    """
+
+    def __init__(self):
+        self._connector = None
+
+    @property
+    def connector(self):
+        if self._connector is None or self._connector.closed:
+            from aiohttp import TCPConnector
+
+            self._connector = TCPConnector(
+                limit=Config.HTTP_POOL_LIMIT,
+                limit_per_host=Config.HTTP_POOL_PER_HOST,
+                keepalive_timeout=Config.HTTP_KEEPALIVE,
+                ttl_dns_cache=300,
+            )
+        return self._connector
+
+    @asynccontextmanager
+    async def session(self, cap=None, url=None, **kwargs):
+        from aiohttp import ClientSession, ClientTimeout, CookieJar
+
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = ClientTimeout(total=budget(cap))
+        jar = CookieJar()
+        if url:
+            cookie_store.load(jar, url)
+        try:
+            async with ClientSession(
+                connector=self.connector,
+                connector_owner=False,
+                cookie_jar=jar,
+                **kwargs,
+            ) as session:
+                yield session
+        finally:
+            if url:
+                cookie_store.update(jar)
+
+    async def close(self):
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+
+session_pool = SessionPool()
@@ -0,0 +1,66 @@
+from asyncio import shield
+from time import monotonic
+
+from FZBypass.core.deadline import GRACE, deadline, detached, remaining, until_deadline
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key onto one shared task.
+
+    The shared task runs detached from its callers, under the deadline of the
+    one that started it, and every caller waits on it only until its own
+    deadline. A caller with more time left than the running task gets a task
+    of its own instead. Waiters are shielded, so a caller that gets cancelled
+    (e.g. an expired inline query) does not cancel the resolution other callers
+    are still waiting on; the task is cancelled once its last waiter is gone.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._waiters = {}
+        self.coalesced = 0
+
+    @staticmethod
+    async def _fly(left, func, args):
+        if left is None:
+            return await func(*args)
+        with deadline(left):
+            return await func(*args)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+
+    def _done(self, key, task):
+        self._forget(key, task)
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, func, *args):
+        left = remaining()
+        until = None if left is None else monotonic() + left
+        task, ends = self._inflight.get(key, (None, None))
+        if task is None or (ends is not None and (until is None or until > ends)):
+            # a task that gives up before this caller does stays with its own waiters
+            task = detached(self._fly(left, func, args))
+            self._inflight[key] = (task, until)
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await until_deadline(shield(task), GRACE)
+        finally:
+            if waiters := self._waiters.pop(task) - 1:
+                self._waiters[task] = waiters
+            elif not task.done():
+                self._forget(key, task)
+                task.cancel()
+
+    @property
+    def inflight(self):
+        return len(self._inflight)
+
+
+single_flight = SingleFlight()
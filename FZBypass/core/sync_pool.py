@@ -0,0 +1,108 @@
+from asyncio import get_running_loop, sleep as asleep
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from multiprocessing import get_context
+from time import perf_counter
+
+from FZBypass import Config
+from FZBypass.core.metrics import phase
+
+POOL_SIZES = {
+    "hoster": 4,
+    "shortener": 8,
+    "gdrive": 8,
+    "scrape": 4,
+    "captcha": 2,
+    "cache": 1,
+    # one thread: the SQLite job backend shares a single connection
+    "jobs": 1,
+    # one thread: results of a file are appended in order to one writer
+    "bulk": 1,
+}
+for _pool in Config.THREAD_POOLS:
+    _family, _size = _pool.split(":")
+    POOL_SIZES[_family] = int(_size)
+
+_pools = {}
+_parse_pool = None
+
+
+def get_pool(family):
+    if (pool := _pools.get(family)) is None:
+        pool = _pools[family] = ThreadPoolExecutor(
+            POOL_SIZES.get(family, 4), thread_name_prefix=f"FZ-{family}"
+        )
+    return pool
+
+
+async def run_sync(family, func, *args, **kwargs):
+    """
+    Run a blocking requests/cloudscraper call on the thread pool of its handler family.
+
+    The call runs in the caller's context, so deadline-bounded requests made
+    in it get what is left of the running bypass's deadline.
+    """
+    return await get_running_loop().run_in_executor(
+        get_pool(family), partial(copy_context().run, func, *args, **kwargs)
+    )
+
+
+async def run_parse(func, *args):
+    """
+    Run a CPU-bound page extractor from `FZBypass.core.extractors`.
+
+    With PARSE_WORKERS set it runs in a process pool, so parsing uses every
+    core instead of holding the GIL; only the page text goes in and only the
+    extracted fields come back. Otherwise it runs inline, as before.
+    """
+    global _parse_pool
+    with phase("parse"):
+        if Config.PARSE_WORKERS <= 0:
+            return func(*args)
+        if _parse_pool is None:
+            # spawn, not fork: the bot process has an event loop and threads
+            _parse_pool = ProcessPoolExecutor(
+                Config.PARSE_WORKERS, mp_context=get_context("spawn")
+            )
+        return await get_running_loop().run_in_executor(_parse_pool, func, *args)
+
+
+def shutdown_pools():
+    global _parse_pool
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up a sleeping task, i.e. how long it was blocked."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self._running = False
+
+    async def run(self):
+        self._running = True
+        while self._running:
+            start = perf_counter()
+            await asleep(self.interval)
+            self.samples.append(max(perf_counter() - start - self.interval, 0))
+
+    def stop(self):
+        self._running = False
+
+    def stats(self):
+        if not self.samples:
+            return {"samples": 0, "max": 0, "p50": 0, "p99": 0}
+        lags = sorted(self.samples)
+        return {
+            "samples": len(lags),
+            "max": lags[-1],
+            "p50": lags[len(lags) // 2],
+            "p99": lags[min(int(len(lags) * 0.99), len(lags) - 1)],
+        }
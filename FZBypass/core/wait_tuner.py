@@ -0,0 +1,83 @@
+from json import dump, load
+from os import path as ospath, replace
+from random import random
+from time import time
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.sync_pool import run_sync
+
+
+class WaitTuner:
+    """
+    Learns, per shortener domain, the shortest `transcript` wait that still
+    returns a `/links/go` URL. The hard-coded sltime is only an upper bound.
+
+    Per domain it keeps `good` (shortest wait seen working) and `bad` (longest
+    wait seen rejected) and binary-searches between them with occasional probes.
+    A rejected wait is always retried up to the upper bound, so a probe never
+    costs more than the old fixed sleep. `bad` halves every BAD_HALF_LIFE
+    seconds, so one slow response does not pin a domain to long waits.
+    """
+
+    PRECISION = 0.5
+    PROBE_RATE = 0.25
+    BAD_HALF_LIFE = 3600
+
+    def __init__(self, enabled, path):
+        self.enabled = enabled
+        self.path = path
+        self._state = {}
+        if enabled and ospath.isfile(path):
+            try:
+                with open(path) as f:
+                    self._state = load(f)
+            except (OSError, ValueError) as e:
+                LOGGER.error(f"Wait Tuner: {e}")
+
+    def plan(self, domain, upper):
+        if not self.enabled or upper <= 0:
+            return upper
+        st = self._state.get(domain, {"good": upper, "bad": 0.0})
+        good, bad = min(st["good"], upper), min(self._bad(st), upper)
+        if good - bad > self.PRECISION and random() < self.PROBE_RATE:
+            return round((good + bad) / 2, 2)
+        return good
+
+    async def success(self, domain, waited, upper):
+        if not self.enabled:
+            return
+        st = self._state.setdefault(domain, {"good": upper, "bad": 0.0})
+        if waited < st["good"]:
+            st["good"] = waited
+            await self._save()
+
+    async def too_short(self, domain, waited, upper):
+        if not self.enabled:
+            return
+        st = self._state.setdefault(domain, {"good": upper, "bad": 0.0})
+        st["bad"], st["bad_at"] = max(self._bad(st), waited), time()
+        if st["good"] <= waited:
+            st["good"] = upper
+        await self._save()
+
+    def _bad(self, st):
+        age = time() - st.get("bad_at", 0)
+        return st["bad"] * 0.5 ** (age / self.BAD_HALF_LIFE)
+
+    def _write(self, state):
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            dump(state, f, indent=2)
+        replace(temp, self.path)
+
+    async def _save(self):
+        try:
+            await run_sync("cache", self._write, dict(self._state))
+        except OSError as e:
+            LOGGER.error(f"Wait Tuner: {e}")
+
+    def learned(self):
+        return dict(self._state)
+
+
+wait_tuner = WaitTuner(Config.ADAPTIVE_WAIT, Config.WAIT_TIMES_FILE)
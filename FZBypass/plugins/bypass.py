@@ -1,5 +1,15 @@
-from time import time
-from asyncio import create_task, gather, sleep as asleep
+from time import monotonic, time
+from asyncio import (
+    CancelledError,
+    Event,
+    as_completed,
+    create_task,
+    sleep as asleep,
+)
+from contextlib import suppress
+from os import path as ospath
+from shutil import rmtree
+from tempfile import mkdtemp
 from pyrogram.filters import command, user
 from pyrogram.types import (
     InlineKeyboardButton,
@@ -8,16 +18,34 @@ from pyrogram.types import (
     InputTextMessageContent,
 )
 from pyrogram.enums import MessageEntityType
-from pyrogram.errors import QueryIdInvalid
+from pyrogram.errors import QueryIdInvalid, RPCError
 
 from FZBypass import Config, Bypass, BOT_START
-from FZBypass.core.bypass_checker import direct_link_checker, is_excep_link
+from FZBypass.core.bypass_checker import (
+    chain_resolver,
+    direct_link_checker,
+    is_excep_link,
+)
 from FZBypass.core.bot_utils import AuthChatsTopics, convert_time, BypassFilter
+from FZBypass.core.bulk import FORMATS, bypass_file
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.deadline import deadline
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.job_queue import job_queue
+from FZBypass.core.metrics import metrics
+from FZBypass.core.outbox import outbox
+from FZBypass.core.result_cache import result_cache
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.scheduler import scheduler
+from FZBypass.core.single_flight import single_flight
+
+PROGRESS_INTERVAL = 3
 
 
 @Bypass.on_message(command("start"))
 async def start_msg(client, message):
-    await message.reply(
+    await outbox.reply(
+        message,
         f"""<b><i>FZ Bypass Bot!</i></b>
     
     <i>A Powerful Elegant Multi Threaded Bot written in Python... which can Bypass Various Shortener Links, Scrape links, and More ... </i>
@@ -40,6 +68,65 @@ async def start_msg(client, message):
     )
 
 
+def chain_text(chain):
+    if (first := chain.hops[0]).error:
+        return f"\n┖ <b>Bypass Error:</b> {first.error}"
+    if chain.excep:
+        return chain.final
+    if not first.chain:
+        return f"\n┖ <b>Bypass Link:</b> {chain.final}"
+    lines = []
+    for ind, hop in enumerate(chain.hops, start=1):
+        if hop.error:
+            lines.append(f"<b>{ind}x Bypass Error:</b> {hop.error}")
+        elif hop.excep:
+            lines.append(f"<b>{ind}x Bypass Link:</b> \n\n{hop.result}")
+        else:
+            lines.append(
+                f"<b>{ind}x Bypass Link:</b> {hop.result} <i>({convert_time(hop.elapsed)})</i>"
+            )
+    if chain.error and not chain.hops[-1].error:
+        lines.append(f"<b>Chain Stopped:</b> {chain.error}")
+    return "".join(
+        f"\n{'┖' if ind == len(lines) - 1 else '┠'} {line}"
+        for ind, line in enumerate(lines)
+    )
+
+
+async def resolve_indexed(ind, link):
+    try:
+        return ind, await chain_resolver.resolve(link)
+    except DDLException as e:
+        return ind, e
+
+
+def result_text(link, result):
+    if isinstance(result, Exception):
+        bp_link = f"\n┖ <b>Bypass Error:</b> {result}"
+    else:
+        bp_link = chain_text(result)
+    if is_excep_link(link):
+        return f"{bp_link}\n\n━━━━━━━✦✗✦━━━━━━━\n\n"
+    return f"┎ <b>Source Link:</b> {link}{bp_link}\n\n━━━━━━━✦✗✦━━━━━━━\n\n"
+
+
+def progress_text(links, parse_data):
+    done = sum(data is not None for data in parse_data)
+    text, shown = "━━━━━━━✦✗✦━━━━━━━\n\n", 0
+    for link, data in zip(links, parse_data, strict=True):
+        data = (
+            data
+            or f"┎ <b>Source Link:</b> {link}\n┖ <i>Bypassing...</i>\n\n━━━━━━━✦✗✦━━━━━━━\n\n"
+        )
+        if len(text) + len(data) > 3900:
+            break
+        text += data
+        shown += 1
+    if shown < len(links):
+        text += f"<i>+{len(links) - shown} more below...</i>\n\n"
+    return text + f"<b>Done {done}/{len(links)}</b>"
+
+
 @Bypass.on_message(BypassFilter & (user(Config.OWNER_ID) | AuthChatsTopics))
 async def bypass_check(client, message):
     uid = message.from_user.id
@@ -52,9 +139,9 @@ async def bypass_check(client, message):
         txt = message.text
         entities = message.entities
     else:
-        return await message.reply("<i>No Link Provided!</i>")
+        return await outbox.reply(message, "<i>No Link Provided!</i>")
 
-    wait_msg = await message.reply("<i>Bypassing...</i>")
+    wait_msg = await outbox.reply(message, "<i>Bypassing...</i>")
     start = time()
 
     link, tlinks, no = "", [], 0
@@ -68,31 +155,33 @@ async def bypass_check(client, message):
         if link:
             no += 1
             tlinks.append(link)
-            atasks.append(create_task(direct_link_checker(link)))
+            atasks.append(create_task(resolve_indexed(no - 1, link)))
             link = ""
 
-    completed_tasks = await gather(*atasks, return_exceptions=True)
-
-    parse_data = []
-    for result, link in zip(completed_tasks, tlinks):
-        if isinstance(result, Exception):
-            bp_link = f"\n┖ <b>Bypass Error:</b> {result}"
-        elif is_excep_link(link):
-            bp_link = result
-        elif isinstance(result, list):
-            bp_link, ui = "", "┖"
-            for ind, lplink in reversed(list(enumerate(result, start=1))):
-                bp_link = f"\n{ui} <b>{ind}x Bypass Link:</b> {lplink}" + bp_link
-                ui = "┠"
-        else:
-            bp_link = f"\n┖ <b>Bypass Link:</b> {result}"
+    parse_data = [None] * no
+    changed = Event()
 
-        if is_excep_link(link):
-            parse_data.append(f"{bp_link}\n\n━━━━━━━✦✗✦━━━━━━━\n\n")
-        else:
-            parse_data.append(
-                f"┎ <b>Source Link:</b> {link}{bp_link}\n\n━━━━━━━✦✗✦━━━━━━━\n\n"
-            )
+    async def progress_editor():
+        while True:
+            await changed.wait()
+            changed.clear()
+            with suppress(RPCError):
+                await outbox.edit(
+                    wait_msg,
+                    progress_text(tlinks, parse_data),
+                    disable_web_page_preview=True,
+                )
+            await asleep(PROGRESS_INTERVAL)
+
+    editor = create_task(progress_editor()) if no > 1 else None
+    for task in as_completed(atasks):
+        ind, result = await task
+        parse_data[ind] = result_text(tlinks[ind], result)
+        changed.set()
+    if editor is not None:
+        editor.cancel()
+        with suppress(CancelledError):
+            await editor
 
     end = time()
 
@@ -101,26 +190,171 @@ async def bypass_check(client, message):
             parse_data[-1]
             + f"┎ <b>Total Links : {no}</b>\n┠ <b>Results In <code>{convert_time(end - start)}</code></b> !\n┖ <b>By </b>{message.from_user.mention} ( #ID{message.from_user.id} )"
         )
-    tg_txt = "━━━━━━━✦✗✦━━━━━━━\n\n"
-    for tg_data in parse_data:
-        tg_txt += tg_data
-        if len(tg_txt) > 4000:
-            await wait_msg.edit(tg_txt, disable_web_page_preview=True)
-            wait_msg = await message.reply(
-                "<i>Fetching...</i>", reply_to_message_id=wait_msg.id
+    await outbox.deliver(
+        message,
+        wait_msg,
+        ["━━━━━━━✦✗✦━━━━━━━\n\n", *parse_data],
+        disable_web_page_preview=True,
+    )
+
+
+def bulk_text(name, progress):
+    eta = convert_time(progress.eta) if progress.eta is not None else "-"
+    return f"""┎ <b>Bypassing File :</b> <code>{name}</code>
+┠ <b>Done :</b> {progress.done}/{progress.total} | <b>Success :</b> {progress.ok} | <b>Failed :</b> {progress.failed}
+┠ <b>Speed :</b> {progress.rate:.2f} links/s
+┖ <b>ETA :</b> {eta}"""
+
+
+@Bypass.on_message(
+    command(["bypassfile", "bpfile"]) & (user(Config.OWNER_ID) | AuthChatsTopics)
+)
+async def bypass_document(client, message):
+    doc = message.document or (
+        message.reply_to_message and message.reply_to_message.document
+    )
+    if not doc:
+        return await outbox.reply(
+            message,
+            "<i>Reply to a .txt File of Links with /bypassfile [txt|jsonl|csv]</i>",
+        )
+    fmt = (message.command[1:] or ["txt"])[0].lower()
+    if fmt not in FORMATS:
+        return await outbox.reply(
+            message, f"<i>Result Format must be one of:</i> {', '.join(FORMATS)}"
+        )
+
+    wait_msg = await outbox.reply(message, "<i>Downloading File...</i>")
+    workdir = mkdtemp(prefix="bypassfile-")
+    try:
+        src = await client.download_media(doc, file_name=f"{workdir}/")
+        name = ospath.splitext(doc.file_name or "links")[0]
+        dst = ospath.join(workdir, f"{name}-bypassed.{fmt}")
+        changed = Event()
+        state = {}
+
+        def on_result(progress):
+            state["progress"] = progress
+            changed.set()
+
+        async def progress_editor():
+            while True:
+                await changed.wait()
+                changed.clear()
+                with suppress(RPCError):
+                    await outbox.edit(
+                        wait_msg, bulk_text(doc.file_name, state["progress"])
+                    )
+                await asleep(PROGRESS_INTERVAL)
+
+        await outbox.edit(wait_msg, "<i>Bypassing File...</i>")
+        editor = create_task(progress_editor())
+        try:
+            progress = await bypass_file(
+                chain_resolver.resolve,
+                src,
+                dst,
+                fmt,
+                Config.BULK_CONCURRENCY,
+                Config.BULK_MAX_LINKS,
+                on_result,
             )
-            tg_txt = ""
-            await asleep(2.5)
+        finally:
+            editor.cancel()
+            with suppress(CancelledError):
+                await editor
 
-    if tg_txt != "":
-        await wait_msg.edit(tg_txt, disable_web_page_preview=True)
-    else:
-        await wait_msg.delete()
+        if not progress.total:
+            return await outbox.edit(wait_msg, "<i>No Links Found in the File!</i>")
+        capped = (
+            f"\n┠ <b>Skipped :</b> <i>Links over {Config.BULK_MAX_LINKS}</i>"
+            if progress.capped
+            else ""
+        )
+        await outbox.call(
+            message.chat.id,
+            message.reply_document,
+            dst,
+            caption=f"""┎ <b>Total Links :</b> {progress.total}
+┠ <b>Success :</b> {progress.ok} | <b>Failed :</b> {progress.failed}{capped}
+┠ <b>Results In <code>{convert_time(monotonic() - progress.start)}</code></b> !
+┖ <b>By </b>{message.from_user.mention} ( #ID{message.from_user.id} )""",
+            quote=True,
+        )
+        await outbox.call(message.chat.id, wait_msg.delete)
+    finally:
+        rmtree(workdir, ignore_errors=True)
 
 
 @Bypass.on_message(command("log") & user(Config.OWNER_ID))
 async def send_logs(client, message):
-    await message.reply_document("log.txt", quote=True)
+    await outbox.call(message.chat.id, message.reply_document, "log.txt", quote=True)
+
+
+@Bypass.on_message(command("cache") & user(Config.OWNER_ID))
+async def cache_stats(client, message):
+    stats = result_cache.stats()
+    scrapers = scraper_pool.stats()
+    cookies = cookie_store.stats()
+    await outbox.reply(
+        message,
+        f"""┎ <b>Cached Results :</b> {stats["entries"]}
+┠ <b>Hits :</b> {stats["hits"]} | <b>Misses :</b> {stats["misses"]}
+┠ <b>Hit Ratio :</b> {stats["hit_ratio"]:.1%}
+┠ <b>Coalesced :</b> {single_flight.coalesced}
+┠ <b>Scrapers :</b> {scrapers["idle"]} idle on {scrapers["domains"]} domains | <b>Reused :</b> {scrapers["reused"]}/{scrapers["reused"] + scrapers["created"]}
+┠ <b>Stored Cookies :</b> {cookies["cookies"]} on {cookies["domains"]} domains
+┖ <b>Time Saved :</b> {convert_time(stats["saved"])}""",
+        quote=True,
+    )
+
+
+@Bypass.on_message(command("queue") & user(Config.OWNER_ID))
+async def queue_stats(client, message):
+    text = f"<b>Active Bypasses :</b> {scheduler.active}/{scheduler.max_active}\n"
+    if job_queue.enabled:
+        jobs = await job_queue.stats()
+        text += f"""
+┎ <b>Job Queue</b>
+┠ <b>Running Here :</b> {jobs["running"]}/{jobs["workers"]} | <b>Awaiting Results :</b> {jobs["waiting"]}
+┖ <b>Shared :</b> {jobs["queued"]} queued | {jobs["leased"]} running
+"""
+    for host, stats in sorted(
+        scheduler.stats().items(), key=lambda item: -item[1]["waited"]
+    )[:20]:
+        text += f"""
+┎ <b>{host}</b>
+┠ <b>Active :</b> {stats["active"]} | <b>Queued :</b> {stats["queued"]}
+┖ <b>Waited :</b> {stats["waited"]} | <b>Avg :</b> {convert_time(stats["avg_wait"])} | <b>Max :</b> {convert_time(stats["max_wait"])}"""
+    await outbox.reply(message, text, quote=True)
+
+
+@Bypass.on_message(command("stats") & user(Config.OWNER_ID))
+async def handler_stats(client, message):
+    text = "<b>Handler Latency</b> <i>(avg total | network | sleep | parse)</i>\n"
+    for name in metrics.handlers()[:10]:
+        total = metrics.latency[(name, "total")]
+        avg = {
+            key: metrics.latency[(name, key)].sum / total.count
+            for key in ("total", "network", "sleep", "parse")
+        }
+        text += f"""
+┎ <b>{name}</b> | <b>Runs :</b> {total.count} | <b>Running :</b> {metrics.inflight[name]}
+┠ {convert_time(avg["total"])} | {convert_time(avg["network"])} | {convert_time(avg["sleep"])} | {convert_time(avg["parse"])}
+┖ <b>p50 :</b> ≤{total.quantile(0.5)}s | <b>p95 :</b> ≤{total.quantile(0.95)}s"""
+    text += "\n\n<b>Domain Outcomes</b> <i>(success | failure | error)</i>\n"
+    for domain in metrics.domains()[:10]:
+        errors = ", ".join(
+            f"{exc} ({count})"
+            for (dom, exc), count in metrics.exceptions.most_common()
+            if dom == domain
+        )
+        text += (
+            f"\n• <b>{domain}</b> : {metrics.outcomes[(domain, 'success')]} | "
+            f"{metrics.outcomes[(domain, 'failure')]} | {metrics.outcomes[(domain, 'error')]}"
+            + (f" <i>({errors})</i>" if errors else "")
+        )
+    await outbox.reply(message, text, quote=True)
 
 
 @Bypass.on_inline_query()
@@ -131,7 +365,8 @@ async def inline_query(client, query):
         link = string.strip("!bp ")
         start = time()
         try:
-            bp_link = await direct_link_checker(link, True)
+            with deadline(Config.INLINE_TIMEOUT):
+                bp_link = await direct_link_checker(link, True)
             end = time()
 
             if not is_excep_link(link):
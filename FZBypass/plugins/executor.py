@@ -8,6 +8,7 @@ from asyncio.subprocess import PIPE
 from asyncio import create_subprocess_shell
 from pyrogram.filters import command, user
 from FZBypass import Config, Bypass, LOGGER
+from FZBypass.core.outbox import outbox
 
 
 @Bypass.on_message(command("bash") & user(Config.OWNER_ID))
@@ -16,14 +17,14 @@ async def bash(_, message):
     if len(str(msg)) > 2000:
         with BytesIO(str.encode(msg)) as out_file:
             out_file.name = "output.txt"
-            await message.reply_document(out_file)
+            await outbox.call(message.chat.id, message.reply_document, out_file)
     else:
         LOGGER.info(f"OUTPUT: '{msg}'")
         if not msg or msg == "\n":
             msg = "MessageEmpty"
         elif not bool(match(r"<(blockquote|spoiler|b|i|code|s|u|/a)>", msg)):
             msg = f"<blockquote>{msg}</blockquote>"
-        await message.reply(msg)
+        await outbox.reply(message, msg)
 
 
 async def get_result(func, message):
@@ -75,7 +76,7 @@ async def get_result(func, message):
 async def shell(_, message):
     cmd = message.text.split(maxsplit=1)
     if len(cmd) == 1:
-        await message.reply("No command to execute was given.")
+        await outbox.reply(message, "No command to execute was given.")
         return
     cmd = cmd[1]
     proc = await create_subprocess_shell(cmd, stdout=PIPE, stderr=PIPE)
@@ -92,8 +93,8 @@ async def shell(_, message):
     if len(reply) > 3000:
         with BytesIO(str.encode(reply)) as out_file:
             out_file.name = "shell_output.txt"
-            await message.reply_document(out_file)
+            await outbox.call(message.chat.id, message.reply_document, out_file)
     elif len(reply) != 0:
-        await message.reply(reply)
+        await outbox.reply(message, reply)
     else:
-        await message.reply("No Reply")
+        await outbox.reply(message, "No Reply")
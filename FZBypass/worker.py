@@ -0,0 +1,53 @@
+"""
+Headless job worker: runs bypass jobs from JOB_QUEUE for the bot instances
+sharing it, without a Telegram client of its own.
+
+Start as many as the node has cores to spare; each claims up to `-w` jobs
+at a time and results go back to the instance that submitted them.
+
+    python -m FZBypass.worker [-w 8]
+"""
+
+from argparse import ArgumentParser
+from asyncio import Event, run
+from contextlib import suppress
+from sys import exit
+
+from FZBypass import Config, LOGGER
+from FZBypass.core.bypass_checker import execute_link
+from FZBypass.core.cookie_store import cookie_store
+from FZBypass.core.job_queue import job_queue
+from FZBypass.core.recaptcha import ouo_tokens
+from FZBypass.core.scraper_pool import scraper_pool
+from FZBypass.core.session_pool import session_pool
+from FZBypass.core.sync_pool import shutdown_pools
+
+
+async def main(args):
+    job_queue.workers = args.workers
+    try:
+        await job_queue.start(execute_link)
+        await Event().wait()
+    finally:
+        await job_queue.close()
+        await ouo_tokens.close()
+        await session_pool.close()
+        scraper_pool.close()
+        cookie_store.close()
+        shutdown_pools()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="python -m FZBypass.worker",
+        description="Run bypass jobs from the shared JOB_QUEUE.",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=Config.JOB_WORKERS or 8)
+    args = parser.parse_args()
+    if not job_queue.enabled or args.workers <= 0:
+        LOGGER.critical(
+            "JOB_QUEUE is Empty or no Workers, Nothing to Run. Exiting Now..."
+        )
+        exit(1)
+    with suppress(KeyboardInterrupt):
+        run(main(args))
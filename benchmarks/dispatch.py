@@ -0,0 +1,230 @@
+"""
+Dispatch micro-benchmark: hostname registry vs the old `re.match` chain.
+
+Run from the repo root:
+    python -m benchmarks.dispatch [rounds]
+"""
+
+from re import match
+from sys import argv
+from time import perf_counter
+from urllib.parse import urlparse
+
+from FZBypass.core.bypass_checker import TRANSCRIPT_SITES, bypass_registry
+
+TERABOX, GDRIVE, SHARE = object(), object(), object()
+
+# Order and patterns of the old if/elif chain in direct_link_checker
+LEGACY_CHAIN = (
+    (r"https?:\/\/(yadi|disk.yandex)\.\S+", "yandex_disk"),
+    (r"https?:\/\/.+\.mediafire\.\S+", "mediafire"),
+    (r"https?:\/\/shrdsk\.\S+", "shrdsk"),
+    (TERABOX, "terabox"),
+    (GDRIVE, "gdrive"),
+    (r"https?:\/\/try2link\.\S+", "try2link"),
+    (r"https?:\/\/(gyanilinks|gtlinks)\.\S+", "gyanilinks"),
+    (r"https?:\/\/adrinolinks\.\S+", "transcript"),
+    (r"https?:\/\/adsfly\.\S+", "transcript"),
+    (r"https?:\/\/(.+\.)?anlinks\.\S+", "transcript"),
+    (r"https?:\/\/ronylink\.\S+", "transcript"),
+    (r"https?:\/\/.+\.evolinks\.\S+", "transcript"),
+    (r"https?:\/\/.+\.tnshort\.\S+", "transcript"),
+    (r"https?:\/\/(xpshort|push.bdnewsx|techymozo)\.\S+", "transcript"),
+    (r"https?:\/\/go.lolshort\.\S+", "transcript"),
+    (r"https?:\/\/onepagelink\.\S+", "transcript"),
+    (r"https?:\/\/earn.moneykamalo\.\S+", "transcript"),
+    (r"https?:\/\/droplink\.\S+", "transcript"),
+    (r"https?:\/\/tinyfy\.\S+", "transcript"),
+    (r"https?:\/\/krownlinks\.\S+", "transcript"),
+    (r"https?:\/\/(du-link|dulink)\.\S+", "transcript"),
+    (r"https?:\/\/indianshortner\.\S+", "transcript"),
+    (r"https?:\/\/m.easysky\.\S+", "transcript"),
+    (r"https?:\/\/.+\.tnlink\.\S+", "transcript"),
+    (r"https?:\/\/link4earn\.\S+", "transcript"),
+    (r"https?:\/\/shortingly\.\S+", "transcript"),
+    (r"https?:\/\/short2url\.\S+", "transcript"),
+    (r"https?:\/\/urlsopen\.\S+", "transcript"),
+    (r"https?:\/\/mdisk\.\S+", "transcript"),
+    (r"https?:\/\/(pkin|go.paisakamalo)\.\S+", "transcript"),
+    (r"https?:\/\/linkpays\.\S+", "transcript"),
+    (r"https?:\/\/sklinks\.\S+", "transcript"),
+    (r"https?:\/\/link1s\.\S+", "transcript"),
+    (r"https?:\/\/tulinks\.\S+", "transcript"),
+    (r"https?:\/\/.+\.tulinks\.\S+", "transcript"),
+    (r"https?:\/\/(.+\.)?vipurl\.\S+", "transcript"),
+    (r"https?:\/\/indyshare\.\S+", "transcript"),
+    (r"https?:\/\/linkyearn\.\S+", "transcript"),
+    (r"https?:\/\/earn4link\.\S+", "transcript"),
+    (r"https?:\/\/linksly\.\S+", "transcript"),
+    (r"https?:\/\/(.+\.)?mdiskshortner\.\S+", "transcript"),
+    (r"https?://(?:\w+\.)?rocklinks\.\S+", "transcript"),
+    (r"https?:\/\/mplaylink\.\S+", "transcript"),
+    (r"https?:\/\/shrinke\.\S+", "transcript"),
+    (r"https?:\/\/urlspay\.\S+", "transcript"),
+    (r"https?:\/\/.+\.tnvalue\.\S+", "transcript"),
+    (r"https?:\/\/sxslink\.\S+", "transcript"),
+    (r"https?:\/\/moneycase\.\S+", "transcript"),
+    (r"https?:\/\/urllinkshort\.\S+", "transcript"),
+    (r"https?:\/\/.+\.dtglinks\.\S+", "transcript"),
+    (r"https?:\/\/v2links\.\S+", "transcript"),
+    (r"https?:\/\/(.+\.)?kpslink\.\S+", "transcript"),
+    (r"https?:\/\/v2.kpslink\.\S+", "transcript"),
+    (r"https?:\/\/tamizhmasters\.\S+", "transcript"),
+    (r"https?:\/\/tglink\.\S+", "transcript"),
+    (r"https?:\/\/pandaznetwork\.\S+", "transcript"),
+    (r"https?:\/\/url4earn\.\S+", "transcript"),
+    (r"https?:\/\/ez4short\.\S+", "transcript"),
+    (r"https?:\/\/dalink\.\S+", "transcript"),
+    (r"https?:\/\/.+\.omnifly\.\S+", "transcript"),
+    (r"https?:\/\/sheralinks\.\S+", "transcript"),
+    (r"https?:\/\/bindaaslinks\.\S+", "transcript"),
+    (r"https?:\/\/viplinks\.\S+", "transcript"),
+    (r"https?:\/\/.+\.short2url\.\S+", "transcript"),
+    (r"https?:\/\/shrinkforearn\.\S+", "transcript"),
+    (r"https?:\/\/bringlifes\.\S+", "transcript"),
+    (r"https?:\/\/.+\.linkfly\.\S+", "transcript"),
+    (r"https?:\/\/.+\.earn2me\.\S+", "transcript"),
+    (r"https?:\/\/.+\.vplinks\.\S+", "transcript"),
+    (r"https?:\/\/.+\.narzolinks\.\S+", "transcript"),
+    (r"https?:\/\/earn2short\.\S+", "transcript"),
+    (r"https?:\/\/instantearn\.\S+", "transcript"),
+    (r"https?:\/\/linkjust\.\S+", "transcript"),
+    (r"https?:\/\/pdiskshortener\.\S+", "transcript"),
+    (r"https?:\/\/publicearn\.\S+", "transcript"),
+    (r"https?:\/\/modijiurl\.\S+", "transcript"),
+    (r"https?:\/\/linkshortx\.\S+", "transcript"),
+    (r"https?:\/\/.+\.shorito\.\S+", "transcript"),
+    (r"https?:\/\/pdisk\.\S+", "transcript"),
+    (r"https?:\/\/ziplinker\.\S+", "transcript"),
+    (r"https?:\/\/ouo\.\S+", "ouo"),
+    (r"https?:\/\/(shareus|shrs)\.\S+", "shareus"),
+    (r"https?:\/\/(.+\.)?dropbox\.\S+", "dropbox"),
+    (r"https?:\/\/linkvertise\.\S+", "linkvertise"),
+    (r"https?:\/\/rslinks\.\S+", "rslinks"),
+    (r"https?:\/\/(bit|tinyurl|(.+\.)short|shorturl|t)\.\S+", "shorter"),
+    (r"https?:\/\/appurl\.\S+", "appurl"),
+    (r"https?:\/\/surl\.\S+", "surl"),
+    (r"https?:\/\/thinfi\.\S+", "thinfi"),
+    (r"https?:\/\/justpaste\.\S+", "justpaste"),
+    (r"https?:\/\/linksxyz\.\S+", "linksxyz"),
+    (r"https?:\/\/cinevood\.\S+", "cinevood"),
+    (r"https?:\/\/kayoanime\.\S+", "kayoanime"),
+    (r"https?:\/\/toonworld4all\.\S+", "toonworld4all"),
+    (r"https?:\/\/skymovieshd\.\S+", "skymovieshd"),
+    (r"https?:\/\/.+\.sharespark\.\S+", "sharespark"),
+    (r"https?:\/\/.+\.1tamilmv\.\S+", "tamilmv"),
+    (r"https?:\/\/hubdrive\.\S+", "drivescript"),
+    (r"https?:\/\/katdrive\.\S+", "drivescript"),
+    (r"https?:\/\/drivefire\.\S+", "drivescript"),
+    (r"https?:\/\/sharer\.\S+", "sharerpw"),
+    (SHARE, "share"),
+    (r"https?:\/\/.+\.technicalatg\.\S+", "not_allowed"),
+)
+SHARE_RE = r"https?:\/\/.+\.(gdtot|filepress|pressbee|gdflix)\.\S+|https?:\/\/(gdflix|filepress|pressbee|onlystream|filebee|appdrive)\.\S+"
+TERABOX_HOSTS = (
+    "1024tera",
+    "terabox",
+    "nephobox",
+    "4funbox",
+    "mirrobox",
+    "momerybox",
+    "teraboxapp",
+)
+
+CORPUS = [
+    "https://disk.yandex.com/d/abc",
+    "https://www.mediafire.com/file/abc/file",
+    "https://shrdsk.me/abc",
+    "https://www.1024terabox.com/s/1abc",
+    "https://teraboxapp.com/s/1abc",
+    "https://drive.google.com/file/d/1abc/view",
+    "https://try2link.com/abc",
+    "https://gtlinks.me/abc",
+    "https://ouo.io/abc",
+    "https://shrs.link/abc",
+    "https://www.dropbox.com/s/abc/file?dl=0",
+    "https://linkvertise.com/1/abc",
+    "https://rslinks.net/abc",
+    "https://bit.ly/abc",
+    "https://go.short.gy/abc",
+    "https://appurl.io/abc",
+    "https://surl.li/abc",
+    "https://thinfi.com/abc",
+    "https://justpaste.it/abc",
+    "https://linksxyz.in/abc",
+    "https://cinevood.com/post/",
+    "https://kayoanime.com/post/",
+    "https://toonworld4all.me/post/",
+    "https://skymovieshd.pro/post/",
+    "https://ww1.sharespark.cfd/post/",
+    "https://www.1tamilmv.rsvp/post/",
+    "https://hubdrive.lat/file/1",
+    "https://katdrive.org/file/1",
+    "https://drivefire.co/file/1",
+    "https://sharer.pw/file/abc",
+    "https://new.gdtot.zip/file/1",
+    "https://new.filepress.store/file/abc",
+    "https://pressbee.xyz/file/abc",
+    "https://new.gdflix.top/file/abc",
+    "https://appdrive.in/file/abc",
+    "https://onlystream.xyz/file/abc",
+    "https://filebee.xyz/file/abc",
+    "https://go.technicalatg.com/abc",
+    "https://example.com/abc",
+    "https://t.me/abc",
+    "https://github.com/SilentDemonSD/FZBypassBot",
+]
+for patterns, *_ in TRANSCRIPT_SITES:
+    for pattern in patterns:
+        host = pattern.replace("**.", "").replace("*.", "link.")
+        CORPUS.append(f"https://{host}.in/abc")
+
+
+def legacy_dispatch(link):
+    domain = urlparse(link).hostname
+    for check, name in LEGACY_CHAIN:
+        if check is TERABOX:
+            hit = any(x in domain for x in TERABOX_HOSTS)
+        elif check is GDRIVE:
+            hit = "drive.google.com" in link
+        elif check is SHARE:
+            if not match(SHARE_RE, link):
+                continue
+            if "gdtot" in domain:
+                return "gdtot"
+            if "filepress" in domain or "pressbee" in domain:
+                return "filepress"
+            if "appdrive" in domain or "gdflix" in domain:
+                return "appflix"
+            return "sharer_scraper"
+        else:
+            hit = bool(match(check, link))
+        if hit:
+            return name
+    return None
+
+
+def registry_dispatch(link):
+    rule = bypass_registry.match(link)
+    return rule.handler.__name__ if rule else None
+
+
+def bench(func, rounds):
+    start = perf_counter()
+    for _ in range(rounds):
+        for link in CORPUS:
+            func(link)
+    return (perf_counter() - start) / (rounds * len(CORPUS))
+
+
+if __name__ == "__main__":
+    rounds = int(argv[1]) if len(argv) > 1 else 200
+    for link in CORPUS:
+        if (old := legacy_dispatch(link)) != (new := registry_dispatch(link)):
+            print(f"MISMATCH {link}: regex chain -> {old}, registry -> {new}")
+    legacy = bench(legacy_dispatch, rounds)
+    registry = bench(registry_dispatch, rounds)
+    print(f"Corpus     : {len(CORPUS)} links x {rounds} rounds")
+    print(f"Regex chain: {legacy * 1e6:.2f} us/link")
+    print(f"Registry   : {registry * 1e6:.2f} us/link")
+    print(f"Speedup    : {legacy / registry:.1f}x")
@@ -0,0 +1,105 @@
+"""
+Go-link form extraction: BeautifulSoup html.parser vs the lxml pull scanner.
+
+Pass captured shortener pages (saved `view-source` HTML) as arguments, or run
+without arguments to use generated pages shaped like AdLinkFly ones: a large
+head of inline scripts and ad markup, the go-link form, then more ads.
+Both paths must give the same title and fields for every page.
+
+Run from the repo root:
+    python -m benchmarks.form_extract [page.html ...]
+"""
+
+from sys import argv
+from time import perf_counter
+
+from bs4 import BeautifulSoup
+
+from FZBypass.core.form_extract import extract_form
+
+AD_BLOCK = """<div class="ad-slot" id="ad-{n}"><ins class="adsbygoogle" data-ad-client="ca-pub-{n:08d}"></ins>
+<script>(adsbygoogle = window.adsbygoogle || []).push({{}});var x{n} = "{pad}";</script>
+<a href="https://ads.example/{n}"><img src="/banner{n}.gif" alt="ad"></a></div>
+"""
+SEARCH_FORM = """<form id="search" action="/search"><input type="text" name="q" value="">
+<input type="submit" value="Search"></form>"""
+GO_FORM = """<div class="box-main"><form method="post" accept-charset="utf-8" id="go-link" action="/links/go">
+<div style="display:none;"><input type="hidden" name="_method" value="POST"><input type="hidden" name="_csrfToken" autocomplete="off" value="{token}"></div>
+<input type="hidden" name="ad_form_data" value="{data}">
+<div style="display:none;"><input type="hidden" name="_Token[fields]" autocomplete="off" value="{token}%3A"><input type="hidden" name="_Token[unlocked]" autocomplete="off" value="adcopy_challenge%7Cg-recaptcha-response"></div>
+<a href="javascript: void(0)" class="btn btn-success btn-lg get-link disabled">Please wait...</a></form></div>"""
+
+
+def synthetic_page(before, after, seed=0):
+    pad = "x" * 300
+    head = "".join(AD_BLOCK.format(n=seed * 1000 + i, pad=pad) for i in range(before))
+    tail = "".join(
+        AD_BLOCK.format(n=seed * 1000 + before + i, pad=pad) for i in range(after)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Shortener | Get Link</title>"
+        f"<script>var app_vars = {{'countdown': '5'}};</script></head><body>"
+        f"{SEARCH_FORM}{head}"
+        f"{GO_FORM.format(token='a1b2c3' * 20, data='Zm9v' * 200 + str(seed))}"
+        f"{tail}<footer>{'<p>links</p>' * 200}</footer></body></html>"
+    )
+
+
+def bs4_extract(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.find("title")
+    return (
+        title.text if title else None,
+        {inp.get("name"): inp.get("value") for inp in soup.find_all("input")},
+        {
+            inp.get("name"): inp.get("value")
+            for inp in soup.find(id="go-link").find_all("input")
+        },
+    )
+
+
+def lxml_extract(html):
+    page = extract_form(html)
+    return (
+        page.title,
+        dict(page.inputs),
+        dict(extract_form(html, form_only=True).inputs),
+    )
+
+
+def timeit(func, pages, rounds):
+    start = perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            func(page)
+    return (perf_counter() - start) / (rounds * len(pages))
+
+
+def main():
+    if len(argv) > 1:
+        pages = []
+        for path in argv[1:]:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+        rounds = 20
+    else:
+        pages = [synthetic_page(60, 140, seed) for seed in range(10)]
+        rounds = 10
+
+    for page in pages:
+        old, new = bs4_extract(page), lxml_extract(page)
+        assert old[0] == new[0], (old[0], new[0])
+        assert old[2] == new[2], "go-link fields differ"
+        assert all(old[1].get(name) == value for name, value in new[1].items())
+
+    size = sum(len(page) for page in pages) / len(pages)
+    bs4_time = timeit(bs4_extract, pages, rounds)
+    lxml_time = timeit(lxml_extract, pages, rounds)
+    print(f"{len(pages)} pages, avg {size / 1024:.0f} KiB")
+    print(f"bs4 html.parser : {bs4_time * 1000:8.2f} ms/page")
+    print(f"lxml pull scan  : {lxml_time * 1000:8.2f} ms/page")
+    print(f"Speedup         : {bs4_time / lxml_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
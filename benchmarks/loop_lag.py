@@ -0,0 +1,74 @@
+"""
+Event loop lag under a mixed load of blocking and async bypass work.
+
+Each round mixes slow blocking page fetches (like a gdtot or skymovieshd
+request) with short async waits (like transcript). Run first inline on the
+loop, as handlers used to, then through the sync_pool families.
+
+Run from the repo root:
+    python -m benchmarks.loop_lag [jobs] [block_seconds]
+"""
+
+from asyncio import create_task, gather, run, sleep as asleep
+from sys import argv
+from time import perf_counter, sleep
+
+from FZBypass.core.sync_pool import LoopLagMonitor, run_sync, shutdown_pools
+
+FAMILIES = ("gdrive", "scrape", "shortener", "hoster")
+
+
+def blocking_fetch(seconds):
+    sleep(seconds)
+    return seconds
+
+
+async def inline_job(seconds):
+    return blocking_fetch(seconds)
+
+
+async def offloaded_job(family, seconds):
+    return await run_sync(family, blocking_fetch, seconds)
+
+
+async def measure(label, make_jobs):
+    monitor = LoopLagMonitor()
+    sampler = create_task(monitor.run())
+    await asleep(0.1)
+    start = perf_counter()
+    await gather(*make_jobs())
+    elapsed = perf_counter() - start
+    monitor.stop()
+    await sampler
+    stats = monitor.stats()
+    print(
+        f"{label:<10} wall {elapsed:6.2f}s | loop lag max {stats['max'] * 1000:8.1f}ms"
+        f" p50 {stats['p50'] * 1000:7.1f}ms p99 {stats['p99'] * 1000:8.1f}ms"
+    )
+
+
+async def main(jobs, block):
+    def inline():
+        for n in range(jobs):
+            yield inline_job(block) if n % 2 else asleep(block)
+
+    def offloaded():
+        for n in range(jobs):
+            yield (
+                offloaded_job(FAMILIES[n % len(FAMILIES)], block)
+                if n % 2
+                else asleep(block)
+            )
+
+    await measure("inline", inline)
+    await measure("offloaded", offloaded)
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    run(
+        main(
+            int(argv[1]) if len(argv) > 1 else 40,
+            float(argv[2]) if len(argv) > 2 else 0.2,
+        )
+    )
@@ -0,0 +1,314 @@
+"""
+Offline throughput benchmark for direct_link_checker.
+
+Starts a local aiohttp server that speaks each protocol family the bypass
+handlers use, one loopback address per family, registers the stand-in hosts
+in bypass_registry and drives direct_link_checker at a fixed concurrency:
+
+    transcript   GET page with hidden inputs, then POST /links/go
+    try2link     referer-gated page, then POST /links/go
+    gyanilinks   cookie + referer page, then POST /links/go
+    gdtot        file page, POST /ddl (myDl) and og:description
+    sharer       page with the download key, multipart `direct` action
+    filepress    file page, POST /api/file/telegram/downlaod/
+
+Every link gets a fresh code, so the result cache and single flight never
+short-circuit a run. Needs the 127.0.0.0/8 loopback range (Linux default).
+
+Run from the repo root:
+    python -m benchmarks.offline [--links 300] [--concurrency 32]
+        [--latency 0.05] [--jitter 0.02] [--fail-rate 0.0] [--wait 0]
+        [--families transcript gdtot ...]
+"""
+
+from argparse import ArgumentParser
+from asyncio import Semaphore, gather, run, sleep as asleep
+from itertools import count
+from random import random, uniform
+from time import perf_counter
+
+from aiohttp import web
+
+from FZBypass import Config
+from FZBypass.core.bypass_checker import bypass_registry, direct_link_checker
+from FZBypass.core.bypass_ddl import gyanilinks, transcript, try2link
+from FZBypass.core.bypass_dlinks import filepress, gdtot, sharer_scraper
+from FZBypass.core.exceptions import DDLException
+from FZBypass.core.scheduler import scheduler
+from FZBypass.core.session_pool import session_pool
+from FZBypass.core.sync_pool import shutdown_pools
+
+HOSTS = {
+    "transcript": "127.0.0.2",
+    "try2link": "127.0.0.3",
+    "gyanilinks": "127.0.0.4",
+    "gdtot": "127.0.0.5",
+    "sharer": "127.0.0.6",
+    "filepress": "127.0.0.7",
+}
+
+LINK_PATHS = {
+    "transcript": "/{code}",
+    "try2link": "/{code}",
+    "gyanilinks": "/{code}",
+    "gdtot": "/file/{code}",
+    "sharer": "/file/{code}",
+    "filepress": "/file/{code}",
+}
+
+GO_FORM = """<html><head><title>Go Link</title></head><body>
+<form id="go-link" method="post" action="/links/go">
+<input type="hidden" name="_method" value="POST">
+<input type="hidden" name="_csrfToken" value="{token}">
+<input type="hidden" name="ad_form_data" value="{code}">
+<input type="hidden" name="_Token[fields]" value="{token}">
+</form></body></html>"""
+
+GDTOT_PAGE = """<html><head>
+<meta property="og:description" content="Download Movie.{code}.1080p.mkv - 1.4GB">
+</head><body><button id="dl">Download</button></body></html>"""
+
+SHARER_PAGE = """<html><body><button id="drc">Direct Download</button>
+<script>formData.append("key", "{code}");</script></body></html>"""
+
+
+def final_url(family, code):
+    return f"https://example.org/{family}/{code}"
+
+
+def drive_url(code):
+    return f"https://drive.google.com/open?id={code}"
+
+
+def emulation(latency, jitter, fail_rate):
+    @web.middleware
+    async def middleware(request, handler):
+        await asleep(max(latency + uniform(-jitter, jitter), 0))
+        if random() < fail_rate:
+            return web.Response(status=503, text="Service Unavailable")
+        return await handler(request)
+
+    return middleware
+
+
+def go_form(request):
+    code = request.match_info["code"]
+    return web.Response(
+        text=GO_FORM.format(code=code, token=code[::-1]), content_type="text/html"
+    )
+
+
+def links_go(family):
+    async def handler(request):
+        data = await request.post()
+        if request.headers.get("X-Requested-With") != "XMLHttpRequest":
+            return web.Response(status=403)
+        if "ad_form_data" not in data:
+            return web.json_response({"status": "error", "message": "Bad Request"})
+        return web.json_response(
+            {"status": "success", "url": final_url(family, data["ad_form_data"])}
+        )
+
+    return handler
+
+
+async def transcript_page(request):
+    return go_form(request)
+
+
+async def try2link_page(request):
+    if request.headers.get("Referer") != "https://world2our.com/":
+        return web.Response(status=403, text="Bad Referer")
+    return go_form(request)
+
+
+async def gyanilinks_page(request):
+    if "AppSession" not in request.cookies:
+        resp = web.Response(text="<html>Loading...</html>", content_type="text/html")
+        resp.set_cookie("AppSession", request.match_info["code"])
+        return resp
+    return go_form(request)
+
+
+async def gdtot_page(request):
+    return web.Response(
+        text=GDTOT_PAGE.format(code=request.match_info["code"]),
+        content_type="text/html",
+    )
+
+
+async def gdtot_ddl(request):
+    code = (await request.post())["dl"]
+    return web.Response(
+        text=f"<script>myDl('{drive_url(code)}')</script>", content_type="text/html"
+    )
+
+
+async def sharer_page(request):
+    return web.Response(
+        text=SHARER_PAGE.format(code=request.match_info["code"]),
+        content_type="text/html",
+    )
+
+
+async def sharer_direct(request):
+    data = await request.post()
+    if data.get("action") != "direct":
+        return web.json_response({"error": "bad action"})
+    return web.json_response({"url": drive_url(data["key"])})
+
+
+async def filepress_page(request):
+    return web.Response(text="<html>FilePress</html>", content_type="text/html")
+
+
+async def filepress_telegram(request):
+    await request.json()
+    return web.json_response({"data": None, "statusText": "Ok"})
+
+
+ROUTES = {
+    "transcript": [
+        web.get("/{code}", transcript_page),
+        web.post("/links/go", links_go("transcript")),
+    ],
+    "try2link": [
+        web.get("/{code}", try2link_page),
+        web.post("/links/go", links_go("try2link")),
+    ],
+    "gyanilinks": [
+        web.get("/{code}", gyanilinks_page),
+        web.post("/links/go", links_go("gyanilinks")),
+    ],
+    "gdtot": [
+        web.get("/file/{code}", gdtot_page),
+        web.post("/ddl", gdtot_ddl),
+    ],
+    "sharer": [
+        web.get("/file/{code}", sharer_page),
+        web.post("/file/{code}", sharer_direct),
+    ],
+    "filepress": [
+        web.get("/file/{code}", filepress_page),
+        web.post("/api/file/telegram/downlaod/", filepress_telegram),
+    ],
+}
+
+
+async def start_server(families, port, latency, jitter, fail_rate):
+    runners = []
+    for family in families:
+        app = web.Application(middlewares=[emulation(latency, jitter, fail_rate)])
+        app.add_routes(ROUTES[family])
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, HOSTS[family], port).start()
+        runners.append(runner)
+    return runners
+
+
+def register(port, wait):
+    base = {family: f"http://{host}:{port}" for family, host in HOSTS.items()}
+    bypass_registry.add(
+        transcript,
+        f"={HOSTS['transcript']}",
+        args=(base["transcript"], None, wait),
+        chain=True,
+    )
+    bypass_registry.add(
+        try2link, f"={HOSTS['try2link']}", args=(base["try2link"], wait), chain=True
+    )
+    bypass_registry.add(
+        gyanilinks,
+        f"={HOSTS['gyanilinks']}",
+        args=(base["gyanilinks"], wait),
+        chain=True,
+    )
+    bypass_registry.add(gdtot, f"={HOSTS['gdtot']}", excep=True)
+    bypass_registry.add(sharer_scraper, f"={HOSTS['sharer']}", excep=True)
+    bypass_registry.add(filepress, f"={HOSTS['filepress']}", excep=True)
+    return {family: url + LINK_PATHS[family] for family, url in base.items()}
+
+
+def percentile(values, q):
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0.0
+
+
+async def drive(jobs, concurrency):
+    limit = Semaphore(concurrency)
+    results = []
+
+    async def bypass(family, link):
+        async with limit:
+            start = perf_counter()
+            try:
+                result = await direct_link_checker(link)
+                ok = bool(result[-1] if isinstance(result, list) else result)
+            except DDLException:
+                ok = False
+            results.append((family, ok, perf_counter() - start))
+
+    start = perf_counter()
+    await gather(*(bypass(family, link) for family, link in jobs))
+    return results, perf_counter() - start
+
+
+def report(label, results):
+    lats = sorted(lat for _, _, lat in results)
+    ok = sum(success for _, success, _ in results)
+    print(
+        f"{label:<12} {len(results):>6} {ok:>6} "
+        f"{percentile(lats, 0.50) * 1000:>9.1f} {percentile(lats, 0.95) * 1000:>9.1f} "
+        f"{percentile(lats, 0.99) * 1000:>9.1f}"
+    )
+
+
+async def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--links", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--wait", type=float, default=0)
+    parser.add_argument("--port", type=int, default=8731)
+    parser.add_argument("--families", nargs="+", choices=HOSTS, default=list(HOSTS))
+    args = parser.parse_args()
+
+    # The index step is a live Google Drive call, keep it out of the numbers.
+    Config.DIRECT_INDEX = ""
+    runners = await start_server(
+        args.families, args.port, args.latency, args.jitter, args.fail_rate
+    )
+    templates = register(args.port, args.wait)
+    codes = count()
+    jobs = [
+        (family, templates[family].format(code=f"bench{next(codes)}"))
+        for _ in range(args.links // len(args.families))
+        for family in args.families
+    ]
+
+    print(
+        f"{len(jobs)} links, concurrency {args.concurrency}, latency {args.latency}s "
+        f"± {args.jitter}s, fail rate {args.fail_rate:.0%}, "
+        f"scheduler {scheduler.max_active}/{scheduler.host_limit} per host"
+    )
+    try:
+        results, elapsed = await drive(jobs, args.concurrency)
+    finally:
+        await session_pool.close()
+        shutdown_pools()
+        for runner in runners:
+            await runner.cleanup()
+
+    print(
+        f"\n{'family':<12} {'links':>6} {'ok':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for family in args.families:
+        report(family, [res for res in results if res[0] == family])
+    report("all", results)
+    print(f"\n{len(results) / elapsed:.1f} links/sec over {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,93 @@
+"""
+Parse throughput and event loop lag of the scrape extractors, inline vs
+the PARSE_WORKERS process pool.
+
+Parses a batch of large synthetic cinevood and tamilmv pages at once, as a
+burst of scrape requests would, first inline on the loop and then with 1..N
+parse workers (N defaults to the CPU count). On a single core the pool can
+only add IPC overhead; the speedup shows up with more cores.
+
+Run from the repo root:
+    python -m benchmarks.parse_pool [pages] [max_workers]
+"""
+
+from asyncio import create_task, gather, run, sleep as asleep
+from os import cpu_count
+from sys import argv
+from time import perf_counter
+
+from FZBypass import Config
+from FZBypass.core import extractors
+from FZBypass.core.sync_pool import LoopLagMonitor, run_parse, shutdown_pools
+
+
+def cinevood_page(n):
+    posts = "".join(
+        f"<h6>Movie {n} Part {i} 1080p</h6><p>"
+        + "".join(
+            f'<a href="https://{host}.example/file/{n}-{i}">{label}</a> '
+            for host, label in extractors.CINEVOOD_HOSTS
+        )
+        + "</p><div>" + "<span>filler text</span>" * 40 + "</div>"
+        for i in range(60)
+    )
+    return f"<html><head><title>Movie {n}</title></head><body>{posts}</body></html>"
+
+
+def tamilmv_page(n):
+    files = "".join(
+        f'<p><a href="magnet:?xt=urn:btih:{n:04x}{i:036x}&dn=x">magnet</a>'
+        f'<a data-fileext="torrent" href="https://tmv.example/{n}/{i}.torrent">'
+        f"www.site - Movie {n} {i} 1080p.torrent</a></p>"
+        + "<div>" + "<span>filler text</span>" * 40 + "</div>"
+        for i in range(60)
+    )
+    return f"<html><head><title>Topic {n}</title></head><body>{files}</body></html>"
+
+
+async def measure(label, pages):
+    monitor = LoopLagMonitor()
+    sampler = create_task(monitor.run())
+    await asleep(0.1)
+    start = perf_counter()
+    results = await gather(
+        *(
+            run_parse(
+                extractors.cinevood_links if n % 2 else extractors.tamilmv_files, page
+            )
+            for n, page in enumerate(pages)
+        )
+    )
+    elapsed = perf_counter() - start
+    monitor.stop()
+    await sampler
+    stats = monitor.stats()
+    print(
+        f"{label:<10} {len(pages) / elapsed:7.1f} pages/s | wall {elapsed:6.2f}s"
+        f" | loop lag max {stats['max'] * 1000:7.1f}ms p99 {stats['p99'] * 1000:7.1f}ms"
+    )
+    return elapsed, results
+
+
+async def main(count, max_workers):
+    pages = [cinevood_page(n) if n % 2 else tamilmv_page(n) for n in range(count)]
+    print(f"{count} pages, {sum(map(len, pages)) / 2**20:.1f} MiB, {cpu_count()} CPUs")
+    Config.PARSE_WORKERS = 0
+    base, expected = await measure("inline", pages)
+    for workers in range(1, max_workers + 1):
+        Config.PARSE_WORKERS = workers
+        # warm the workers up so process start is not timed
+        await gather(*(run_parse(len, "") for _ in range(workers)))
+        elapsed, results = await measure(f"{workers} workers", pages)
+        assert results == expected
+        print(f"{'':<10} speedup {base / elapsed:.2f}x")
+        shutdown_pools()
+
+
+if __name__ == "__main__":
+    run(
+        main(
+            int(argv[1]) if len(argv) > 1 else 200,
+            int(argv[2]) if len(argv) > 2 else cpu_count() or 1,
+        )
+    )
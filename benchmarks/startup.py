@@ -0,0 +1,81 @@
+"""
+Cold-start cost of the bot: import time and resident memory.
+
+Imports what `python -m FZBypass` imports before `Bypass.start()` in a fresh
+interpreter under `-X importtime`, then does the same with every bypass
+handler module loaded too, which is what startup cost before handlers were
+registered lazily. Prints the total import time, the slowest top-level
+imports and the peak RSS of each run.
+
+Run from the repo root (needs the bot's `config.env`):
+    python -m benchmarks.startup [top]
+"""
+
+from os import environ
+from subprocess import run
+from sys import argv, executable
+
+STARTUP = (
+    "import FZBypass, FZBypass.plugins.bypass, FZBypass.plugins.executor, "
+    "FZBypass.core.recaptcha, FZBypass.core.session_pool, FZBypass.core.sync_pool"
+)
+HANDLERS = (
+    "import FZBypass.core.bypass_ddl, FZBypass.core.bypass_dlinks, "
+    "FZBypass.core.bypass_scrape"
+)
+RSS = "from resource import getrusage, RUSAGE_SELF; print(getrusage(RUSAGE_SELF).ru_maxrss)"
+
+
+def measure(code):
+    proc = run(
+        [executable, "-X", "importtime", "-c", f"{code}\n{RSS}"],
+        capture_output=True,
+        text=True,
+        env={**environ, "PYTHONPATH": environ.get("PYTHONPATH", ".")},
+        check=True,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, int(cumulative), name.strip()))
+    rss_kb = int(proc.stdout.split()[-1])
+    return imports, rss_kb
+
+
+def report(label, imports, rss_kb, top):
+    roots = [(us, name) for depth, us, name in imports if depth == 0]
+    print(f"\n{label}")
+    print(f"  import time : {sum(us for us, _ in roots) / 1e6:.3f}s")
+    print(f"  peak RSS    : {rss_kb / 1024:.1f} MiB")
+    heavy = sorted(
+        ((us, name) for depth, us, name in imports if depth <= 2), reverse=True
+    )
+    seen = set()
+    print(f"  slowest imports (cumulative, top {top}):")
+    for us, name in heavy:
+        if name in seen:
+            continue
+        seen.add(name)
+        print(f"    {us / 1000:>8.1f}ms  {name}")
+        if len(seen) >= top:
+            break
+    return sum(us for us, _ in roots), rss_kb
+
+
+def main():
+    top = int(argv[1]) if len(argv) > 1 else 15
+    lazy = report("Startup (handlers lazy)", *measure(STARTUP), top)
+    eager = report(
+        "Startup + all handler modules", *measure(f"{STARTUP}\n{HANDLERS}"), top
+    )
+    print(
+        f"\nDeferred until first bypass: {(eager[0] - lazy[0]) / 1e6:.3f}s, "
+        f"{(eager[1] - lazy[1]) / 1024:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()